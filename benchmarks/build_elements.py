@@ -0,0 +1,34 @@
+"""Elements built in a process pool against one by one.
+
+Run with ``python benchmarks/build_elements.py``.
+"""
+import math
+import time
+from multiprocessing import cpu_count
+
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import build_elements
+
+
+def build_wall(i):
+    # 20 layers of 500 frames, a wall segment along x
+    element = Element(frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]))
+    for layer in range(20):
+        frames = [Frame([i + 0.002*k, 0.01*math.sin(0.04*k), 0.003*layer], [1, 0, 0], [0, 1, 0])
+                  for k in range(500)]
+        element.add_path(Path.from_frames(frames, path_width=0.01, path_height=0.003))
+    return element
+
+
+if __name__ == "__main__":
+    # build_wall is found by the workers of a fork, use a module function elsewhere
+    n = 16
+    for processes in (1, None):
+        model = InformationModel()
+        start = time.time()
+        build_elements(model, build_wall, range(n), processes=processes)
+        print("{} processes: {} elements in {:.2f} s".format(processes or cpu_count(), n, time.time() - start))
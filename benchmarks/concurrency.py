@@ -0,0 +1,96 @@
+"""One writer adds, transforms and marks elements while readers check every snapshot they see.
+
+Readers of the live model are run for comparison. Run with
+``python benchmarks/concurrency.py``.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import ConcurrentModel
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import ProgressTracker
+
+paths, nodes = 5, 50
+
+
+def check(model):
+    keys = list(model.elements())
+    assert len(keys) == len(model.node), "half added element"
+    assert model.attributes["_last_element"] == (keys[-1] if keys else None)
+    for u, v in model.edges():
+        assert u in model.node and v in model.node, "dangling element edge"
+    # the last elements are the ones being changed
+    for key in keys[-3:]:
+        element = model.get_element(key)
+        assert element.number_of_nodes() == paths, "half built element"
+        for path in element.paths(data=False):
+            path = element.get_path(path)
+            assert path.number_of_nodes() == nodes and path.number_of_edges() == nodes - 1, "half built path"
+            heights = set(round(path.node[n]["node"].frame.point[2], 9) for n in path.node)
+            assert len(heights) == 1, "half transformed path"
+            states = set(path.node[n]["node"].attributes.get("state") for n in path.node)
+            assert len(states) == 1, "half marked path"
+
+
+def write(target, count):
+    for i in range(count):
+        element = Element()
+        for j in range(paths):
+            frames = [Frame([i + 0.01*k, 0.1*j, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(nodes)]
+            element.add_path(Path.from_frames(frames, robot_velocity=100.0))
+        with target.writing() as model:
+            model.add_element(element)
+        with target.writing() as model:
+            element.transform(Translation.from_vector([0, 0, 0.003]))
+            tracker = ProgressTracker(element)
+            tracker.mark_path(None, list(element.paths())[0])
+
+
+def read(get, stop, report):
+    reads = errors = 0
+    while not stop.is_set():
+        try:
+            check(get())
+        except (AssertionError, RuntimeError, KeyError, AttributeError) as error:
+            errors += 1
+            report.setdefault(str(error) or type(error).__name__, 0)
+            report[str(error) or type(error).__name__] += 1
+        reads += 1
+    report["reads"] = report.get("reads", 0) + reads
+    report["errors"] = report.get("errors", 0) + errors
+
+
+class Live(object):
+    # the same writer on the model itself, for comparison
+    def __init__(self, model):
+        self.model = model
+
+    @contextmanager
+    def writing(self):
+        yield self.model
+
+
+if __name__ == "__main__":
+    for name in ("snapshots", "live model"):
+        model = InformationModel()
+        target = ConcurrentModel(model) if name == "snapshots" else Live(model)
+        get = target.snapshot if name == "snapshots" else (lambda: model)
+        stop = threading.Event()
+        report = {}
+        readers = [threading.Thread(target=read, args=(get, stop, report)) for i in range(4)]
+        for reader in readers:
+            reader.start()
+        start = time.time()
+        try:
+            write(target, 50)
+        finally:
+            stop.set()
+        for reader in readers:
+            reader.join()
+        print("{}: {} elements written in {:.2f} s, {}".format(name, len(model.node), time.time() - start, report))
@@ -0,0 +1,42 @@
+"""A wall of identical printed blocks, as copies and as instances.
+
+Run with ``python benchmarks/instances.py``.
+"""
+import time
+import tracemalloc
+
+from compas.data import json_dumps
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+
+
+if __name__ == "__main__":
+    block = Element.from_shape(Box(Frame.worldXY(), 0.2, 0.1, 0.05), Frame.worldXY())
+    for layer in range(5):
+        frames = [Frame([0.004*k - 0.1, 0.0, 0.005*layer], [1, 0, 0], [0, 1, 0]) for k in range(50)]
+        block.add_path(Path.from_frames(frames, robot_velocity=100.0, extrusion_rate=1.0))
+    placements = [Translation.from_vector([0.2*(i % 10), 0.0, 0.05*(i // 10)]) for i in range(20)]
+
+    for name in ("copies", "instances"):
+        tracemalloc.start()
+        start = time.time()
+        model = InformationModel()
+        if name == "copies":
+            for T in placements:
+                model.add_element(block.transformed(T))
+        else:
+            prototype = model.add_prototype(block)
+            for T in placements:
+                model.add_instance(prototype, T)
+        built = time.time() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.time()
+        targets = sum(1 for target in model.targets())
+        print("{}: built in {:.2f} s, {:.0f} KiB, {} targets in {:.2f} s, {:.0f} KiB of JSON".format(
+            name, built, memory/1024.0, targets, time.time() - start, len(json_dumps(model))/1024.0))
@@ -0,0 +1,36 @@
+"""Closed form path profiles against the former grid search.
+
+Run with ``python benchmarks/solve_profile.py``.
+"""
+import random
+import time
+
+from am_information_model.model import solve_profile
+from am_information_model.model import solve_profile_arrays
+
+
+def grid_profile(area):
+    # the former Node.path_profile search, 1 mm heights then 0.1 mm widths
+    for h in [0.002, 0.003, 0.004, 0.005]:
+        if 0.007 < area/h < 0.014:
+            return area/h, h
+    for w in [0.007 + 0.0001*i for i in range(70)]:
+        if 0.002 < area/w < 0.006:
+            return w, area/w
+    return None
+
+
+areas = [random.uniform(0.00001, 0.0001) for i in range(100000)]
+
+t0 = time.time()
+grid = [grid_profile(area) for area in areas]
+t1 = time.time()
+exact = [solve_profile(area) for area in areas]
+t2 = time.time()
+solve_profile_arrays(areas)
+t3 = time.time()
+
+error = max(abs(p[0]*p[1] - area)/area for p, area in zip(exact, areas) if p)
+print("grid search:  {:.3f} s, {} infeasible".format(t1 - t0, grid.count(None)))
+print("closed form:  {:.3f} s, {} infeasible, max area error {:.1e}".format(t2 - t1, exact.count(None), error))
+print("batch:        {:.3f} s".format(t3 - t2))
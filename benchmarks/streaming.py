@@ -0,0 +1,81 @@
+"""Targets streamed to a fake controller that reaches them at a fixed rate.
+
+The controller counts how often its buffer ran empty while streaming.
+Run with ``python benchmarks/streaming.py``.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import Path
+from am_information_model.model import TargetStream
+
+
+class FakeController(object):
+
+    def __init__(self, rate, total):
+        self.rate = rate
+        self.total = total
+        self.received = 0
+        self.starved = 0
+        self.finished = None
+
+    async def handle(self, reader, writer):
+        buffer = deque()
+
+        async def receive():
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                buffer.append(json.loads(line.decode("utf-8"))["id"])
+                self.received += 1
+
+        receiving = asyncio.ensure_future(receive())
+        start, reached = time.time(), 0
+        while not receiving.done():
+            await asyncio.sleep(0.001)
+            due = int((time.time() - start)*self.rate) - reached
+            if due > len(buffer) and self.received < self.total:
+                # the robot would have to wait for the next target
+                self.starved += 1
+                start, reached = time.time(), 0
+                due = len(buffer)
+            if due and buffer:
+                for i in range(min(due, len(buffer))):
+                    id = buffer.popleft()
+                reached += due
+                writer.write((json.dumps({"ack": id}) + "\n").encode("utf-8"))
+        writer.close()
+        self.finished.set()
+
+
+async def main(rate, lookahead):
+    element = Element()
+    for layer in range(10):
+        frames = [Frame([0.001*k, 0, 0.003*layer], [1, 0, 0], [0, 1, 0]) for k in range(1000)]
+        element.add_path(Path.from_frames(frames, robot_velocity=100.0, extrusion_rate=1.0))
+    controller = FakeController(rate, 10000)
+    controller.finished = asyncio.Event()
+    server = await asyncio.start_server(controller.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    stream = TargetStream(element, lookahead=lookahead)
+    start = time.time()
+    report = await stream.run(reader, writer)
+    elapsed = time.time() - start
+    writer.close()
+    await controller.finished.wait()
+    server.close()
+    print("{} targets/s, look-ahead {}: {} sent, {} acknowledged, {:.0f} targets/s, buffer ran empty {} times, {:.0f} % printed".format(
+        rate, lookahead, report["sent"], report["acknowledged"], report["sent"]/elapsed, controller.starved,
+        stream.tracker.percent))
+
+
+if __name__ == "__main__":
+    for rate, lookahead in ((2000, 8), (2000, 64), (10000, 256)):
+        asyncio.run(main(rate, lookahead))
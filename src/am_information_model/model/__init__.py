@@ -1,7 +1,28 @@
 from .graph import *
 from .element import *
+from .instance import *
 from .path import *
 from .node import *
 from .edge import *
+from .nodestore import *
+from .process import *
+from .simplify import *
+from .meshcache import *
+from .layerindex import *
+from .spatialindex import *
+from .scheduler import *
+from .travel import *
+from .targets import *
+from .progress import *
+from .parallel import *
 from .informationmodel import *
+from .serialization import *
+from .delta import *
+from .concurrency import *
+try:
+    # asyncio, Python 3 only
+    from .streaming import *
+except (ImportError, SyntaxError):
+    pass
+from .binary import *
 from .utilities import *
\ No newline at end of file
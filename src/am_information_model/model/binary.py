@@ -0,0 +1,217 @@
+import json
+import struct
+from array import array
+from io import BytesIO
+
+from compas.data import DataDecoder
+from compas.data import DataEncoder
+from compas.data.encoders import cls_from_dtype
+
+from .graph import _is_nested
+from .path import Path
+from .nodestore import NodeStore
+from .serialization import _header
+from .serialization import _node_items
+from .serialization import _edge_items
+from .utilities import np
+
+__all__ = [
+    'binary_dump',
+    'binary_load',
+    'binary_dumps',
+    'binary_loads'
+]
+
+
+MAGIC = b"AMIMBIN1"
+ALIGN = 64
+
+
+def binary_dump(graph, filepath):
+    """Write a model, element or path to a binary container file.
+
+    The file starts with ``MAGIC``, the length of a JSON header as a little
+    endian uint64 and the header itself. The header describes the graph
+    topology of models and elements and, per path, where its node ids,
+    frames, process parameter columns and edges are in the data section.
+    The data section holds those as flat little endian float64 and int64
+    arrays, each aligned to 64 bytes. Paths are always written from their
+    :class:`NodeStore`, a store is built for paths that are not columnar.
+
+    Parameters
+    ----------
+    graph : :class:`ExtendedGraph`
+        Model, element or path.
+    filepath : str
+        Path of the file to write.
+    """
+    with open(filepath, "wb") as fp:
+        _write(graph, fp)
+
+
+def binary_dumps(graph):
+    """Same as :func:`binary_dump`, into bytes, e.g. to send a graph to another process."""
+    fp = BytesIO()
+    _write(graph, fp)
+    return fp.getvalue()
+
+
+def binary_load(filepath, mmap=True):
+    """Read a file written by :func:`binary_dump`.
+
+    Paths are loaded as columnar paths. With ``mmap`` and NumPy available
+    their columns are copy-on-write memory maps of the file, so opening a
+    model only reads the header and a path's data is paged in when it is
+    first used. Otherwise the data section is read into arrays.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the file to read.
+    mmap : bool, optional
+        Memory map the data section.
+
+    Returns
+    -------
+    :class:`ExtendedGraph`
+    """
+    with open(filepath, "rb") as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a binary information model file: {}".format(filepath))
+        size, = struct.unpack("<Q", fp.read(8))
+        tree = json.loads(fp.read(size).decode("utf-8"), cls=DataDecoder)
+        start = _aligned(len(MAGIC) + 8 + size)
+        if mmap and np is not None:
+            buffer = np.memmap(filepath, dtype=np.uint8, mode="c")
+        else:
+            fp.seek(0)
+            buffer = fp.read()
+    return _build(tree, _BlockReader(buffer, start))
+
+
+def binary_loads(data):
+    """Read a graph from the bytes of :func:`binary_dumps`."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary information model.")
+    size, = struct.unpack("<Q", data[len(MAGIC):len(MAGIC) + 8])
+    tree = json.loads(data[len(MAGIC) + 8:len(MAGIC) + 8 + size].decode("utf-8"), cls=DataDecoder)
+    start = _aligned(len(MAGIC) + 8 + size)
+    if np is not None:
+        # a writable copy, the columns are views of it
+        data = np.frombuffer(bytearray(data), dtype=np.uint8)
+    return _build(tree, _BlockReader(data, start))
+
+
+def _write(graph, fp):
+    blocks = []
+    tree = _describe(graph, blocks, [0])
+    header = json.dumps(tree, cls=DataEncoder).encode("utf-8")
+    start = _aligned(len(MAGIC) + 8 + len(header))
+    fp.write(MAGIC)
+    fp.write(struct.pack("<Q", len(header)))
+    fp.write(header)
+    fp.write(b"\0"*(start - fp.tell()))
+    for offset, data in blocks:
+        fp.write(b"\0"*(start + offset - fp.tell()))
+        fp.write(data)
+
+
+def _aligned(size):
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _describe(graph, blocks, end):
+    # header tree of a graph, the arrays of paths are appended to blocks
+    tree = {"graph": graph.dtype, "data": _header(graph)}
+    if isinstance(graph, Path):
+        tree["store"] = _describe_store(graph.as_store(), blocks, end)
+        return tree
+    nodes = []
+    for key, attr in _node_items(graph):
+        children = dict((name, _describe(value, blocks, end)) for name, value in attr.items() if _is_nested(value))
+        nodes.append([repr(key), dict((name, None if name in children else value) for name, value in attr.items()), children])
+    tree["nodes"] = nodes
+    tree["edges"] = [[repr(u), repr(v), attr] for u, v, attr in _edge_items(graph)]
+    return tree
+
+
+def _describe_store(store, blocks, end):
+    def block(typecode, values):
+        data = _to_bytes(typecode, values)
+        blocks.append((end[0], data))
+        entry = [end[0], len(values)]
+        end[0] = _aligned(end[0] + len(data))
+        return entry
+
+    return {
+        "prefix": store.prefix,
+        "ids": block("q", store.ids),
+        "frames": block("d", store.frames),
+        "columns": dict((name, block("d", values)) for name, values in store.columns.items()),
+        "edge_u": block("q", store.edge_u),
+        "edge_v": block("q", store.edge_v),
+        "states": [[row, state] for row, state in enumerate(store.states) if state is not None],
+        "extras": [[id, attr] for id, attr in store.extras.items()],
+        "entry_extras": [[id, attr] for id, attr in store.entry_extras.items()],
+        "edge_extras": [[uv[0], uv[1], attr] for uv, attr in store.edge_extras.items()],
+        "edge_entry_extras": [[uv[0], uv[1], attr] for uv, attr in store.edge_entry_extras.items()]
+    }
+
+
+def _to_bytes(typecode, values):
+    if np is not None:
+        return np.ascontiguousarray(values, dtype="<i8" if typecode == "q" else "<f8").tobytes()
+    return struct.pack("<{}{}".format(len(values), typecode), *values)
+
+
+def _build(tree, reader):
+    cls = cls_from_dtype(tree["graph"])
+    data = dict(tree["data"])
+    if "store" in tree:
+        graph = cls.from_data(dict(data, node={}, edge={}, adjacency={}))
+        graph._set_store(_build_store(tree["store"], reader))
+        return graph
+    data.update({"node": {}, "edge": {}, "adjacency": {}})
+    for key, attr, children in tree["nodes"]:
+        for name, child in children.items():
+            attr[name] = _build(child, reader)
+        data["node"][key] = attr
+        data["edge"][key] = {}
+        data["adjacency"][key] = {}
+    for u, v, attr in tree["edges"]:
+        data["edge"][u][v] = attr
+        data["adjacency"][u][v] = None
+        data["adjacency"][v][u] = None
+    return cls.from_data(data)
+
+
+def _build_store(tree, reader):
+    store = NodeStore.from_buffers(
+        reader.read("q", *tree["ids"]),
+        reader.read("d", *tree["frames"]),
+        dict((name, reader.read("d", *entry)) for name, entry in tree["columns"].items()),
+        reader.read("q", *tree["edge_u"]),
+        reader.read("q", *tree["edge_v"]),
+        prefix=tree["prefix"])
+    for row, state in tree["states"]:
+        store.states[row] = state
+    store.extras = dict((id, attr) for id, attr in tree["extras"])
+    store.entry_extras = dict((id, attr) for id, attr in tree["entry_extras"])
+    store.edge_extras = dict(((u, v), attr) for u, v, attr in tree["edge_extras"])
+    store.edge_entry_extras = dict(((u, v), attr) for u, v, attr in tree["edge_entry_extras"])
+    return store
+
+
+class _BlockReader(object):
+
+    def __init__(self, buffer, start):
+        self.buffer = buffer
+        self.start = start
+
+    def read(self, typecode, offset, count):
+        i = self.start + offset
+        if np is not None and isinstance(self.buffer, np.ndarray):
+            dtype = "<i8" if typecode == "q" else "<f8"
+            return self.buffer[i:i + 8*count].view(dtype)
+        values = struct.unpack("<{}{}".format(count, typecode), self.buffer[i:i + 8*count])
+        return array("l" if typecode == "q" else "d", values)
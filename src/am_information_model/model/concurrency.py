@@ -0,0 +1,229 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .graph import ExtendedGraph
+from .instance import ElementInstance
+from .node import Node
+from .nodestore import NodeStore
+from .nodestore import _copy_array
+from .path import Path
+from .path import _changes_since
+
+__all__ = [
+    'ConcurrentModel'
+]
+
+
+class ConcurrentModel(object):
+    """Snapshot reads of a model that one writer at a time keeps changing.
+
+    Writers change the model inside :meth:`writing`, which holds a lock
+    for the changes and publishes a new snapshot when it ends. Readers call
+    :meth:`snapshot` and get the last published one without any lock. A
+    snapshot is a read-only copy of the model, its elements and its paths,
+    so iterating it is not affected by later changes. Copies are made copy
+    on write: a path is only copied again once its :attr:`Path.version`
+    changed, and the mesh and frames of an element once it was
+    transformed, the rest of a snapshot is a shallow copy of the graph
+    dicts, linear in the number of elements and paths. Of a path whose
+    node attributes were changed through :meth:`Path.update_node` or
+    :meth:`Path.invalidate` with their keys, e.g. the states marked by a
+    :class:`ProgressTracker`, only these nodes or attribute columns are
+    copied, the rest is shared with the previous snapshot.
+
+    Changes that are not seen by :attr:`Path.version`, e.g. node objects
+    edited in place, need a :meth:`Path.invalidate` before the snapshot.
+
+    Parameters
+    ----------
+    model : :class:`InformationModel` or :class:`Element`
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version = 0
+        self._lock = threading.Lock()
+        # id -> (object, version, copy) of the paths and element geometry in the snapshot
+        self._copies = {}
+        self._snapshot = None
+        with self.writing():
+            pass
+
+    @contextmanager
+    def writing(self):
+        """Context to change the model in, publishes a snapshot at its end."""
+        with self._lock:
+            try:
+                yield self.model
+            finally:
+                self._publish()
+
+    def snapshot(self):
+        """The last published snapshot, do not change it."""
+        return self._snapshot
+
+    def _publish(self):
+        copies = {}
+        snapshot = _snapshot(self.model, self._copies, copies, {})
+        self._copies = copies
+        self.version += 1
+        # a single reference assignment, readers see the old or the new snapshot
+        self._snapshot = snapshot
+
+
+def _snapshot(graph, cache, copies, views):
+    if isinstance(graph, Path):
+        return _copy(graph, graph.version, cache, copies, _copy_path, _update_path)
+    if id(graph) in views:
+        # a prototype shared by instances
+        return views[id(graph)][1]
+    if isinstance(graph, ElementInstance):
+        view = _snapshot_instance(graph, cache, copies, views)
+        views[id(graph)] = (graph, view)
+        return view
+    view = graph.__class__.__new__(graph.__class__)
+    view.__dict__.update(graph.__dict__)
+    view.attributes = _copy_attributes(graph.attributes)
+    view.default_node_attributes = dict(graph.default_node_attributes)
+    view.default_edge_attributes = dict(graph.default_edge_attributes)
+    view.node = {}
+    for key, attr in graph.node.items():
+        attr = dict(attr)
+        for name, value in attr.items():
+            if isinstance(value, ExtendedGraph):
+                attr[name] = _snapshot(value, cache, copies, views)
+        view.node[key] = attr
+    view.edge = dict((u, dict((v, dict(attr)) for v, attr in nbrs.items())) for u, nbrs in graph.edge.items())
+    view.adjacency = dict((u, dict(nbrs)) for u, nbrs in graph.adjacency.items())
+    view._type_index = dict((name, OrderedDict(keys)) for name, keys in graph._type_index.items())
+    view._node_types = dict(graph._node_types)
+    if hasattr(graph, "_revision"):
+        geometry = _copy(graph, graph._revision, cache, copies, _copy_geometry)
+        view._frame, view._tool_frame, view._source, view._mesh = geometry
+        view._layers = None
+        view._spatial = None
+    if hasattr(graph, "spatial_index"):
+        view.spatial_index = None
+    views[id(graph)] = (graph, view)
+    return view
+
+
+def _snapshot_instance(instance, cache, copies, views):
+    view = instance.__class__.__new__(instance.__class__)
+    view.__dict__.update(instance.__dict__)
+    view.attributes = _copy_attributes(instance.attributes)
+    view._frame, view._tool_frame, view._source, view._mesh = _copy(instance, instance._revision, cache, copies, _copy_geometry)
+    view._states = dict(instance._states)
+    view._paths = OrderedDict()
+    view._placed = None
+    view._layers = None
+    view._spatial = None
+    prototype = instance.prototype
+    if prototype is not None:
+        view._prototype = None
+        view._attach(_snapshot(prototype, cache, copies, views))
+        for key, (source, version, path) in instance._paths.items():
+            # copies of current prototype paths, the others are made again on access
+            if prototype.node.get(key, {}).get("path") is source and source.version == version:
+                source = view.node[key]["path"]
+                view._paths[key] = (source, source.version, _copy(path, path.version, cache, copies, _copy_path, _update_path))
+    return view
+
+
+def _copy(obj, version, cache, copies, copy, update=None):
+    cached = cache.get(id(obj))
+    if cached is not None and cached[0] is obj and cached[1] == version:
+        result = cached[2]
+    else:
+        result = None
+        if update is not None and cached is not None and cached[0] is obj:
+            result = update(obj, cached[1], cached[2])
+        if result is None:
+            result = copy(obj)
+    copies[id(obj)] = (obj, version, result)
+    return result
+
+
+def _copy_path(path):
+    view = path.copy()
+    view._guid = path.guid
+    return view
+
+
+def _update_path(path, version, previous):
+    # a copy that shares the unchanged nodes with the copy of an earlier
+    # version, None if the frames or the topology may have changed since
+    changes = _changes_since(path, version)
+    if changes is None or changes[0] or changes[2] is None or "frame" in changes[2]:
+        return None
+    tags, keys, names = changes
+    if (path.store is None) != (previous.store is None):
+        return None
+    view = previous.__class__.__new__(previous.__class__)
+    view.__dict__.update(previous.__dict__)
+    view.attributes = _copy_attributes(path.attributes)
+    if path.store is not None:
+        view._set_store(_update_store(path.store, previous.store, keys, names))
+    else:
+        view.node = dict(previous.node)
+        for key in keys:
+            attr = dict(path.node[key])
+            node = attr["node"]
+            clone = Node(frame=node.frame.copy())
+            clone.attributes = dict(node.attributes)
+            clone.key = node.key
+            attr["node"] = clone
+            view.node[key] = attr
+    view._metrics = None
+    return view._with_metrics(path._metrics if path._metrics_valid() else None)
+
+
+def _update_store(store, previous, keys, names):
+    # the columns of the names copied, the others shared with previous
+    copy = NodeStore.__new__(NodeStore)
+    copy.__dict__.update(previous.__dict__)
+    copy.columns = dict(previous.columns)
+    extras = False
+    for name in names:
+        if name == "state":
+            copy.states = list(store.states)
+        elif name in store.columns:
+            copy.columns[name] = _copy_array('d', store.columns[name])
+        else:
+            extras = True
+    if extras:
+        copy.extras = dict(previous.extras)
+        for key in keys:
+            id = store.id(key)
+            if id in store.extras:
+                copy.extras[id] = dict(store.extras[id])
+            else:
+                copy.extras.pop(id, None)
+    copy.version = store.version
+    return copy
+
+
+def _copy_geometry(element):
+    # the frames and meshes are transformed in place
+    source = element._source.copy() if element._source is not None else None
+    if element._mesh is None:
+        mesh = None
+    elif element._mesh is element._source:
+        mesh = source
+    else:
+        mesh = element._mesh.copy()
+    return (
+        element._frame.copy() if element._frame is not None else None,
+        element._tool_frame.copy() if element._tool_frame is not None else None,
+        source,
+        mesh
+    )
+
+
+def _copy_attributes(attributes):
+    attributes = dict(attributes)
+    if "_key_counters" in attributes:
+        attributes["_key_counters"] = dict(attributes["_key_counters"])
+    return attributes
+
@@ -0,0 +1,295 @@
+import hashlib
+import json
+from ast import literal_eval
+
+from compas.data import DataEncoder
+from compas.geometry import Frame
+from compas.geometry import Transformation
+
+from .element import _serialize_source
+from .graph import _decode
+from .graph import _is_encoded
+from .graph import _is_graph
+from .graph import _is_nested
+from .instance import ElementInstance
+from .instance import _instance_header
+from .instance import _instance_states
+from .path import Path
+from .path import _changes_since
+from .utilities import _serialize_to_data
+
+__all__ = [
+    'take_snapshot',
+    'make_patch',
+    'apply_patch'
+]
+
+
+def take_snapshot(graph):
+    """Record the state of a graph to build a patch against later.
+
+    The snapshot holds counters and digests only, no geometry: the
+    :attr:`Path.version` of every path, the geometry revision of every
+    element and a digest of the attributes and topology of every graph.
+    Of an :class:`ElementInstance` it holds a digest of its placement and
+    a counter of the node states of each of its paths.
+
+    Parameters
+    ----------
+    graph : :class:`ExtendedGraph`
+        Model, element or path.
+
+    Returns
+    -------
+    dict
+    """
+    if isinstance(graph, ElementInstance):
+        return {"guid": str(graph.guid), "digest": _digest(graph), "states": _state_tokens(graph)}
+    snapshot = {"guid": str(graph.guid), "digest": _digest(graph)}
+    if isinstance(graph, Path):
+        snapshot["version"] = graph.version
+        return snapshot
+    snapshot["revision"] = getattr(graph, "_revision", None)
+    children = {}
+    for key, name, value in _children(graph):
+        if _is_nested(value) or isinstance(value, ElementInstance):
+            children[repr(key)] = take_snapshot(value)
+        else:
+            # kept serialized by a lazy from_data, unchanged as long as it stays so
+            children[repr(key)] = {"encoded": True}
+    snapshot["children"] = children
+    return snapshot
+
+
+def make_patch(graph, snapshot):
+    """Changes of a graph since a snapshot, as plain JSON data.
+
+    Unchanged paths and elements are left out. An element transform is
+    sent as its matrix, as long as the element still has it in its log
+    and the paths were not changed otherwise since. Nodes changed through
+    :meth:`Path.update_node` or :meth:`Path.invalidate` with their keys,
+    e.g. the states marked by a :class:`ProgressTracker`, are sent as
+    rows, any other change sends the path whole. A changed element or
+    model is sent only with its attributes and topology, its changed
+    elements and paths follow as patches of their own. An
+    :class:`ElementInstance` is sent with its placement if that changed
+    and the node states of its changed paths. Node objects edited in
+    place are only seen after :meth:`Path.invalidate`.
+
+    Parameters
+    ----------
+    graph : :class:`ExtendedGraph`
+        Model, element or path.
+    snapshot : dict
+        See :func:`take_snapshot`.
+
+    Returns
+    -------
+    dict
+        Empty if nothing changed, see :func:`apply_patch`.
+    """
+    return json.loads(json.dumps(_patch(graph, snapshot, set(), True), cls=DataEncoder))
+
+
+def apply_patch(graph, patch):
+    """Apply a patch of :func:`make_patch` to another copy of the graph.
+
+    Parameters
+    ----------
+    graph : :class:`ExtendedGraph`
+        The graph as it was when the snapshot of the patch was taken.
+    patch : dict
+
+    Returns
+    -------
+    :class:`ExtendedGraph`
+        The patched graph, a new object if the patch replaces it.
+    """
+    # data setters take over the node dicts, the patch is left as it is
+    if "new" in patch:
+        return _decode(_copy(patch["new"]))
+    if isinstance(graph, ElementInstance):
+        if "data" in patch:
+            # the placement, the states follow below or are kept
+            data = _copy(patch["data"])
+            data["states"] = graph.data["states"]
+            graph.data = data
+        for key, nodes in patch.get("states", {}).items():
+            # made again with these states on access
+            graph._paths.pop(key, None)
+            graph._states[key] = [tuple(item) for item in nodes]
+        return graph
+    if isinstance(graph, Path):
+        if "data" in patch:
+            graph.data = _copy(patch["data"])
+            return graph
+        for key, row in patch.get("nodes", {}).items():
+            graph.update_node(literal_eval(key), Frame.from_data(row["frame"]), **_copy(row["attributes"]))
+        if "attributes" in patch:
+            graph.attributes.update(_decode(patch["attributes"]))
+        return graph
+    for matrix in patch.get("transforms", ()):
+        graph.transform(Transformation.from_matrix(matrix))
+    links = patch.get("links", {})
+    if "data" in patch:
+        data = dict(patch["data"])
+        data["node"] = dict((key, dict(attr)) for key, attr in data["node"].items())
+        for key, name in links.items():
+            data["node"][key][name] = graph.node.get(literal_eval(key), {}).get(name)
+        graph.data = data
+        if data.get("_tool_frame"):
+            # the data setter resets the tool frame to the frame
+            graph.tool_frame = Frame.from_data(data["_tool_frame"])
+    for key, child in patch.get("children", {}).items():
+        key = literal_eval(key)
+        name = links.get(repr(key)) or _child_name(graph.node[key])
+        value = graph.node[key][name] if "new" in child else graph.get_node(key, name)
+        graph.node[key][name] = apply_patch(value, child)
+    return graph
+
+
+def _patch(graph, snapshot, tags, root=False):
+    if snapshot is None or (not root and snapshot.get("guid") != str(graph.guid)):
+        return {"new": graph}
+    if isinstance(graph, ElementInstance):
+        patch = {}
+        if _digest(graph) != snapshot["digest"]:
+            patch["data"] = _instance_header(graph)
+        tokens = _state_tokens(graph)
+        before = snapshot["states"]
+        states = {}
+        for key, token in tokens.items():
+            if before.get(key) != token:
+                nodes = _instance_states(graph, key)
+                # paths copied since without states have none to send
+                if nodes or key in before:
+                    states[key] = nodes
+        states.update((key, []) for key in before if key not in tokens)
+        if states:
+            patch["states"] = states
+        return patch
+    if isinstance(graph, Path):
+        patch = {}
+        if graph.version != snapshot["version"]:
+            changes = _changes_since(graph, snapshot["version"])
+            if changes is None or not set(changes[0]) <= tags:
+                return {"data": graph.data}
+            rows = [key for key in changes[1] if key in graph.node]
+            if rows:
+                patch["nodes"] = dict((repr(key), _node_row(graph, key)) for key in rows)
+        if _digest(graph) != snapshot["digest"]:
+            patch["attributes"] = dict((name, value) for name, value in graph.attributes.items() if name != "frame")
+        return patch
+
+    patch = {}
+    geometry = False
+    revision = getattr(graph, "_revision", None)
+    if revision is not None and revision != snapshot["revision"]:
+        ops = [op for op in graph._ops if op[0] > snapshot["revision"]]
+        if ops and ops[0][0] == snapshot["revision"] + 1 and all(op[1] is not None for op in ops):
+            patch["transforms"] = [op[1] for op in ops]
+            tags = tags | set(op[2] for op in ops)
+        else:
+            geometry = True
+    if geometry or _digest(graph) != snapshot["digest"]:
+        patch["data"] = _header(graph, geometry)
+        patch["links"] = dict((repr(key), name) for key, name, value in _children(graph))
+    children = {}
+    for key, name, value in _children(graph):
+        before = snapshot["children"].get(repr(key))
+        if before is None:
+            child = {"new": value}
+        elif _is_encoded(value):
+            child = {} if before.get("encoded") else {"new": value}
+        elif before.get("encoded"):
+            child = {"new": value}
+        else:
+            child = _patch(value, before, tags)
+        if child:
+            children[repr(key)] = child
+    if children:
+        patch["children"] = children
+    return patch
+
+
+def _copy(data):
+    return json.loads(json.dumps(data))
+
+
+def _node_row(path, key):
+    # frame and attributes of a node, as sent for a changed row
+    node = path.get_node(key)
+    return {"frame": node.frame.data, "attributes": dict(node.attributes)}
+
+
+def _children(graph):
+    # (key, name, value) of the node attributes that are graphs
+    for key, attr in graph.node.items():
+        for name, value in attr.items():
+            if _is_child(value):
+                yield key, name, value
+
+
+def _child_name(attr):
+    for name, value in attr.items():
+        if _is_child(value):
+            return name
+    return None
+
+
+def _is_child(value):
+    # instances are stored inline, but patched on their own like elements
+    return _is_nested(value) or isinstance(value, ElementInstance) or (_is_encoded(value) and _is_graph(value))
+
+
+def _state_tokens(instance):
+    # path key -> a token that changes with the node states of the path
+    tokens = {}
+    for key in instance._state_keys():
+        cached = instance._paths.get(key)
+        if cached is not None:
+            tokens[key] = "{}:{}".format(cached[2].guid, cached[2].version)
+        else:
+            tokens[key] = hashlib.sha1(json.dumps(instance._states[key]).encode("utf-8")).hexdigest()
+    return tokens
+
+
+def _header(graph, geometry=False):
+    # attributes and topology, without the nested graphs
+    header = {
+        "attributes": graph.attributes,
+        "dna": graph.default_node_attributes,
+        "dea": graph.default_edge_attributes,
+        "max_node": graph._max_node
+    }
+    if isinstance(graph, Path):
+        header["attributes"] = dict((name, value) for name, value in graph.attributes.items() if name != "frame")
+        return header
+    links = set((key, name) for key, name, value in _children(graph))
+    header["node"] = dict((repr(key), dict((name, None if (key, name) in links else value) for name, value in attr.items()))
+                          for key, attr in graph.node.items())
+    header["edge"] = dict((repr(u), dict((repr(v), attr) for v, attr in nbrs.items())) for u, nbrs in graph.edge.items())
+    header["adjacency"] = dict((repr(u), dict((repr(v), None) for v in nbrs)) for u, nbrs in graph.adjacency.items())
+    if hasattr(graph, "state"):
+        header["state"] = graph.state
+    if geometry:
+        header.update({
+            "frame": _serialize_to_data(graph.frame),
+            "_tool_frame": _serialize_to_data(graph.tool_frame),
+            "_source": _serialize_source(graph._source),
+            "_mesh": graph._mesh_data if graph._mesh_data is not None else _serialize_to_data(graph._own_mesh()),
+            "_resolution": graph._resolution
+        })
+    return header
+
+
+def _digest(graph):
+    if isinstance(graph, ElementInstance):
+        text = json.dumps(_instance_header(graph), cls=DataEncoder, sort_keys=True)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    header = _header(graph)
+    if "node" in header:
+        # node order is the build order
+        header["order"] = list(header["node"])
+    text = json.dumps(header, cls=DataEncoder, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
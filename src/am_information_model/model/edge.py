@@ -49,5 +49,5 @@ class Edge(Datastructure):
     def data(self, data):
         self.attributes.update(data["attributes"] or {})
         self.key = data["key"]
-        self.vector.data = data["vector"]
+        self.vector = Vector.from_data(data["vector"])
     
\ No newline at end of file
@@ -1,21 +1,53 @@
+from itertools import count
+
 from .graph import ExtendedGraph
+from .graph import _decode
+from .graph import _is_encoded
+from .path import _transform_paths
+from .path import TRANSFORM_LOG
+from .layerindex import LayerIndex
+from .layerindex import _path_height
+from .travel import optimize_travel
+from .targets import iter_targets
+from compas.geometry import Box
 from compas.geometry import Frame
 from compas.datastructures import Mesh
 from .utilities import _deserialize_from_data
 from .utilities import _serialize_to_data
+from .meshcache import MESH_CACHE
 
 __all__ = [
     'Element'
 ]
 
+
+# ids of element transforms, to tell them from transforms of single paths
+_transform_tags = count()
+
 class Element(ExtendedGraph):
     def __init__(self, name="element", frame=None, **kwargs):
         super(Element, self).__init__(name, **kwargs)
+        # geometry revision and its (revision, matrix, tag) changes, see delta
+        self._revision = 0
+        self._ops = []
         self.frame = frame
         self._tool_frame = None
 
         self._source = None
         self._mesh = None
+        # mesh data kept serialized by a lazy from_data
+        self._mesh_data = None
+        # (SharedMesh, placement) of a shape source from the mesh cache, see mesh
+        self._shared = None
+        self._resolution = None
+        # (revision, centroid, box), see bounding_box
+        self._bounds = None
+        # (SpatialIndex, key) of the model index this element is in
+        self._spatial = None
+        # LayerIndex of the paths, built on first use
+        self._layers = None
+        # (path versions, totals, totals per path), see metrics
+        self._metrics = None
 
         self.state = False
         self.attributes.update({
@@ -32,41 +64,57 @@ class Element(ExtendedGraph):
             "state": self.state,
             "frame": _serialize_to_data(self.frame),
             "_tool_frame": _serialize_to_data(self.tool_frame),
-            "_source": _serialize_to_data(self._source),
-            "_mesh": _serialize_to_data(self._mesh)
+            "_source": _serialize_source(self._source),
+            "_mesh": self._mesh_data if self._mesh_data is not None else _serialize_to_data(self._own_mesh()),
+            "_resolution": self._resolution
         })
         return data
 
     @data.setter
     def data(self, data):
         super(Element, self.__class__).data.fset(self, data)
+        self._layers = None
         self.state = data.get("state")
         if data.get('frame'):
             self.frame = Frame.from_data(data.get('frame'))
             self.tool_frame = Frame.from_data(data.get('frame'))
+        self._resolution = data.get('_resolution')
         if data.get('_source'):
-            self._source = _deserialize_from_data(data.get('_source'))
+            self._set_source(_decode_source(data.get('_source')))
         if data.get('_mesh'):
-            self._mesh = Mesh.from_data(data.get('_mesh'))
+            if self._lazy:
+                self._mesh_data = data.get('_mesh')
+            else:
+                self._mesh = Mesh.from_data(data.get('_mesh'))
 
     @classmethod
     def from_paths(cls, paths):
         element = cls()
         for path in paths:
             element.add_path(path)
+        return element
 
     @classmethod
     def from_mesh(cls, mesh, frame):
         element = cls(frame=frame)
-        element._source = element._mesh = mesh
+        element._set_source(mesh, mesh)
         return element
 
     @classmethod
-    def from_shape(cls, shape, frame):
+    def from_shape(cls, shape, frame, resolution=None):
+        """Construct an element from a shape, meshed on first use, see :attr:`mesh`."""
         element = cls(frame=frame)
-        element._source = shape
-        element._mesh = Mesh.from_shape(element._source)
-    
+        element._resolution = resolution
+        element._set_source(shape)
+        return element
+
+    def _set_source(self, source, mesh=None):
+        self._source = source
+        self._mesh = mesh
+        self._mesh_data = None
+        self._shared = None
+        self._bounds = None
+
     @classmethod
     def from_box(cls, box):
         """Construct an element from a box primitive.
@@ -85,22 +133,52 @@ class Element(ExtendedGraph):
 
     @property
     def mesh(self):
-        """Mesh of the element."""
-        if not self._source:
-            return None
+        """Mesh of the element.
+
+        The mesh of a shape is a placed copy of the mesh shared through
+        :data:`MESH_CACHE`. Use :attr:`shared_mesh`, :attr:`centroid` and
+        :attr:`bounding_box` to avoid a copy per element.
+        """
+        if self._mesh_data is not None:
+            self._mesh = Mesh.from_data(self._mesh_data)
+            self._mesh_data = None
 
         if self._mesh:
             return self._mesh
 
+        if not self._source:
+            return None
+
         if isinstance(self._source, Mesh):
             return self._source
         else:
-            self._mesh = Mesh.from_shape(self._source)
+            shared, placement = self.shared_mesh
+            self._mesh = shared.mesh.transformed(placement)
             return self._mesh
-        
+
     @mesh.setter
     def mesh(self, mesh):
-        self._source = self._mesh = mesh
+        self._set_source(mesh, mesh)
+        self._record()
+
+    @property
+    def shared_mesh(self):
+        """``(SharedMesh, Transformation)`` of a shape source, meshed once per shape, or None."""
+        if self._shared is None and self._source and not isinstance(self._source, Mesh):
+            self._shared = MESH_CACHE.get(self._source, self._resolution)
+        return self._shared
+
+    def _own_mesh(self):
+        # the mesh of a shape is rebuilt from the shape
+        if self._source is not None and not isinstance(self._source, Mesh):
+            return None
+        return self._mesh
+
+    def materialize(self):
+        """Decode the paths and the mesh a lazy :meth:`from_data` kept serialized."""
+        super(Element, self).materialize()
+        if self._mesh_data is not None:
+            self.mesh
 
     @property
     def frame(self):
@@ -113,6 +191,7 @@ class Element(ExtendedGraph):
             self._frame = frame.copy()
         else:
             self._frame = None
+        self._record()
     
     @property
     def tool_frame(self):
@@ -127,10 +206,105 @@ class Element(ExtendedGraph):
             self._tool_frame = frame.copy()
         else:
             self._tool_frame = None
+        self._record()
+
+    def _record(self, matrix=None, tag=None):
+        # a change of frame, tool frame or mesh, a transform if matrix is given
+        self._revision += 1
+        self._ops.append((self._revision, matrix, tag))
+        del self._ops[:-TRANSFORM_LOG]
 
     @property
     def centroid(self):
-        return self._mesh.centroid()
+        """Centroid of the mesh vertices, cached until the element changes."""
+        return self._get_bounds()[1]
+
+    @property
+    def bounding_box(self):
+        """Axis aligned ``(min, max)`` corners of the mesh, cached until the element changes."""
+        return self._get_bounds()[2]
+
+    def _get_bounds(self):
+        revision = self._geometry_revision()
+        if self._bounds is None or self._bounds[0] != revision:
+            self._bounds = (revision,) + self._compute_bounds()
+        return self._bounds
+
+    def _geometry_revision(self):
+        return self._revision
+
+    def _compute_bounds(self):
+        if self._mesh_data is None and self.shared_mesh is not None:
+            shared, placement = self.shared_mesh
+            if shared.centroid is None:
+                return None, None
+            return shared.centroid_at(placement), shared.box_at(placement)
+        mesh = self.mesh
+        if mesh is None or not mesh.number_of_vertices():
+            return None, None
+        xyz = mesh.vertices_attributes("xyz")
+        return mesh.centroid(), (tuple(min(p[i] for p in xyz) for i in range(3)), tuple(max(p[i] for p in xyz) for i in range(3)))
+
+    @property
+    def metrics(self):
+        """Total length, print duration and extruded volume of all paths.
+
+        Summed from the cached totals of the paths, see :attr:`Path.metrics`,
+        and cached until a path is added or deleted or its
+        :attr:`Path.version` changes, so it stays correct when a path is
+        edited directly. Paths kept serialized by a lazy :meth:`from_data`
+        are decoded for their totals only. Node objects of a path that is
+        not columnar can be edited in place without a new version, call
+        :meth:`Path.invalidate` after such edits.
+        """
+        length, duration, volume = self._get_metrics()
+        return {"length": length, "duration": duration, "volume": volume}
+
+    def _get_metrics(self):
+        revision = self._geometry_revision()
+        paths = [(key, self.node[key].get("path")) for key in self._type_index.get("path", ())]
+        versions = tuple((key, id(path), None if _is_encoded(path) else path.version) for key, path in paths)
+        cached = self._metrics
+        if cached is None or cached[0] != (revision, versions):
+            previous = cached[2] if cached is not None and cached[0][0] == revision else {}
+            totals = [0.0, 0.0, 0.0]
+            per_path = {}
+            for (key, path), version in zip(paths, versions):
+                values = previous[version][1] if version in previous else self._path_metrics(key, path)
+                # the path is kept so that its id is not reused
+                per_path[version] = (path, values)
+                for i, value in enumerate(values):
+                    totals[i] += value
+            self._metrics = ((revision, versions), tuple(totals), per_path)
+        return self._metrics[1]
+
+    def _path_metrics(self, key, path):
+        if _is_encoded(path):
+            # stays serialized in the node
+            path = _decode(path, True)
+        return path._get_metrics()
+
+    @property
+    def length(self):
+        return self.metrics["length"]
+
+    @property
+    def duration(self):
+        return self.metrics["duration"]
+
+    @property
+    def volume(self):
+        return self.metrics["volume"]
+
+    def solve_process(self, **kwargs):
+        """Solve the missing process parameters of all paths, see :meth:`Path.solve_process`.
+
+        Returns
+        -------
+        dict
+            The report of each path by path key.
+        """
+        return dict((key, path.solve_process(**kwargs)) for key, path in self.paths(data=True))
 
     def paths(self, data=False):
         return self.get_nodes_where({"node_type": "path"}, data, "path")
@@ -138,21 +312,162 @@ class Element(ExtendedGraph):
     def get_path(self, key):
         return self.get_node(key, "path")
 
+    def delete_node(self, key):
+        super(Element, self).delete_node(key)
+        if self._layers is not None:
+            self._layers.remove(key)
+
+    def clear(self):
+        super(Element, self).clear()
+        self._layers = None
+
+    @property
+    def layer_index(self):
+        """Height sorted :class:`LayerIndex` of the paths.
+
+        Built on first use from the path heights in the node attributes,
+        so lazily loaded paths stay serialized, and kept up to date by
+        :meth:`add_path`, :meth:`delete_node` and :meth:`transform`. Call
+        :meth:`rebuild_layer_index` after moving the nodes of a path directly.
+        """
+        if self._layers is None:
+            self._layers = LayerIndex.from_heights(self._path_heights())
+        return self._layers
+
+    def rebuild_layer_index(self):
+        for key in self.paths():
+            self.node[key].pop("height", None)
+        self._layers = None
+
+    def _path_heights(self):
+        # (key, height) of the paths, measured for data written without heights
+        for key in self.paths():
+            attr = self.node[key]
+            if "height" not in attr:
+                attr["height"] = _path_height(self.get_path(key))
+            yield key, attr["height"]
+
+    def _store_heights(self, paths):
+        for key, path in paths:
+            self.node[key]["height"] = _path_height(path)
+
+    def number_of_layers(self):
+        return len(self.layer_index.levels)
+
+    def layer(self, n, data=False):
+        """Iterate over the paths of the ``n``-th layer, negative from the top."""
+        return self._layer_paths(self.layer_index.layer(n), data)
+
+    def paths_between(self, zmin=None, zmax=None, data=False):
+        """Iterate over the paths with a height from ``zmin`` to ``zmax``, lowest first."""
+        return self._layer_paths(self.layer_index.between(zmin, zmax), data)
+
+    def paths_above(self, height, data=False):
+        """Iterate over the paths at or above a height, lowest first."""
+        return self._layer_paths(self.layer_index.between(height), data)
+
+    def _layer_paths(self, keys, data):
+        for key in keys:
+            if data:
+                yield key, self.get_node(key, "path")
+            else:
+                yield key
+
+    def targets(self, **kwargs):
+        """Iterate over the robot targets of the paths, see :func:`iter_targets`."""
+        return iter_targets(self, **kwargs)
+
+    def stream_targets(self, reader, writer, **kwargs):
+        """Coroutine that streams the targets of the element to a controller, see :class:`TargetStream`."""
+        # asyncio is Python 3 only, imported on use
+        from .streaming import TargetStream
+        return TargetStream(self, **kwargs).run(reader, writer)
+
+    def optimize_travel(self, **kwargs):
+        """Reorder and flip the paths to shorten the travel between them, see :func:`optimize_travel`."""
+        return optimize_travel(self, **kwargs)
+
+    def _reorder_paths(self, keys, keep_edges=True):
+        # paths are printed in node order, move them to the end in this order
+        for key in keys:
+            self.node[key] = self.node.pop(key)
+        self.rebuild_type_index()
+        if keys:
+            self.attributes["_last_path"] = keys[-1]
+        # the parent edges follow the new order, for schedule and anything else that reads them
+        paths = set(keys)
+        for (u, v), attr in list(self.edges(data=True)):
+            if u in paths and v in paths and (attr.get("sequence") or not keep_edges):
+                self.delete_edge(u, v)
+        for u, v in zip(keys, keys[1:]):
+            if not self.has_edge(u, v):
+                self.add_edge(u, v, sequence=True)
+
     def add_path(self, path, key=None, 
                  parent_path="last", parent_robot="any"):
-        self.add_named_node(path, key, parent_path)
+        last = self.get_last_key("path") if parent_path == "last" else None
+        key = self.add_named_node(path, key, parent_path)
+        self.node[key]["robot"] = parent_robot
+        if last is not None and self.has_edge(last, key):
+            # only keeps the order the paths were added in, see optimize_travel
+            self.edge[last][key]["sequence"] = True
+        self._store_heights([(key, path)])
+        if self._layers is not None:
+            self._layers.add(key, self.node[key]["height"])
+        if self._spatial is not None:
+            index, element_key = self._spatial
+            index.add_path(element_key, key, path)
+        return key
     
     def transform(self, T):
-        self.frame.transform(T)
-        self.tool_frame.transform(T)
+        if self._mesh_data is not None:
+            self.mesh
+        if self.frame is not None:
+            self.frame.transform(T)
+            self.tool_frame.transform(T)
         if self._source:
             self._source.transform(T)
-        if self._mesh:
+        if self._shared is not None:
+            # the shared mesh is only placed differently
+            self._shared = (self._shared[0], T*self._shared[1])
+            self._mesh = None
+        elif self._mesh and self._mesh is not self._source:
             self._mesh.transform(T)
-        for key, path in self.paths(data=True):
-            path.transform(T)
+        tag = next(_transform_tags)
+        paths = self._paths_to_transform()
+        _transform_paths([path for key, path in paths], T, tag)
+        self._store_heights(paths)
+        self._record([list(row) for row in T.matrix], tag)
+        self._layers = None
+        if self._spatial is not None:
+            index, key = self._spatial
+            index.add_element(key, self)
     
+    def _paths_to_transform(self):
+        return list(self.paths(data=True))
+
     def transformed(self, T):
         element = self.copy()
         element.transform(T)
-        return element
\ No newline at end of file
+        return element
+
+
+def _serialize_source(source):
+    # in the encoded form of the compas DataEncoder, see _decode
+    if source is None:
+        return None
+    return {"dtype": source.dtype, "value": source.data}
+
+
+def _decode_source(data):
+    if not isinstance(data, dict):
+        # already decoded when read with the compas DataDecoder
+        return data
+    if _is_encoded(data):
+        return _decode(data)
+    # data written before the encoded form, the bare data of a mesh or a box
+    if "vertex" in data and "face" in data:
+        return Mesh.from_data(data)
+    if "xsize" in data and "frame" in data:
+        return Box.from_data(data)
+    return _deserialize_from_data(data)
@@ -1,27 +1,149 @@
+import uuid
+from collections import OrderedDict
+
 from compas.datastructures import Graph
+from compas.data.encoders import cls_from_dtype
 
 
 __all__ = ['ExtendedGraph']
 
 
 class ExtendedGraph(Graph):
+    # serialized as a nested graph of its parent, see ElementInstance
+    _nested = True
+
     def __init__(self, name="ExtendedGraph", **kwargs):
         super(ExtendedGraph, self).__init__(name)
         self.key = kwargs.get("key")
+        # node_type -> ordered set of keys, derived from the node attributes
+        self._type_index = {}
+        # key -> node_type of the indexed nodes
+        self._node_types = {}
+        self._lazy = False
+
+    @property
+    def data(self):
+        return super(ExtendedGraph, self).data
+
+    @data.setter
+    def data(self, data):
+        super(ExtendedGraph, self.__class__).data.fset(self, data)
+        counters = self.attributes.get("_key_counters")
+        if counters is not None:
+            # the data shares the counters of the graph it was taken from
+            self.attributes["_key_counters"] = dict(counters)
+        self._decode_attributes()
+        self.rebuild_type_index()
+
+    @classmethod
+    def from_data(cls, data, lazy=False):
+        """Construct a graph from its data.
+
+        The data may also be plain JSON data, with objects still in their
+        ``{"dtype": ..., "value": ...}`` form. With ``lazy``, nested graphs
+        (the elements of a model, the paths of an element) are kept in that
+        form until they are accessed through :meth:`get_node`, see also
+        :meth:`materialize`.
+        """
+        graph = cls()
+        graph._lazy = lazy
+        graph.data = data
+        return graph
+
+    def _decode_attributes(self):
+        for name, value in self.attributes.items():
+            if _is_encoded(value):
+                self.attributes[name] = _decode(value)
+        for attr in self.node.values():
+            for name, value in attr.items():
+                if _is_encoded(value) and not (self._lazy and _is_graph(value)):
+                    attr[name] = _decode(value)
+        for nbrs in self.edge.values():
+            for attr in nbrs.values():
+                for name, value in attr.items():
+                    if _is_encoded(value):
+                        attr[name] = _decode(value)
+
+    def materialize(self):
+        """Decode everything a lazy :meth:`from_data` kept serialized."""
+        for key in list(self.node):
+            for name, value in list(self.node[key].items()):
+                if _is_encoded(value):
+                    value = self.get_node(key, name)
+                if isinstance(value, ExtendedGraph):
+                    value.materialize()
+        self._lazy = False
+
+    def rebuild_type_index(self):
+        self._type_index = {}
+        self._node_types = {}
+        for key in self.node:
+            self._index_node(key)
+
+    def _index_node(self, key):
+        node_type = self.node[key].get("node_type")
+        if self._node_types.get(key, node_type) != node_type:
+            self._unindex_node(key)
+        if node_type is not None:
+            self._type_index.setdefault(node_type, OrderedDict())[key] = None
+            self._node_types[key] = node_type
+
+    def _unindex_node(self, key):
+        node_type = self._node_types.pop(key, None)
+        if node_type is not None:
+            self._type_index[node_type].pop(key, None)
+
+    def add_node(self, key=None, attr_dict=None, **kwattr):
+        key = super(ExtendedGraph, self).add_node(key, attr_dict, **kwattr)
+        self._index_node(key)
+        return key
+
+    def delete_node(self, key):
+        super(ExtendedGraph, self).delete_node(key)
+        self._unindex_node(key)
+
+    def clear(self):
+        super(ExtendedGraph, self).clear()
+        self._type_index = {}
+        self._node_types = {}
+
+    def node_attribute(self, key, name, value=None):
+        result = super(ExtendedGraph, self).node_attribute(key, name, value)
+        if name == "node_type" and value is not None:
+            self._index_node(key)
+        return result
+
+    def has_object(self, key, obj_type="node"):
+        return key in self._type_index.get(obj_type, ())
+
+    def number_of_objects(self, obj_type="node"):
+        return len(self._type_index.get(obj_type, ()))
 
     def get_nodes_where(self, arg, data=False, attr=None):
-        for key in self.nodes_where(arg):
+        if isinstance(arg, dict) and list(arg) == ["node_type"]:
+            keys = list(self._type_index.get(arg["node_type"], ()))
+        else:
+            keys = self.nodes_where(arg)
+        for key in keys:
             if data:
-                yield key, self.node_attribute(key, attr)
+                yield key, self.get_node(key, attr)
             else:
                 yield key
 
     def get_node(self, key, attr="node"):
         if self.has_node(key):
-            return self.node_attribute(key, attr)
+            value = self.node_attribute(key, attr)
+            if _is_encoded(value):
+                value = _decode(value, self._lazy)
+                self.node[key][attr] = value
+            return self._resolve(key, attr, value)
         else:
             return None
 
+    def _resolve(self, key, attr, value, store=True):
+        # node values that are completed on access, see ElementInstance
+        return value
+
     def get_id(self, key):
         return int(key.split('_')[-1])
 
@@ -59,17 +181,48 @@ class ExtendedGraph(Graph):
     def get_last_key(self, node_type="node"):
         return self.attributes.get("_last_{}".format(node_type))
 
-    def get_next_key(self, keys, prefix=""):
-        id = max(list(self.get_ids(keys)))+1
+    def get_next_key(self, keys=None, prefix=""):
+        """Allocate the next free key for the given prefix.
+
+        Ids are handed out from a monotonic counter per prefix, stored in
+        ``attributes["_key_counters"]`` so it survives data round-trips.
+        The counter is seeded from ``keys`` only the first time a prefix is
+        used, e.g. for data written before the counters existed.
+        """
+        counters = self.attributes.setdefault("_key_counters", {})
+        if prefix not in counters:
+            counters[prefix] = max(list(self.get_ids(keys or []))) + 1
+        id = counters[prefix]
+        counters[prefix] = id + 1
         return self.create_key(id, prefix)
 
+    def register_key(self, key, prefix=""):
+        """Advance the counter of ``prefix`` past an explicitly passed key."""
+        counters = self.attributes.get("_key_counters")
+        if not counters or prefix not in counters:
+            # not seeded yet, the first get_next_key will see this key
+            return
+        try:
+            if prefix:
+                if not key.startswith(prefix):
+                    return
+                id = int(key[len(prefix):])
+            else:
+                id = int(key)
+        except (AttributeError, TypeError, ValueError):
+            return
+        if id >= counters[prefix]:
+            counters[prefix] = id + 1
+
     def add_named_node(self, obj, key=None, parent_obj="last"):
         if parent_obj == "last":
             parent_obj = self.get_last_key(obj.attributes.get("node_type"))
-        if self.objects(obj.name) and key is None:
+        if key is None:
             key = self.get_next_key(self.objects(obj.name), obj.name+'_')
-        elif key in self.objects(obj.name):
-            print("Key already in database, value is overwritten")
+        else:
+            if self.has_object(key, obj.name):
+                print("Key already in database, value is overwritten")
+            self.register_key(key, obj.name+'_')
         self.add_node(key, node_type=obj.name, attr_dict={obj.attributes.get("name"): obj})
         self.attributes.update({"_last_{}".format(obj.attributes.get("name")): key})
         if parent_obj is not None:
@@ -77,4 +230,36 @@ class ExtendedGraph(Graph):
         return key
 
     def objects(self, obj_type="node", data=False):
-        return self.get_nodes_where({"node_type": obj_type}, data, obj_type)
\ No newline at end of file
+        return self.get_nodes_where({"node_type": obj_type}, data, obj_type)
+
+
+def _is_encoded(value):
+    return isinstance(value, dict) and "dtype" in value and "value" in value
+
+
+def _is_graph(value):
+    cls = cls_from_dtype(value["dtype"])
+    return issubclass(cls, ExtendedGraph) and cls._nested
+
+
+def _is_nested(value):
+    return isinstance(value, ExtendedGraph) and value._nested
+
+
+def _decode(value, lazy=False):
+    # same as the compas DataDecoder, on data that was loaded as plain JSON
+    if isinstance(value, list):
+        return [_decode(item, lazy) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if not _is_encoded(value):
+        return dict((name, _decode(item, lazy)) for name, item in value.items())
+    cls = cls_from_dtype(value["dtype"])
+    if issubclass(cls, ExtendedGraph):
+        # decodes its own nested values in its data setter
+        obj = cls.from_data(value["value"], lazy=lazy)
+    else:
+        obj = cls.from_data(_decode(value["value"]))
+    if "guid" in value:
+        obj._guid = uuid.UUID(value["guid"])
+    return obj
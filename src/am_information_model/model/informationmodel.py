@@ -1,4 +1,9 @@
 from .graph import ExtendedGraph
+from .instance import ElementInstance
+from .spatialindex import SpatialIndex
+from .scheduler import schedule
+from .targets import iter_targets
+from .parallel import build_elements
 
 from compas.geometry import Frame
 
@@ -13,6 +18,7 @@ class InformationModel(ExtendedGraph):
         self.attributes.update({
             "_last_element" : None
         })
+        self.spatial_index = None
 
     def robots(self, data=False):
         return self.get_nodes_where({"node_type": "robot"}, data)
@@ -26,17 +32,96 @@ class InformationModel(ExtendedGraph):
     def get_element(self, key):
         return self.get_node(key, "element")
 
+    def prototypes(self, data=False):
+        return self.get_nodes_where({"node_type": "prototype"}, data, "prototype")
+
+    def get_prototype(self, key):
+        return self.get_node(key, "prototype")
+
     def add_robot(self, robot, key=None):
-        # if robots is not an empty list
-        if self.robots() and key is None:
+        if key is None:
             key = self.get_next_key(self.robots(), "robot_")
-        elif key in self.robots():
-            print("Key already in database, value is overwritten")
+        else:
+            if self.has_object(key, "robot"):
+                print("Key already in database, value is overwritten")
+            self.register_key(key, "robot_")
         self.add_node(key, node_type="robot", robot=robot)
 
     def add_element(self, element, key=None,
                     parent_element="last", parent_robot="any"):
-        return self.add_named_node(element, key, parent_element)
+        key = self.add_named_node(element, key, parent_element)
+        self.node[key]["robot"] = parent_robot
+        if self.spatial_index is not None:
+            self.spatial_index.add_element(key, element)
+        return key
+
+    def delete_node(self, key):
+        element = self.node[key].get("element")
+        super(InformationModel, self).delete_node(key)
+        if self.spatial_index is not None:
+            self.spatial_index.remove_element(key)
+        if getattr(element, "_spatial", None) is not None:
+            element._spatial = None
+
+    def add_prototype(self, element, key=None):
+        """Add an element shared by instances, it is not built itself, see :meth:`add_instance`."""
+        if key is None:
+            key = self.get_next_key(self.prototypes(), "prototype_")
+        else:
+            if self.has_object(key, "prototype"):
+                print("Key already in database, value is overwritten")
+            self.register_key(key, "prototype_")
+        self.add_node(key, node_type="prototype", prototype=element)
+        return key
+
+    def add_instance(self, prototype, transformation, key=None,
+                     parent_element="last", parent_robot="any"):
+        """Add an instance of a prototype as an element, see :class:`ElementInstance`.
+
+        Parameters
+        ----------
+        prototype : str
+            Key of the prototype, see :meth:`add_prototype`.
+        transformation : :class:`compas.geometry.Transformation`
+            Placement of the prototype.
+
+        Returns
+        -------
+        str
+            Key of the instance element.
+        """
+        instance = ElementInstance(self.get_prototype(prototype), transformation, prototype)
+        return self.add_element(instance, key, parent_element, parent_robot)
+
+    def _resolve(self, key, attr, value, store=True):
+        # instances read from data get their prototype on access
+        if isinstance(value, ElementInstance) and value.prototype is None and value.prototype_key is not None:
+            value._attach(self.get_prototype(value.prototype_key))
+        return value
+
+    def build_elements(self, build, items, **kwargs):
+        """Build elements in a process pool and add them, see :func:`build_elements`."""
+        return build_elements(self, build, items, **kwargs)
+
+    def targets(self, **kwargs):
+        """Iterate over the robot targets of all elements in build order, see :func:`iter_targets`."""
+        return iter_targets(self, **kwargs)
+
+    def schedule(self, **kwargs):
+        """Robot assigned build order of all paths, see :func:`schedule`."""
+        return schedule(self, **kwargs)
+
+    def build_spatial_index(self, cell_size=0.05):
+        """Index the elements and path nodes for nearest, radius and box queries.
+
+        The index is kept up to date by :meth:`add_element`,
+        :meth:`Element.add_path` and :meth:`Element.transform`, see
+        :class:`SpatialIndex`.
+        """
+        self.spatial_index = SpatialIndex(cell_size)
+        for key, element in self.elements(data=True):
+            self.spatial_index.add_element(key, element)
+        return self.spatial_index
 
 
 
@@ -60,6 +145,6 @@ if __name__ == "__main__":
         T = Translation.from_vector([0,0,layer_height*l])
         new_path = path.transformed(T)
         element.add_path(new_path)
-        print(new_path.get_node("node_0", True, "node")[1].frame)
+        print(new_path.get_node("node_0").frame)
 
     print(element.data)
\ No newline at end of file
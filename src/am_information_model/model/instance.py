@@ -0,0 +1,275 @@
+from collections import OrderedDict
+
+from compas.geometry import Frame
+from compas.geometry import Transformation
+
+from .element import Element
+from .layerindex import _path_height
+from .progress import _print_nodes
+from .utilities import _serialize_to_data
+from .utilities import _similarity_scale
+
+__all__ = [
+    'ElementInstance'
+]
+
+# transformed paths kept per instance, see ElementInstance
+PATH_CACHE = 8
+
+
+class ElementInstance(Element):
+    """An element that shares the paths and mesh of a prototype element.
+
+    The instance only stores its transformation, frames and the states of
+    its nodes. Its paths are the paths of the prototype, transformed on
+    access, so targets, schedules and progress work on an instance like on
+    any element. The last ``PATH_CACHE`` paths accessed are kept until the
+    prototype path changes, of the others only their node states. The
+    mesh is the shared mesh of the prototype placed by the transformation,
+    see :attr:`shared_mesh`. The paths of an instance can not be added,
+    deleted or linked, and their node attributes can not be set, change
+    the prototype instead.
+
+    Instances are added with :meth:`InformationModel.add_instance`, which
+    stores the prototype once in the model. The data of an instance names
+    its prototype by key and the model attaches it again on access.
+
+    Parameters
+    ----------
+    prototype : :class:`Element`, optional
+    transformation : :class:`compas.geometry.Transformation`, optional
+        Placement of the prototype, by default the identity.
+    prototype_key : str, optional
+        Key of the prototype in the model.
+    """
+
+    # stored inline in the model, its paths belong to the prototype
+    _nested = False
+
+    def __init__(self, prototype=None, transformation=None, prototype_key=None, name="element", **kwargs):
+        super(ElementInstance, self).__init__(name, **kwargs)
+        self.transformation = transformation.copy() if transformation is not None else Transformation()
+        self.prototype_key = prototype_key
+        self._prototype = None
+        # path key -> (prototype path, its version, transformed path) of the
+        # last paths accessed, see _resolve
+        self._paths = OrderedDict()
+        # path key -> [(node key, state)] of the other paths, written on access
+        self._states = {}
+        # (prototype revision, mesh) of the placed mesh, see mesh
+        self._placed = None
+        if prototype is not None:
+            self._attach(prototype)
+
+    @property
+    def data(self):
+        data = _instance_header(self)
+        states = dict((key, _instance_states(self, key)) for key in self._state_keys())
+        data["states"] = dict((key, nodes) for key, nodes in states.items() if nodes)
+        return data
+
+    @data.setter
+    def data(self, data):
+        self.attributes.update(data.get("attributes") or {})
+        self._decode_attributes()
+        self.prototype_key = data.get("prototype")
+        self.transformation = Transformation.from_matrix(data["transformation"])
+        self.state = data.get("state")
+        if data.get("frame"):
+            self.frame = Frame.from_data(data["frame"])
+        if data.get("_tool_frame"):
+            self.tool_frame = Frame.from_data(data["_tool_frame"])
+        self._paths = OrderedDict()
+        self._states = dict((key, [tuple(item) for item in nodes]) for key, nodes in (data.get("states") or {}).items())
+
+    def _state_keys(self):
+        # keys of the paths that may have node states
+        return list(self._states) + [key for key in self._paths if key not in self._states]
+
+    @property
+    def prototype(self):
+        """The shared :class:`Element`, None until the model attached it."""
+        return self._prototype
+
+    def _attach(self, prototype):
+        self._prototype = prototype
+        # the path graph of the prototype, read only through the instance
+        self.node = prototype.node
+        self.edge = prototype.edge
+        self.adjacency = prototype.adjacency
+        self._type_index = prototype._type_index
+        self._node_types = prototype._node_types
+        self.default_node_attributes = prototype.default_node_attributes
+        self.default_edge_attributes = prototype.default_edge_attributes
+        self.attributes["_last_path"] = prototype.attributes.get("_last_path")
+        self._resolution = prototype._resolution
+        if self._frame is None and prototype.frame is not None:
+            self._frame = prototype.frame.transformed(self.transformation)
+        if self._tool_frame is None and prototype.tool_frame is not None:
+            self._tool_frame = prototype.tool_frame.transformed(self.transformation)
+        self._layers = None
+
+    def _resolve(self, key, attr, value, store=True):
+        if attr != "path" or value is None:
+            return value
+        cached = self._paths.get(key)
+        if cached is not None and cached[0] is value and cached[1] == value.version:
+            if store:
+                # most recently used last
+                self._paths[key] = self._paths.pop(key)
+            return cached[2]
+        path = value.transformed(self.transformation)
+        # keep the states of the copy made before the prototype path changed
+        states = cached and _node_states(cached[2]) or self._states.get(key)
+        if states:
+            _write_states(path, states)
+        if store:
+            self._paths.pop(key, None)
+            self._paths[key] = (value, value.version, path)
+            self._states.pop(key, None)
+            while len(self._paths) > PATH_CACHE:
+                self._evict()
+        return path
+
+    def _evict(self):
+        # drops the least recently used path, its states are made again on access
+        key, (value, version, path) = self._paths.popitem(last=False)
+        states = _node_states(path)
+        if states:
+            self._states[key] = states
+
+    def _path_metrics(self, key, path):
+        scale = _similarity_scale(self.transformation)
+        if scale is not None:
+            # the prototype totals scale like those of Path.transformed
+            return tuple(value*scale for value in super(ElementInstance, self)._path_metrics(key, path))
+        return self._resolve(key, "path", self._prototype.get_path(key), store=False)._get_metrics()
+
+    @property
+    def mesh(self):
+        """Mesh of the prototype placed by the transformation, a copy made on first use.
+
+        Use :attr:`shared_mesh`, :attr:`centroid` and :attr:`bounding_box`
+        to avoid the copy.
+        """
+        if self._prototype is None:
+            return None
+        revision = self._prototype._revision
+        if self._placed is None or self._placed[0] != revision:
+            shared = self.shared_mesh
+            if shared is not None:
+                mesh = shared[0].mesh.transformed(shared[1])
+            elif self._prototype.mesh is not None:
+                mesh = self._prototype.mesh.transformed(self.transformation)
+            else:
+                mesh = None
+            self._placed = (revision, mesh)
+        return self._placed[1]
+
+    @mesh.setter
+    def mesh(self, mesh):
+        raise TypeError("The mesh of an instance is the mesh of its prototype.")
+
+    @property
+    def shared_mesh(self):
+        """``(SharedMesh, Transformation)`` of the prototype shape placed by the transformation, or None."""
+        shared = self._prototype.shared_mesh if self._prototype is not None else None
+        if shared is None:
+            return None
+        return shared[0], self.transformation*shared[1]
+
+    def _geometry_revision(self):
+        return self._revision, self._prototype._revision if self._prototype is not None else None
+
+    def materialize(self):
+        if self._prototype is not None:
+            self._prototype.materialize()
+
+    def add_path(self, path, key=None, parent_path="last", parent_robot="any"):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def delete_node(self, key):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def clear(self):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def _reorder_paths(self, keys, keep_edges=True):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def add_node(self, key=None, attr_dict=None, **kwattr):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def add_edge(self, u, v, attr_dict=None, **kwattr):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def delete_edge(self, u, v):
+        raise TypeError("The paths of an instance are the paths of its prototype.")
+
+    def node_attribute(self, key, name, value=None):
+        if value is not None:
+            raise TypeError("The paths of an instance are the paths of its prototype.")
+        return super(ElementInstance, self).node_attribute(key, name)
+
+    def transform(self, T):
+        # paths not copied yet are copied with the new transformation
+        self.transformation = T*self.transformation
+        self._placed = None
+        super(ElementInstance, self).transform(T)
+
+    def _paths_to_transform(self):
+        return [(key, cached[2]) for key, cached in self._paths.items()]
+
+    def _path_heights(self):
+        # the heights in the node attributes are those of the prototype
+        for key in self.paths():
+            yield key, _path_height(self._resolve(key, "path", self._prototype.get_path(key), store=False))
+
+    def _store_heights(self, paths):
+        pass
+
+    def rebuild_layer_index(self):
+        self._layers = None
+
+    def copy(self, cls=None):
+        instance = super(ElementInstance, self).copy(cls)
+        if self._prototype is not None:
+            instance._attach(self._prototype)
+        return instance
+
+
+def _instance_header(instance):
+    # the data of an instance without its node states
+    return {
+        "attributes": instance.attributes,
+        "prototype": instance.prototype_key,
+        "transformation": [list(row) for row in instance.transformation.matrix],
+        "state": instance.state,
+        "frame": _serialize_to_data(instance.frame),
+        "_tool_frame": _serialize_to_data(instance.tool_frame)
+    }
+
+
+def _instance_states(instance, key):
+    # [(node key, state)] of a path of an instance
+    cached = instance._paths.get(key)
+    if cached is not None:
+        return _node_states(cached[2])
+    return list(instance._states.get(key, ()))
+
+
+def _node_states(path):
+    # [(node key, state)] of the nodes with a state
+    return [(key, state) for key, point, state in _print_nodes(path) if state is not None]
+
+
+def _write_states(path, states):
+    store = path.store
+    for key, state in states:
+        # nodes deleted from the prototype are left out
+        if store is not None:
+            if store.has_key(key):
+                store.states[store.row(store.id(key))] = state
+        elif key in path.node:
+            path.node[key]["node"].attributes["state"] = state
+
@@ -0,0 +1,108 @@
+from bisect import bisect_left
+from bisect import bisect_right
+
+__all__ = [
+    'LayerIndex'
+]
+
+
+class LayerIndex(object):
+    """Path keys sorted by the height of their lowest node.
+
+    Heights are snapped to multiples of ``tolerance``, the paths with the
+    same snapped height form a layer, so every path is in exactly one
+    layer. Lookups are binary searches over the sorted heights.
+
+    Parameters
+    ----------
+    tolerance : float, optional
+        Height step of the layers, in model units (m).
+    """
+
+    def __init__(self, tolerance=1e-6):
+        self.tolerance = tolerance
+        self.heights = []
+        self.keys = []
+        # snapped heights of the paths, in the order of heights
+        self.snapped = []
+        # distinct snapped heights, one per layer
+        self.levels = []
+        self._counts = []
+        self._height = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_paths(cls, paths, tolerance=1e-6):
+        """Build an index from ``(key, path)`` pairs."""
+        return cls.from_heights(((key, _path_height(path)) for key, path in paths), tolerance)
+
+    @classmethod
+    def from_heights(cls, heights, tolerance=1e-6):
+        """Build an index from ``(key, height)`` pairs."""
+        index = cls(tolerance)
+        for key, height in heights:
+            index.add(key, height)
+        return index
+
+    def add(self, key, height):
+        if key in self._height:
+            self.remove(key)
+        if height is None:
+            return
+        self._height[key] = height
+        i = bisect_right(self.heights, height)
+        snapped = self._snap(height)
+        self.heights.insert(i, height)
+        self.keys.insert(i, key)
+        self.snapped.insert(i, snapped)
+        level = bisect_left(self.levels, snapped)
+        if level == len(self.levels) or self.levels[level] != snapped:
+            self.levels.insert(level, snapped)
+            self._counts.insert(level, 0)
+        self._counts[level] += 1
+
+    def remove(self, key):
+        height = self._height.pop(key, None)
+        if height is None:
+            return
+        i = bisect_left(self.heights, height)
+        while self.keys[i] != key:
+            i += 1
+        del self.heights[i]
+        del self.keys[i]
+        level = bisect_left(self.levels, self.snapped.pop(i))
+        self._counts[level] -= 1
+        if not self._counts[level]:
+            del self.levels[level]
+            del self._counts[level]
+
+    def _snap(self, height):
+        # monotonic in the height, so a layer is a run of the sorted heights
+        return int(round(height/self.tolerance))
+
+    def between(self, zmin=None, zmax=None):
+        """Keys of the paths with a height from ``zmin`` to ``zmax``, lowest first."""
+        i = 0 if zmin is None else bisect_left(self.heights, zmin)
+        j = len(self.heights) if zmax is None else bisect_right(self.heights, zmax)
+        for k in range(i, j):
+            yield self.keys[k]
+
+    def layer(self, n):
+        """Keys of the paths in the ``n``-th layer from the bottom, negative from the top."""
+        level = self.levels[n]
+        for k in range(bisect_left(self.snapped, level), bisect_right(self.snapped, level)):
+            yield self.keys[k]
+
+
+def _path_height(path):
+    """Height of the lowest node of a path, None if it has no nodes."""
+    store = path.store
+    if store is not None:
+        if not len(store):
+            return None
+        heights = store.frames[2::9]
+        return float(heights.min()) if hasattr(heights, "min") else min(heights)
+    heights = [attr["node"].frame.point[2] for key, attr in path.nodes(data=True)]
+    return min(heights) if heights else None
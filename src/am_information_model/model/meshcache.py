@@ -0,0 +1,126 @@
+import json
+from weakref import WeakValueDictionary
+
+from compas.data import DataEncoder
+from compas.datastructures import Mesh
+from compas.geometry import Capsule
+from compas.geometry import Cone
+from compas.geometry import Cylinder
+from compas.geometry import Frame
+from compas.geometry import Sphere
+from compas.geometry import Torus
+from compas.geometry import Transformation
+
+from .utilities import _transform_point_array
+
+__all__ = [
+    'MeshCache',
+    'SharedMesh',
+    'MESH_CACHE'
+]
+
+
+class MeshCache(object):
+    """Meshes of element shapes, shared between elements with the same shape.
+
+    A shape with a ``frame``, e.g. a box, is meshed once in the world XY
+    frame and placed by the transformation from there to its frame, so
+    bricks of the same size share a mesh wherever they are. Other shapes
+    share a mesh with identical shapes at the same place. The cache holds
+    the meshes weakly, a mesh is dropped with the last element using it.
+    """
+
+    def __init__(self):
+        self._meshes = WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._meshes)
+
+    def get(self, shape, resolution=None):
+        """Shared mesh of a shape and its placement.
+
+        Parameters
+        ----------
+        shape : :class:`compas.geometry.Shape`
+        resolution : int, optional
+            ``u`` and ``v`` divisions of curved shapes, by default those of
+            :meth:`Shape.to_vertices_and_faces`.
+
+        Returns
+        -------
+        tuple
+            The :class:`SharedMesh`, do not change it, and the
+            :class:`Transformation` that places it.
+        """
+        data = shape.data
+        if isinstance(getattr(shape, "frame", None), Frame) and "frame" in data:
+            # the same shape in the world XY frame
+            placement = Transformation.from_frame(shape.frame)
+            data = dict(data)
+            data["frame"] = Frame.worldXY().data
+        else:
+            placement = Transformation()
+        options = _tessellation(shape, resolution)
+        key = (shape.dtype, json.dumps(_rounded(data), cls=DataEncoder, sort_keys=True),
+               tuple(sorted(options.items())))
+        shared = self._meshes.get(key)
+        if shared is None:
+            shared = SharedMesh(Mesh.from_shape(shape.__class__.from_data(data), **options))
+            self._meshes[key] = shared
+        return shared, placement
+
+    def clear(self):
+        self._meshes.clear()
+
+
+class SharedMesh(object):
+    """A cached mesh with its vertices, centroid and box in its own frame."""
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.vertices = mesh.vertices_attributes("xyz")
+        self.centroid = mesh.centroid() if self.vertices else None
+
+    def centroid_at(self, placement):
+        return list(_transform_point_array([self.centroid], placement)[0])
+
+    def box_at(self, placement):
+        # axis aligned box of the placed vertices
+        points = _transform_point_array(self.vertices, placement)
+        if hasattr(points, "min"):
+            return tuple(points.min(axis=0).tolist()), tuple(points.max(axis=0).tolist())
+        return tuple(min(p[i] for p in points) for i in range(3)), tuple(max(p[i] for p in points) for i in range(3))
+
+
+# divisions of the curved shapes in Shape.to_vertices_and_faces
+DIVISIONS = [
+    (Sphere, ("u", "v")),
+    (Torus, ("u", "v")),
+    (Capsule, ("u", "v")),
+    (Cylinder, ("u",)),
+    (Cone, ("u",))
+]
+
+
+def _tessellation(shape, resolution):
+    if resolution is None:
+        return {}
+    for cls, names in DIVISIONS:
+        if isinstance(shape, cls):
+            return dict((name, resolution) for name in names)
+    return {}
+
+
+def _rounded(data, digits=9):
+    # sizes that differ by float noise only
+    if isinstance(data, float):
+        return round(data, digits) + 0.0
+    if isinstance(data, dict):
+        return dict((name, _rounded(value, digits)) for name, value in data.items())
+    if isinstance(data, (list, tuple)):
+        return [_rounded(value, digits) for value in data]
+    return data
+
+
+# cache of all elements
+MESH_CACHE = MeshCache()
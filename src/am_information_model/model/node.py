@@ -1,6 +1,10 @@
 
 from compas.datastructures import Datastructure
 from compas.geometry import Frame
+from .process import PARAMETERS
+from .process import WIDTH_BOUNDS
+from .process import HEIGHT_BOUNDS
+from .process import solve_process
 
 __all__ = [
     'Node'
@@ -48,104 +52,65 @@ class Node(Datastructure):
         self.key = data["key"]
         self.frame.data = data["frame"]
     
+    def solve_process(self, **kwargs):
+        """Solve the missing process parameter from the other ones.
+
+        See :func:`solve_process`, keyword arguments set the nozzle size
+        and the path profile bounds.
+        """
+        values = solve_process(*[self.attributes.get(name) for name in PARAMETERS], **kwargs)
+        self.attributes.update(zip(PARAMETERS, values))
+        return values
+
     @property
     def robot_velocity(self):
-        if (None not in [self._path_width, self._path_height,
-                         self._extrusion_rate]
-           and self._robot_velocity is None):
-            self.robot_velocity()
-        elif self._robot_velocity is None:
-            print("Robot velocity is not set, and cannot be calculated!")
-        return self._robot_velocity
+        if self.attributes["robot_velocity"] is None:
+            self.solve_process()
+            if self.attributes["robot_velocity"] is None:
+                print("Robot velocity is not set, and cannot be calculated!")
+        return self.attributes["robot_velocity"]
 
     @robot_velocity.setter
     def robot_velocity(self, robot_velocity=None):
-        if robot_velocity is not None:
-            self._robot_velocity = robot_velocity
-        else:
-            area = self._path_width*self._path_height
-            # m3
-            nozzle_size = 0.007
-            volume = area*nozzle_size
-            # profile must be achieved within length of the nozzle
-            velocity = (volume*1000)/self._extrusion_rate
-            # m/min
-            self._robot_velocity = (velocity*1000)/60
-            # mm/s
+        # None solves it from path profile and extrusion rate
+        self.attributes["robot_velocity"] = robot_velocity
+        if robot_velocity is None:
+            self.solve_process()
 
     @property
     def extrusion_rate(self):
-        if (None not in [self._path_width, self._path_height,
-                         self._robot_velocity]
-           and self._extrusion_rate is None):
-            self.extrusion_rate()
-        elif self._extrusion_rate is None:
-            print("Extrusion rate is not set, and cannot be calculated!")
-        return self._extrusion_rate
+        if self.attributes["extrusion_rate"] is None:
+            self.solve_process()
+            if self.attributes["extrusion_rate"] is None:
+                print("Extrusion rate is not set, and cannot be calculated!")
+        return self.attributes["extrusion_rate"]
 
     @extrusion_rate.setter
     def extrusion_rate(self, extrusion_rate=None):
-        if extrusion_rate is not None:
-            self._extrusion_rate = extrusion_rate
-        else:
-            area = self._path_width*self._path_height
-            # m3
-            nozzle_size = 0.007
-            volume = area*nozzle_size
-            # profile must be achieved within length of the nozzle
-            self._extrusion_rate = (volume*1000)/((self._robot_velocity*1000)/60)
+        self.attributes["extrusion_rate"] = extrusion_rate
+        if extrusion_rate is None:
+            self.solve_process()
 
     @property
     def path_profile(self):
-        if (None not in [self._robot_velocity, self._extrusion_rate]
-           and None in [self.path_width, self.path_height]):
-            self.path_profile()
-        elif None in [self.path_width, self.path_height]:
-            print("Path profile is not set, and cannot be calculated!")
-        return self._path_width, self._path_height
+        if None in (self.attributes["path_width"], self.attributes["path_height"]):
+            self.solve_process()
+            if None in (self.attributes["path_width"], self.attributes["path_height"]):
+                print("Path profile is not set, and cannot be calculated!")
+        return self.attributes["path_width"], self.attributes["path_height"]
 
     @path_profile.setter
-    def path_profile(self, path_width=None, path_height=None):
-        if None not in [path_width, path_height]:
-            self._path_width = path_width
-            self._path_height = path_height
-        else:
-            velocity = (self.robot_velocity/1000)*60
-            volume = (velocity*self._extrusion_rate)/1000
-            nozzle_size = 0.007
-            area = volume/nozzle_size
-            if path_width is None and path_height is None:
-                path_heights = range(0.002, 0.006, 0.001)
-                for h in path_heights:
-                    w = area/h
-                    if w > 0.007 and w < 0.014:
-                        self._path_width = w
-                        self._path_height = h
-                        break
-                if self._path_height is None and self._path_width is None:
-                    path_widths = range(0.007, 0.014, 0.0001)
-                    for w in path_widths:
-                        h = area/w
-                        if h > 0.002 and h < 0.006:
-                            self._path_width = w
-                            self._path_height = h
-                            break
-            elif path_width is None:
-                self._path_height = path_height
-                self._path_width = area/path_height
-                if self._path_width < 0.007:
-                    print("calculated path width smaller than nozzle size")
-                elif self._path_width > 0.014:
-                    print("calculated path width larger than twice the nozzle size")
+    def path_profile(self, profile=(None, None)):
+        # width and height, a None is solved from velocity and extrusion rate
+        self.attributes["path_width"], self.attributes["path_height"] = profile or (None, None)
+        if None in (self.attributes["path_width"], self.attributes["path_height"]):
+            self.solve_process()
+            width, height = self.attributes["path_width"], self.attributes["path_height"]
+            if width is not None and not WIDTH_BOUNDS[0] <= width <= WIDTH_BOUNDS[1]:
+                print("calculated path width outside of {} to {}".format(*WIDTH_BOUNDS))
+            if height is not None and not HEIGHT_BOUNDS[0] <= height <= HEIGHT_BOUNDS[1]:
+                print("calculated path height outside of {} to {}".format(*HEIGHT_BOUNDS))
 
-            elif path_height is None:
-                self._path_width = path_width
-                self._path_height = area/path_width
-                if self._path_height < 0.002:
-                    print("calculated path height smaller than two millimeter")
-                elif self._path_height > 0.007:
-                    print("calculated path height larger than the nozzle diameter")
-    
     def transform(self, T):
         self.frame.transform(T)
     
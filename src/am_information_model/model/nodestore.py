@@ -0,0 +1,790 @@
+from array import array
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+from compas.geometry import Frame
+from compas.geometry import Vector
+
+from .node import Node
+from .edge import Edge
+from .utilities import np
+from .utilities import _transform_point_array
+from .utilities import _transform_vector_array
+
+__all__ = [
+    'NodeStore'
+]
+
+
+NAN = float("nan")
+
+
+class NodeStore(object):
+    """Columnar storage for the nodes and edges of a path.
+
+    Frames are kept as nine floats per node (point, xaxis, yaxis) and the
+    process parameters as one float column each, ``None`` is stored as NaN.
+    Anything else is kept in sparse per node dictionaries. Nodes are
+    identified by an integer id, the key of a node is ``prefix + str(id)``.
+
+    :class:`Node` and :class:`Edge` objects are only created on request, as
+    views that read from and write to the columns.
+    """
+
+    COLUMNS = ("path_width", "path_height", "extrusion_rate", "robot_velocity")
+
+    def __init__(self, prefix="node_"):
+        self.prefix = prefix
+        self.ids = array('l')
+        self.frames = array('d')
+        self.columns = dict((name, array('d')) for name in self.COLUMNS)
+        self.states = []
+        self.extras = {}
+        self.entry_extras = {}
+        self.edge_u = array('l')
+        self.edge_v = array('l')
+        self.edge_extras = {}
+        self.edge_entry_extras = {}
+        # ids[i] == i for every row, so an id is its own row
+        self._dense = True
+        self._rows = None
+        self._out = None
+        self._in = None
+        # bumped on every change, see Path.version
+        self.version = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_buffers(cls, ids, frames, columns, edge_u, edge_v, prefix="node_"):
+        """Construct a store on existing buffers, e.g. NumPy memmaps of a file.
+
+        The buffers are used as they are, values can be changed in place.
+        They are only copied into arrays once nodes or edges are added or
+        deleted.
+        """
+        store = cls(prefix)
+        store.ids = ids
+        store.frames = frames
+        store.columns.update(columns)
+        store.states = [None]*len(ids)
+        store.edge_u = edge_u
+        store.edge_v = edge_v
+        if np is not None and isinstance(ids, np.ndarray):
+            store._dense = bool((ids == np.arange(len(ids))).all())
+        else:
+            store._dense = list(ids) == list(range(len(ids)))
+        return store
+
+    def _detach(self):
+        # buffers from from_buffers can be written in place, but not resized
+        if isinstance(self.ids, array):
+            return
+        self.ids = _copy_array('l', self.ids)
+        self.frames = _copy_array('d', self.frames)
+        self.columns = dict((name, _copy_array('d', values)) for name, values in self.columns.items())
+        self.edge_u = _copy_array('l', self.edge_u)
+        self.edge_v = _copy_array('l', self.edge_v)
+
+    def take(self, rows):
+        """Store with the nodes in the given rows, in that order, and no edges."""
+        store = NodeStore(self.prefix)
+        rows = list(rows)
+        store.ids = _take('l', self.ids, rows)
+        store.frames = _take('d', self.frames, [9*row + i for row in rows for i in range(9)])
+        store.columns = dict((name, _take('d', values, rows)) for name, values in self.columns.items())
+        store.states = [self.states[row] for row in rows]
+        ids = set(store.ids)
+        store.extras = dict((id, dict(attr)) for id, attr in self.extras.items() if id in ids)
+        store.entry_extras = dict((id, dict(attr)) for id, attr in self.entry_extras.items() if id in ids)
+        store._dense = list(store.ids) == list(range(len(rows)))
+        return store
+
+    def copy(self):
+        """Independent copy, the columns are copied as flat buffers."""
+        store = NodeStore(self.prefix)
+        store.ids = _copy_array('l', self.ids)
+        store.frames = _copy_array('d', self.frames)
+        store.columns = dict((name, _copy_array('d', values)) for name, values in self.columns.items())
+        store.states = list(self.states)
+        store.extras = dict((id, dict(attr)) for id, attr in self.extras.items())
+        store.entry_extras = dict((id, dict(attr)) for id, attr in self.entry_extras.items())
+        store.edge_u = _copy_array('l', self.edge_u)
+        store.edge_v = _copy_array('l', self.edge_v)
+        store.edge_extras = dict((uv, dict(attr)) for uv, attr in self.edge_extras.items())
+        store.edge_entry_extras = dict((uv, dict(attr)) for uv, attr in self.edge_entry_extras.items())
+        store._dense = self._dense
+        return store
+
+    # --------------------------------------------------------------------------
+    # keys and rows
+    # --------------------------------------------------------------------------
+
+    def key(self, id):
+        return self.prefix + str(id)
+
+    def id(self, key):
+        try:
+            if key.startswith(self.prefix):
+                id = int(key[len(self.prefix):])
+                if self.key(id) == key:
+                    return id
+        except (AttributeError, ValueError):
+            pass
+        raise KeyError(key)
+
+    def keys(self):
+        for id in self.ids:
+            yield self.prefix + str(id)
+
+    def row(self, id):
+        if self._dense:
+            if 0 <= id < len(self.ids):
+                return id
+            return None
+        if self._rows is None:
+            self._rows = dict((id, row) for row, id in enumerate(self.ids))
+        return self._rows.get(id)
+
+    def has_key(self, key):
+        try:
+            return self.row(self.id(key)) is not None
+        except KeyError:
+            return False
+
+    # --------------------------------------------------------------------------
+    # nodes
+    # --------------------------------------------------------------------------
+
+    def add(self, id, frame=None, attributes=None):
+        self.version += 1
+        row = self.row(id)
+        if row is None:
+            self._detach()
+            row = len(self.ids)
+            if self._dense and id != row:
+                self._dense = False
+            if self._rows is not None:
+                self._rows[id] = row
+            self.ids.append(id)
+            self.frames.extend([0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0])
+            for values in self.columns.values():
+                values.append(NAN)
+            self.states.append(None)
+        if frame is not None:
+            self.set_frame(row, frame)
+        for name, value in (attributes or {}).items():
+            self.set_attribute(row, name, value)
+        return row
+
+    def extend(self, ids, points, xaxes=None, yaxes=None, **process):
+        """Append nodes from flat lists of coordinates in one go."""
+        self.version += 1
+        self._detach()
+        n = len(ids)
+        start = len(self.ids)
+        if self._dense and list(ids) != list(range(start, start + n)):
+            self._dense = False
+            self._rows = None
+        self.ids.extend(ids)
+        if xaxes is None:
+            xaxes = [1.0, 0.0, 0.0]*n
+        if yaxes is None:
+            yaxes = [0.0, 1.0, 0.0]*n
+        frames = [0.0]*(9*n)
+        frames[0::9] = points[0::3]
+        frames[1::9] = points[1::3]
+        frames[2::9] = points[2::3]
+        frames[3::9] = xaxes[0::3]
+        frames[4::9] = xaxes[1::3]
+        frames[5::9] = xaxes[2::3]
+        frames[6::9] = yaxes[0::3]
+        frames[7::9] = yaxes[1::3]
+        frames[8::9] = yaxes[2::3]
+        self.frames.extend(frames)
+        for name, values in self.columns.items():
+            value = process.get(name)
+            if isinstance(value, (list, tuple)):
+                values.extend([NAN if v is None else v for v in value])
+            else:
+                values.extend([NAN if value is None else value]*n)
+        self.states.extend([None]*n)
+
+    def delete(self, row):
+        self.version += 1
+        self._detach()
+        id = self.ids[row]
+        del self.ids[row]
+        del self.frames[9*row:9*row + 9]
+        for values in self.columns.values():
+            del values[row]
+        del self.states[row]
+        self.extras.pop(id, None)
+        self.entry_extras.pop(id, None)
+        edges = [(u, v) for u, v in zip(self.edge_u, self.edge_v) if u == id or v == id]
+        for u, v in edges:
+            self.delete_edge(u, v)
+        if row != len(self.ids):
+            self._dense = False
+        self._rows = None
+
+    def point(self, row):
+        i = 9*row
+        return self.frames[i:i + 3].tolist()
+
+    def frame(self, row):
+        i = 9*row
+        f = self.frames
+        return Frame(f[i:i + 3].tolist(), f[i + 3:i + 6].tolist(), f[i + 6:i + 9].tolist())
+
+    def set_frame(self, row, frame):
+        self.version += 1
+        i = 9*row
+        self.frames[i:i + 9] = array('d', list(frame.point) + list(frame.xaxis) + list(frame.yaxis))
+
+    def get_attribute(self, row, name, default=None):
+        if name in self.columns:
+            value = self.columns[name][row]
+            return None if value != value else value
+        if name == "state":
+            return self.states[row]
+        return self.extras.get(self.ids[row], {}).get(name, default)
+
+    def set_attribute(self, row, name, value):
+        self.version += 1
+        if name in self.columns:
+            self.columns[name][row] = NAN if value is None else value
+        elif name == "state":
+            self.states[row] = value
+        else:
+            self.extras.setdefault(self.ids[row], {})[name] = value
+
+    def node(self, id):
+        """A :class:`Node` view on the node with the given id."""
+        return NodeView(self, id)
+
+    def to_node(self, row):
+        """A detached :class:`Node` copy of the node in the given row."""
+        node = Node(frame=self.frame(row))
+        node.attributes.update(dict(_NodeAttributes(self, self.ids[row])))
+        return node
+
+    def transform(self, T):
+        self.version += 1
+        if not len(self.ids):
+            return
+        if np is not None:
+            # in place, on a view of the frame buffer
+            f = np.asarray(self.frames) if isinstance(self.frames, np.ndarray) else np.frombuffer(self.frames, dtype=float)
+            f = f.reshape(-1, 9)
+            f[:, 0:3] = _transform_point_array(f[:, 0:3], T)
+            f[:, 3:6] = _transform_vector_array(f[:, 3:6], T)
+            f[:, 6:9] = _transform_vector_array(f[:, 6:9], T)
+            del f
+            return
+        f = self.frames.tolist()
+        points = _transform_point_array([f[i:i + 3] for i in range(0, len(f), 9)], T)
+        xaxes = _transform_vector_array([f[i + 3:i + 6] for i in range(0, len(f), 9)], T)
+        yaxes = _transform_vector_array([f[i + 6:i + 9] for i in range(0, len(f), 9)], T)
+        for i, (p, x, y) in enumerate(zip(points, xaxes, yaxes)):
+            f[9*i:9*i + 9] = p + x + y
+        self.frames = array('d', f)
+
+    def metrics(self):
+        """Total length, print duration and extruded volume over all edges.
+
+        Each edge is printed with the process parameters of its start node,
+        lengths are in model units (m), ``robot_velocity`` in mm/s.
+        """
+        if not len(self.edge_u):
+            return 0.0, 0.0, 0.0
+        if np is None:
+            length = duration = volume = 0.0
+            for u, v in zip(self.edge_u, self.edge_v):
+                ru, rv = self.row(u), self.row(v)
+                l = _distance(self.point(ru), self.point(rv))
+                d, V = _edge_metrics(l, *[self.get_attribute(ru, name) for name in ("robot_velocity", "path_width", "path_height")])
+                length += l
+                duration += d
+                volume += V
+            return length, duration, volume
+        f = (np.asarray(self.frames) if isinstance(self.frames, np.ndarray) else np.frombuffer(self.frames, dtype=float)).reshape(-1, 9)
+        if self._dense:
+            ru, rv = np.asarray(self.edge_u), np.asarray(self.edge_v)
+        else:
+            ru = np.array([self.row(u) for u in self.edge_u])
+            rv = np.array([self.row(v) for v in self.edge_v])
+        lengths = np.linalg.norm(f[rv, 0:3] - f[ru, 0:3], axis=1)
+        velocity = _column(self.columns["robot_velocity"])[ru]
+        area = _column(self.columns["path_width"])[ru]*_column(self.columns["path_height"])[ru]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            durations = np.where(velocity > 0, lengths*1000.0/velocity, 0.0)
+        volumes = np.where(area > 0, lengths*area, 0.0)
+        del f
+        return float(lengths.sum()), float(durations.sum()), float(volumes.sum())
+
+    def node_items(self):
+        """Yield ``(key, attr)`` per node, with a detached :class:`Node` in ``attr["node"]``."""
+        for row, id in enumerate(self.ids):
+            attr = dict(self.entry_extras.get(id, {}))
+            attr["node"] = self.to_node(row)
+            yield self.key(id), attr
+
+    def edge_items(self):
+        """Yield ``(u, v, attr)`` per edge, with a detached :class:`Edge` in ``attr["edge"]``."""
+        for u, v in zip(self.edge_u, self.edge_v):
+            attr = dict(self.edge_entry_extras.get((u, v), {}))
+            attr["edge"] = self.edge(u, v).copy()
+            yield self.key(u), self.key(v), attr
+
+    def to_graph_data(self):
+        """The node, edge and adjacency dicts of ``Graph.data``, with detached nodes and edges."""
+        node, edge, adjacency = {}, {}, {}
+        for key, attr in self.node_items():
+            node[repr(key)] = attr
+            edge[repr(key)] = {}
+            adjacency[repr(key)] = {}
+        for u, v, attr in self.edge_items():
+            edge[repr(u)][repr(v)] = attr
+            adjacency[repr(u)][repr(v)] = None
+            adjacency[repr(v)][repr(u)] = None
+        return node, edge, adjacency
+
+    # --------------------------------------------------------------------------
+    # edges
+    # --------------------------------------------------------------------------
+
+    def _adjacency(self):
+        out, in_ = self._out, self._in
+        if out is None or in_ is None:
+            out, in_ = {}, {}
+            for u, v in zip(self.edge_u, self.edge_v):
+                out.setdefault(u, []).append(v)
+                in_.setdefault(v, []).append(u)
+            # assigned once complete, snapshot stores are read by several threads
+            self._in = in_
+            self._out = out
+        return out, in_
+
+    def out_ids(self, id):
+        return self._adjacency()[0].get(id, [])
+
+    def in_ids(self, id):
+        return self._adjacency()[1].get(id, [])
+
+    def has_edge(self, u, v):
+        return v in self.out_ids(u)
+
+    def add_edge(self, u, v):
+        if self._out is not None and self.has_edge(u, v):
+            return
+        if self._out is None and len(self.edge_u) and self.edge_u[-1] == u and self.edge_v[-1] == v:
+            return
+        self._detach()
+        self.version += 1
+        self.edge_u.append(u)
+        self.edge_v.append(v)
+        if self._out is not None:
+            self._out.setdefault(u, []).append(v)
+            self._in.setdefault(v, []).append(u)
+
+    def delete_edge(self, u, v):
+        self.version += 1
+        self._detach()
+        for i in range(len(self.edge_u) - 1, -1, -1):
+            if self.edge_u[i] == u and self.edge_v[i] == v:
+                del self.edge_u[i]
+                del self.edge_v[i]
+        self.edge_extras.pop((u, v), None)
+        self.edge_entry_extras.pop((u, v), None)
+        self._out = self._in = None
+
+    def edge(self, u, v):
+        """An :class:`Edge` view on the edge between the nodes with ids u and v."""
+        return EdgeView(self, u, v)
+
+    def vector(self, u, v):
+        a = self.point(self.row(u))
+        b = self.point(self.row(v))
+        return Vector(b[0] - a[0], b[1] - a[1], b[2] - a[2])
+
+
+def _column(values):
+    if isinstance(values, np.ndarray):
+        return np.asarray(values)
+    return np.frombuffer(values, dtype=float)
+
+
+def _distance(a, b):
+    return ((b[0] - a[0])**2 + (b[1] - a[1])**2 + (b[2] - a[2])**2)**0.5
+
+
+def _edge_metrics(length, velocity, width, height):
+    # print duration (s) and extruded volume of an edge
+    duration = length*1000.0/velocity if velocity else 0.0
+    volume = length*width*height if width and height else 0.0
+    return duration, volume
+
+
+def _take(typecode, values, index):
+    if np is not None:
+        return array(typecode, np.asarray(values)[np.asarray(index, dtype=int)].tolist())
+    return array(typecode, [values[i] for i in index])
+
+
+def _copy_array(typecode, values):
+    if isinstance(values, array):
+        return array(typecode, values)
+    return array(typecode, values.tolist())
+
+
+class NodeView(Node):
+    """A :class:`Node` backed by a row of a :class:`NodeStore`.
+
+    The frame is rebuilt from the columns on every access, assign a frame
+    or use :meth:`transform` to change it.
+    """
+
+    def __init__(self, store, id):
+        super(Node, self).__init__()
+        self._store = store
+        self._id = id
+        self.attributes = _NodeAttributes(store, id)
+
+    @property
+    def key(self):
+        return self._store.key(self._id)
+
+    @key.setter
+    def key(self, key):
+        pass
+
+    @property
+    def frame(self):
+        return self._store.frame(self._store.row(self._id))
+
+    @frame.setter
+    def frame(self, frame):
+        self._store.set_frame(self._store.row(self._id), frame)
+
+    @property
+    def data(self):
+        return {
+            "attributes": dict(self.attributes),
+            "key": self.key,
+            "frame": self.frame.data
+        }
+
+    @data.setter
+    def data(self, data):
+        self.attributes.update(data["attributes"] or {})
+        self.frame = Frame.from_data(data["frame"])
+
+    def transform(self, T):
+        frame = self.frame
+        frame.transform(T)
+        self.frame = frame
+
+    def copy(self, cls=None):
+        return self._store.to_node(self._store.row(self._id))
+
+
+class EdgeView(Edge):
+    """An :class:`Edge` whose vector is derived from the node points of a :class:`NodeStore`."""
+
+    def __init__(self, store, u, v):
+        super(Edge, self).__init__()
+        self._store = store
+        self._uv = (u, v)
+        self.key = None
+        self.attributes = _EdgeAttributes(store, u, v)
+
+    @property
+    def vector(self):
+        return self._store.vector(*self._uv)
+
+    @vector.setter
+    def vector(self, vector):
+        pass
+
+    @property
+    def data(self):
+        return {
+            "attributes": dict(self.attributes),
+            "key": self.key,
+            "vector": self.vector.data
+        }
+
+    @data.setter
+    def data(self, data):
+        self.attributes.update(data["attributes"] or {})
+
+    def copy(self, cls=None):
+        edge = Edge(vector=self.vector)
+        edge.attributes.update(self.attributes)
+        return edge
+
+
+# ==============================================================================
+# Mapping views, these stand in for the node, edge and adjacency dicts of Graph
+# ==============================================================================
+
+
+class _NodeAttributes(MutableMapping):
+    # Node.attributes of a view
+
+    def __init__(self, store, id):
+        self._store = store
+        self._id = id
+
+    def _names(self):
+        names = ["name", "node_type", "state"] + list(NodeStore.COLUMNS)
+        extras = self._store.extras.get(self._id, {})
+        return names + [name for name in extras if name not in names]
+
+    def __getitem__(self, name):
+        row = self._store.row(self._id)
+        extras = self._store.extras.get(self._id, {})
+        if name in extras:
+            return extras[name]
+        if name in ("name", "node_type"):
+            return "node"
+        if name == "state" or name in NodeStore.COLUMNS:
+            return self._store.get_attribute(row, name)
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        self._store.set_attribute(self._store.row(self._id), name, value)
+
+    def __delitem__(self, name):
+        extras = self._store.extras.get(self._id, {})
+        if name in extras:
+            del extras[name]
+        else:
+            self[name] = None
+
+    def __iter__(self):
+        return iter(self._names())
+
+    def __len__(self):
+        return len(self._names())
+
+
+class _EdgeAttributes(MutableMapping):
+    # Edge.attributes of a view
+
+    def __init__(self, store, u, v):
+        self._store = store
+        self._uv = (u, v)
+
+    def _dict(self):
+        return self._store.edge_extras.get(self._uv, {})
+
+    def __getitem__(self, name):
+        extras = self._dict()
+        if name in extras:
+            return extras[name]
+        if name == "name":
+            return "edge"
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        self._store.edge_extras.setdefault(self._uv, {})[name] = value
+
+    def __delitem__(self, name):
+        del self._dict()[name]
+
+    def __iter__(self):
+        extras = self._dict()
+        return iter(["name"] + [name for name in extras if name != "name"])
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+
+class _Entry(MutableMapping):
+    # graph level attribute dict of a node or edge: {name: view} + extras
+
+    def __init__(self, name, view, extras, key):
+        self._name = name
+        self._view = view
+        self._extras = extras
+        self._key = key
+
+    def __getitem__(self, name):
+        if name == self._name:
+            return self._view()
+        return self._extras.get(self._key, {})[name]
+
+    def __setitem__(self, name, value):
+        if name == self._name:
+            self._view().data = value.data
+        else:
+            self._extras.setdefault(self._key, {})[name] = value
+
+    def __delitem__(self, name):
+        del self._extras.get(self._key, {})[name]
+
+    def __iter__(self):
+        return iter([self._name] + list(self._extras.get(self._key, {})))
+
+    def __len__(self):
+        return 1 + len(self._extras.get(self._key, {}))
+
+
+class NodeMap(MutableMapping):
+    """Stand-in for ``Graph.node`` on top of a :class:`NodeStore`."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, key):
+        store = self.store
+        id = store.id(key)
+        if store.row(id) is None:
+            raise KeyError(key)
+        return _Entry("node", lambda: store.node(id), store.entry_extras, id)
+
+    def __setitem__(self, key, attr):
+        id = self.store.id(key)
+        self.store.add(id)
+        entry = self[key]
+        for name, value in attr.items():
+            entry[name] = value
+
+    def __delitem__(self, key):
+        row = self.store.row(self.store.id(key))
+        if row is None:
+            raise KeyError(key)
+        self.store.delete(row)
+
+    def __contains__(self, key):
+        return self.store.has_key(key)
+
+    def __iter__(self):
+        return self.store.keys()
+
+    def __len__(self):
+        return len(self.store)
+
+
+class _OutEdges(MutableMapping):
+
+    def __init__(self, store, u):
+        self.store = store
+        self.u = u
+
+    def __getitem__(self, key):
+        store, u = self.store, self.u
+        v = store.id(key)
+        if not store.has_edge(u, v):
+            raise KeyError(key)
+        return _Entry("edge", lambda: store.edge(u, v), store.edge_entry_extras, (u, v))
+
+    def __setitem__(self, key, attr):
+        v = self.store.id(key)
+        self.store.add_edge(self.u, v)
+        entry = self[key]
+        for name, value in attr.items():
+            if name != "edge":
+                entry[name] = value
+
+    def __delitem__(self, key):
+        self.store.delete_edge(self.u, self.store.id(key))
+
+    def __contains__(self, key):
+        try:
+            return self.store.has_edge(self.u, self.store.id(key))
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        return iter([self.store.key(v) for v in self.store.out_ids(self.u)])
+
+    def __len__(self):
+        return len(self.store.out_ids(self.u))
+
+
+class EdgeMap(MutableMapping):
+    """Stand-in for ``Graph.edge`` on top of a :class:`NodeStore`."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return _OutEdges(self.store, self.store.id(key))
+
+    def __setitem__(self, key, nbrs):
+        out = self[key]
+        for v, attr in nbrs.items():
+            out[v] = attr
+
+    def __delitem__(self, key):
+        u = self.store.id(key)
+        for v in list(self.store.out_ids(u)):
+            self.store.delete_edge(u, v)
+
+    def __contains__(self, key):
+        return self.store.has_key(key)
+
+    def __iter__(self):
+        return self.store.keys()
+
+    def __len__(self):
+        return len(self.store)
+
+
+class _Neighbors(MutableMapping):
+
+    def __init__(self, store, id):
+        self.store = store
+        self.id = id
+
+    def _ids(self):
+        ids = list(self.store.in_ids(self.id))
+        return ids + [v for v in self.store.out_ids(self.id) if v not in ids]
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return None
+
+    def __setitem__(self, key, value):
+        # adjacency follows the edges, nothing to store
+        pass
+
+    def __delitem__(self, key):
+        pass
+
+    def __contains__(self, key):
+        try:
+            return self.store.id(key) in self._ids()
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        return iter([self.store.key(id) for id in self._ids()])
+
+    def __len__(self):
+        return len(self._ids())
+
+
+class AdjacencyMap(EdgeMap):
+    """Stand-in for ``Graph.adjacency`` on top of a :class:`NodeStore`."""
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return _Neighbors(self.store, self.store.id(key))
+
+    def __setitem__(self, key, nbrs):
+        pass
+
+    def __delitem__(self, key):
+        pass
@@ -0,0 +1,84 @@
+try:
+    from multiprocessing import Pool
+    from multiprocessing import cpu_count
+except ImportError:
+    Pool = None
+
+from .binary import binary_dumps
+from .binary import binary_loads
+
+__all__ = [
+    'build_elements'
+]
+
+
+def build_elements(model, build, items, processes=None, chunksize=1,
+                   parent_element="last", parent_robot="any"):
+    """Build elements in a process pool and add them to a model.
+
+    ``build(item)`` is called for every item in a worker process and
+    returns an :class:`Element`. The element is sent back in the compact
+    form of :func:`binary_dumps` and added with :meth:`add_element` in the
+    order of ``items``, so keys and parent edges are the same as when the
+    elements are built and added one by one. The paths of the added
+    elements are columnar, also when they are built in this process, see
+    :meth:`Path.to_objects`.
+
+    Parameters
+    ----------
+    model : :class:`InformationModel`
+    build : callable
+        Function of an item that returns an element. The workers must be
+        able to import it, so a module level function, not a lambda.
+    items : iterable
+        Arguments of ``build``, e.g. the element shapes.
+    processes : int, optional
+        Number of worker processes, by default one per CPU. With one, or
+        where ``multiprocessing`` is not available, the elements are built
+        in this process.
+    chunksize : int, optional
+        Items sent to a worker at a time, more for many small elements.
+    parent_element : str, optional
+        Parent of the first element, see :meth:`add_element`. Every other
+        element has the one before it as parent.
+    parent_robot : str, optional
+
+    Returns
+    -------
+    list[str]
+        Keys of the added elements.
+    """
+    items = list(items)
+    if Pool is None or processes == 1 or len(items) < 2:
+        elements = (_columnar(build(item)) for item in items)
+    else:
+        elements = _build_parallel(build, items, processes, chunksize)
+    keys = []
+    for element in elements:
+        parent = parent_element if not keys else keys[-1]
+        keys.append(model.add_element(element, parent_element=parent, parent_robot=parent_robot))
+    return keys
+
+
+def _build_parallel(build, items, processes, chunksize):
+    pool = Pool(min(processes or cpu_count(), len(items)))
+    try:
+        for data in pool.imap(_build, [(build, item) for item in items], chunksize):
+            yield binary_loads(data)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _columnar(element):
+    # the same paths as an element sent back by a worker
+    for key, path in element.paths(data=True):
+        path.to_columnar()
+    return element
+
+
+def _build(args):
+    # runs in a worker process
+    build, item = args
+    return binary_dumps(build(item))
+
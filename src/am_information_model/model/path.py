@@ -1,21 +1,268 @@
 from .graph import ExtendedGraph
+from .node import Node
 from .edge import Edge
+from .nodestore import NodeStore
+from .nodestore import NodeMap
+from .nodestore import EdgeMap
+from .nodestore import AdjacencyMap
+from .utilities import _transform_point_array
+from .utilities import _transform_vector_array
+from .utilities import _similarity_scale
+from .nodestore import _edge_metrics
+from .process import solve_path_process
+from .process import PARAMETERS
+from .simplify import simplify_indices
+from .utilities import np
+
+from ast import literal_eval
 
 from compas.geometry import Frame
+from compas.geometry import Vector
 
 __all__ = [
     'Path'
 ]
 
+# transforms kept per path for delta patches
+TRANSFORM_LOG = 64
+
+
 class Path(ExtendedGraph):
     def __init__(self, name="path", frame=None, **kwargs):
-        super(Path, self).__init__(name, *kwargs)
+        super(Path, self).__init__(name, **kwargs)
+        self._store = None
+        self._version = 0
+        # (version, (length, duration, volume)), see metrics
+        self._metrics = None
+        # (version before, version after, matrix, tag) of recent transforms, see delta
+        self._transforms = []
+        # (version before, version after, node keys, attribute names) of recent node changes
+        self._changes = []
         self.attributes.update({
             "node_type": "path",
             "frame": frame,
             "direction": "clockwise",
+            # printed from the last node to the first, see flip
+            "reversed": False,
             "_last_node" : None
         })
+        if kwargs.get("columnar"):
+            self._set_store(NodeStore("node_"))
+
+    @property
+    def data(self):
+        if self._store is None:
+            return super(Path, self).data
+        node, edge, adjacency = self._store.to_graph_data()
+        return {
+            "attributes": self.attributes,
+            "dna": self.default_node_attributes,
+            "dea": self.default_edge_attributes,
+            "node": node,
+            "edge": edge,
+            "adjacency": adjacency,
+            "max_node": self._max_node
+        }
+
+    @data.setter
+    def data(self, data):
+        self._store = None
+        self.invalidate()
+        super(Path, self.__class__).data.fset(self, data)
+        if self.attributes.get("_columnar"):
+            self.to_columnar()
+
+    @property
+    def version(self):
+        """Counter that changes with every change made through the path or its store."""
+        return self._version + (self._store.version if self._store is not None else 0)
+
+    def invalidate(self, keys=None, names=None):
+        """Mark the path as changed, e.g. after editing node objects in place.
+
+        Parameters
+        ----------
+        keys : list, optional
+            Keys of the changed nodes, by default any part of the path may
+            have changed. Patches and snapshots then only send and copy
+            these nodes, see :func:`make_patch`.
+        names : list, optional
+            Names of the changed node attributes, ``"frame"`` for the frame,
+            by default any.
+        """
+        version = self.version
+        self._version += 1
+        if keys is not None:
+            self._log_changes(version, keys, names)
+
+    def _log_changes(self, version, keys, names):
+        # node changes from version to the current version, see _changes_since
+        names = set(names) if names is not None else None
+        last = self._changes[-1] if self._changes else None
+        if last is not None and last[1] == version and last[3] is not None and names is not None:
+            # consecutive changes of attributes, e.g. progress, are merged
+            last[2].update(keys)
+            last[3].update(names)
+            self._changes[-1] = (last[0], self.version, last[2], last[3])
+            return
+        self._changes.append((version, self.version, set(keys), names))
+        del self._changes[:-TRANSFORM_LOG]
+
+    def update_node(self, key, frame=None, **attributes):
+        """Change the frame and attributes of a node, tracked for patches and snapshots.
+
+        Parameters
+        ----------
+        key : str
+        frame : :class:`compas.geometry.Frame`, optional
+        **attributes
+            Node attributes, e.g. ``state`` or ``extrusion_rate``.
+        """
+        # the state does not change the metrics
+        metrics = self._metrics if self._metrics_valid() and frame is None and set(attributes) <= set(["state"]) else None
+        version = self.version
+        node = self.node[key]["node"]
+        if frame is not None:
+            node.frame = frame
+        node.attributes.update(attributes)
+        self._version += 1
+        self._log_changes(version, [key], list(attributes) + (["frame"] if frame is not None else []))
+        self._with_metrics(metrics)
+
+    @property
+    def metrics(self):
+        """Total length, print duration and extruded volume of the path.
+
+        Each edge is printed with the ``robot_velocity``, ``path_width`` and
+        ``path_height`` of its start node, lengths are in model units (m),
+        velocities in mm/s and durations in s. Edges without the parameters
+        count for their length only. The totals are cached and updated
+        incrementally when nodes are added or the path is transformed.
+        They are cached per :attr:`version`, which node objects edited in
+        place on a path that is not columnar do not change, call
+        :meth:`invalidate` after such edits or use :meth:`update_node`.
+        """
+        length, duration, volume = self._get_metrics()
+        return {"length": length, "duration": duration, "volume": volume}
+
+    @property
+    def length(self):
+        return self._get_metrics()[0]
+
+    @property
+    def duration(self):
+        return self._get_metrics()[1]
+
+    @property
+    def volume(self):
+        return self._get_metrics()[2]
+
+    def solve_process(self, **kwargs):
+        """Solve the missing process parameter of every node at once.
+
+        See :func:`solve_path_process`, the solved values are written to the
+        nodes and a report of the solved, unsolved and out of limit node keys
+        is returned.
+        """
+        return solve_path_process(self, **kwargs)
+
+    def stream_targets(self, reader, writer, **kwargs):
+        """Coroutine that streams the nodes of the path to a controller, see :class:`TargetStream`."""
+        # asyncio is Python 3 only, imported on use
+        from .streaming import TargetStream
+        return TargetStream(self, **kwargs).run(reader, writer)
+
+    def _get_metrics(self):
+        version = self.version
+        if self._metrics is None or self._metrics[0] != version:
+            if self._store is not None:
+                totals = self._store.metrics()
+            else:
+                totals = [0.0, 0.0, 0.0]
+                for u, v in self.edges():
+                    for i, value in enumerate(self._edge_metrics(u, v)):
+                        totals[i] += value
+            self._metrics = (version, tuple(totals))
+        return self._metrics[1]
+
+    def _edge_metrics(self, u, v):
+        nu = self.node[u]["node"]
+        length = nu.frame.point.distance_to_point(self.node[v]["node"].frame.point)
+        attributes = nu.attributes
+        duration, volume = _edge_metrics(length, *[attributes.get(name) for name in ("robot_velocity", "path_width", "path_height")])
+        return length, duration, volume
+
+    def _metrics_valid(self):
+        return self._metrics is not None and self._metrics[0] == self.version
+
+    @property
+    def store(self):
+        """The :class:`NodeStore` of a columnar path, None otherwise."""
+        return self._store
+
+    @property
+    def columnar(self):
+        return self._store is not None
+
+    def _set_store(self, store):
+        self._store = store
+        self.node = NodeMap(store)
+        self.edge = EdgeMap(store)
+        self.adjacency = AdjacencyMap(store)
+        self.attributes["_columnar"] = True
+
+    def to_columnar(self):
+        """Move nodes and edges into a :class:`NodeStore`.
+
+        Nodes and edges are then handed out as views on the store, so the
+        memory per node is a few hundred bytes instead of a few kilobytes.
+        Only keys of the form ``node_<int>`` are supported.
+        """
+        if self._store is None:
+            self._set_store(self.as_store())
+
+    def as_store(self):
+        """The :class:`NodeStore` of the path, or a new one built from its nodes and edges."""
+        if self._store is not None:
+            return self._store
+        store = NodeStore("node_")
+        for key, attr in self.node.items():
+            node = attr.get("node")
+            if node is not None:
+                store.add(store.id(key), node.frame, node.attributes)
+            else:
+                store.add(store.id(key))
+            extras = dict((name, value) for name, value in attr.items() if name != "node")
+            if extras:
+                store.entry_extras[store.id(key)] = extras
+        for u, nbrs in self.edge.items():
+            for v, attr in nbrs.items():
+                uv = (store.id(u), store.id(v))
+                store.add_edge(*uv)
+                extras = dict((name, value) for name, value in attr.items() if name != "edge")
+                if extras:
+                    store.edge_entry_extras[uv] = extras
+                edge = attr.get("edge")
+                if edge is not None and edge.attributes != {"name": "edge"}:
+                    store.edge_extras[uv] = dict(edge.attributes)
+        return store
+
+    def to_objects(self):
+        """Move nodes and edges out of the :class:`NodeStore` into plain node and edge objects."""
+        if self._store is None:
+            return
+        node, edge, adjacency = self._store.to_graph_data()
+        self._store = None
+        self.node = dict((literal_eval(key), attr) for key, attr in node.items())
+        self.edge = dict((literal_eval(u), dict((literal_eval(v), attr) for v, attr in nbrs.items())) for u, nbrs in edge.items())
+        self.adjacency = dict((literal_eval(u), dict((literal_eval(v), None) for v in nbrs)) for u, nbrs in adjacency.items())
+        self.attributes["_columnar"] = False
+
+    def clear(self):
+        self.invalidate()
+        super(Path, self).clear()
+        if self._store is not None:
+            self._set_store(NodeStore("node_"))
 
     @property
     def frame(self):
@@ -24,6 +271,47 @@ class Path(ExtendedGraph):
     @frame.setter
     def frame(self, frame):
         self.attributes["frame"] = frame
+        self.invalidate()
+
+    def flip(self):
+        """Reverse the print direction of the path.
+
+        The nodes keep their order, the path is marked ``reversed`` and its
+        ``direction`` swaps between clockwise and counterclockwise.
+        """
+        self.attributes["reversed"] = not self.attributes.get("reversed")
+        direction = self.attributes.get("direction")
+        self.attributes["direction"] = {"clockwise": "counterclockwise", "counterclockwise": "clockwise"}.get(direction, direction)
+        # a new version for snapshots and patches, flipping does not change the metrics
+        metrics = self._metrics if self._metrics_valid() else None
+        self.invalidate()
+        self._with_metrics(metrics)
+
+    def print_order(self):
+        """Node keys in print order."""
+        keys = list(self.store.keys()) if self._store is not None else list(self.node)
+        if self.attributes.get("reversed"):
+            keys.reverse()
+        return keys
+
+    def endpoints(self):
+        """Points of the first and the last node printed, None if the path has no nodes."""
+        if self._store is not None:
+            if not len(self._store):
+                return None
+            ends = self._store.point(0), self._store.point(len(self._store) - 1)
+        else:
+            first = last = None
+            for key in self.node:
+                if first is None:
+                    first = key
+                last = key
+            if first is None:
+                return None
+            ends = list(self.node[first]["node"].frame.point), list(self.node[last]["node"].frame.point)
+        if self.attributes.get("reversed"):
+            return ends[1], ends[0]
+        return ends
 
     @classmethod
     def from_nodes(cls, nodes):
@@ -31,6 +319,113 @@ class Path(ExtendedGraph):
         path.add_nodes(nodes)
         return path
 
+    @classmethod
+    def from_frames(cls, frames, **process):
+        """Construct a path from a sequence of frames in one pass.
+
+        Parameters
+        ----------
+        frames : list[:class:`compas.geometry.Frame`]
+            Node frames, in print order.
+        **process : float or list[float], optional
+            Per node process parameters, e.g. ``path_width``, ``path_height``,
+            ``extrusion_rate`` or ``robot_velocity``. A single value is used
+            for every node.
+
+        Returns
+        -------
+        :class:`Path`
+        """
+        path = cls(frame=frames[0] if len(frames) else None)
+        path._extend_chain(frames, process)
+        return path
+
+    @classmethod
+    def from_arrays(cls, points, xaxes=None, yaxes=None, columnar=False, **process):
+        """Construct a path from N x 3 point and axis arrays in one pass.
+
+        Parameters
+        ----------
+        points : list[list[float]] or ndarray
+            Node points.
+        xaxes, yaxes : list[list[float]] or ndarray, optional
+            Node frame axes, default to the world XY axes.
+        columnar : bool, optional
+            Keep the nodes in a :class:`NodeStore`, see :meth:`to_columnar`.
+        **process : float or list[float], optional
+            Per node process parameters, see :meth:`from_frames`.
+
+        Returns
+        -------
+        :class:`Path`
+        """
+        if columnar:
+            path = cls(columnar=True)
+            path._extend_store(_flatten(points), _flatten(xaxes), _flatten(yaxes), process)
+            path.frame = path.get_node(path.get_key("first")).frame if len(path.store) else None
+            return path
+        points = _aslist(points)
+        xaxes = _aslist(xaxes) if xaxes is not None else [[1.0, 0.0, 0.0]]*len(points)
+        yaxes = _aslist(yaxes) if yaxes is not None else [[0.0, 1.0, 0.0]]*len(points)
+        frames = [Frame(p, x, y) for p, x, y in zip(points, xaxes, yaxes)]
+        return cls.from_frames(frames, **process)
+
+    def _extend_chain(self, frames, process):
+        # appends a linear chain of nodes without going through add_node,
+        # keys are preallocated and edges are made from the frames directly
+        if self._store is not None:
+            points, xaxes, yaxes = [], [], []
+            for frame in frames:
+                points.extend(frame.point)
+                xaxes.extend(frame.xaxis)
+                yaxes.extend(frame.yaxis)
+            self._extend_store(points, xaxes, yaxes, process)
+            return
+        self.invalidate()
+        process = dict((name, _aslist(values)) for name, values in process.items())
+        start = self._reserve_keys(len(frames))
+
+        u = self.get_last_key("node")
+        pu = self.get_node(u).frame.point if u is not None else None
+        for i, frame in enumerate(frames):
+            node = Node(frame=frame)
+            for name, values in process.items():
+                node.attributes[name] = values[i] if isinstance(values, (list, tuple)) else values
+            v = self.create_key(start + i, "node_")
+            self.node[v] = {"node": node}
+            self.edge[v] = {}
+            self.adjacency[v] = {}
+            pv = frame.point
+            if u is not None:
+                edge = Edge(vector=Vector(pv[0] - pu[0], pv[1] - pu[1], pv[2] - pu[2]))
+                self.edge[u][v] = {"edge": edge}
+                self.adjacency[u][v] = None
+                self.adjacency[v][u] = None
+            u, pu = v, pv
+        self.attributes["_last_node"] = u
+
+    def _reserve_keys(self, n):
+        counters = self.attributes.setdefault("_key_counters", {})
+        if "node_" not in counters:
+            counters["node_"] = max(list(self.get_ids(self.nodes()))) + 1
+        start = counters["node_"]
+        counters["node_"] = start + n
+        return start
+
+    def _extend_store(self, points, xaxes, yaxes, process):
+        store = self._store
+        n = len(points) // 3
+        start = self._reserve_keys(n)
+        last = self.get_last_key("node")
+        process = dict((name, _aslist(values)) for name, values in process.items())
+        store.extend(range(start, start + n), points, xaxes, yaxes, **process)
+        ids = ([store.id(last)] if last is not None else []) + list(range(start, start + n))
+        store.edge_u.extend(ids[:-1])
+        store.edge_v.extend(ids[1:])
+        store._out = store._in = None
+        if n:
+            self.attributes["_last_node"] = store.key(start + n - 1)
+
     def get_edge_length(self, u, v):
         if self.has_edge(u, v, True):
             return self.edge_attribute((u,v),"edge").length
@@ -40,34 +435,293 @@ class Path(ExtendedGraph):
     def add_node(self, node, key=None, parent_node="last"):
         if parent_node == "last":
             parent_node = self.get_last_key("node")
-        if self.nodes() and key is None:
+        if key is None:
             key = self.get_next_key(self.nodes(), "node_")
-        elif key in self.nodes():
-            print("Key already in database, value is overwritten")
-        super(Path, self).add_node(key, node=node)
+        else:
+            if self.has_node(key):
+                print("Key already in database, value is overwritten")
+            self.register_key(key, "node_")
+        if self.has_node(key):
+            self.invalidate()
+        if self._store is not None:
+            self._store.add(self._store.id(key), node.frame, node.attributes)
+        else:
+            super(Path, self).add_node(key, node=node)
         self.attributes["_last_node"] = key
         if parent_node is not None:
             self.add_edge(parent_node, key)
 
     def add_edge(self, u, v):
-        nu = self.node_attribute(u, "node")
-        nv = self.node_attribute(v, "node")
-        edge = Edge.from_node_to_node(nu, nv)
-        super(Path, self).add_edge(u,v, edge=edge)
+        valid = self._metrics_valid() and not self.has_edge(u, v)
+        if self._store is not None:
+            self._store.add_edge(self._store.id(u), self._store.id(v))
+        else:
+            nu = self.node_attribute(u, "node")
+            nv = self.node_attribute(v, "node")
+            edge = Edge.from_node_to_node(nu, nv)
+            super(Path, self).add_edge(u,v, edge=edge)
+            self.invalidate()
+        if valid:
+            totals = [a + b for a, b in zip(self._metrics[1], self._edge_metrics(u, v))]
+            self._metrics = (self.version, tuple(totals))
 
     def add_nodes(self, nodes, keys=None):
         if keys is None:
             keys = [None]*len(nodes)
         for node, key in zip(nodes, keys):
-            if key in self.nodes():
-                print("Key already in database, value is overwritten")
             self.add_node(node, key)
 
+    def delete_node(self, key):
+        self.invalidate()
+        if self._store is not None:
+            del self.node[key]
+        else:
+            super(Path, self).delete_node(key)
+
+    def simplify(self, tolerance, keep_process=True):
+        """Drop the nodes that are within a tolerance of the simplified path.
+
+        The nodes are simplified with :func:`simplify_indices` in node order
+        and relinked into a chain. Nodes whose process parameters differ from
+        the node before them are kept, as are nodes with a ``state``.
+
+        Parameters
+        ----------
+        tolerance : float
+            Largest distance of a dropped node to the simplified path (m).
+        keep_process : bool, optional
+            Keep the nodes where the process parameters change.
+
+        Returns
+        -------
+        int
+            The number of dropped nodes.
+        """
+        store = self._store
+        if store is not None:
+            n = len(store)
+            points = _column_points(store.frames) if n else []
+            values = list(zip(*[store.columns[name] for name in PARAMETERS])) if keep_process else None
+            states = store.states
+        else:
+            keys = list(self.node)
+            nodes = [self.node[key]["node"] for key in keys]
+            n = len(nodes)
+            points = [node.frame.point for node in nodes]
+            values = [tuple(node.attributes.get(name) for name in PARAMETERS) for node in nodes] if keep_process else None
+            states = [node.attributes.get("state") for node in nodes]
+
+        keep = [i for i in range(n) if states[i] is not None]
+        if values is not None:
+            # NaN != NaN, compare the NaN columns of a store as None
+            values = [tuple(None if v is None or v != v else v for v in row) for row in values]
+            keep.extend(i for i in range(1, n) if values[i] != values[i - 1])
+        rows = simplify_indices(points, tolerance, keep)
+        if len(rows) == n:
+            return 0
+
+        if store is not None:
+            version = store.version
+            store = store.take(rows)
+            store.edge_u.extend(store.ids[:-1])
+            store.edge_v.extend(store.ids[1:])
+            # keep Path.version increasing across the store swap
+            store.version = version + 1
+            self._set_store(store)
+        else:
+            kept = [keys[i] for i in rows]
+            self.node = dict((key, self.node[key]) for key in kept)
+            self.edge = dict((key, {}) for key in kept)
+            self.adjacency = dict((key, {}) for key in kept)
+            for u, v in zip(kept[:-1], kept[1:]):
+                self.edge[u][v] = {"edge": Edge.from_node_to_node(self.node[u]["node"], self.node[v]["node"])}
+                self.adjacency[u][v] = None
+                self.adjacency[v][u] = None
+            self.rebuild_type_index()
+        self.invalidate()
+        return n - len(rows)
+
     def transform(self, T):
-        for key, node in self.nodes(data=True):
-            node["node"].transform(T)
-    
+        _transform_paths([self], T)
+
+    def copy(self, cls=None):
+        """Make an independent copy of the path.
+
+        Nodes and edges are rebuilt directly instead of going through a
+        data round-trip.
+        """
+        if cls is not None and not issubclass(cls, Path):
+            return super(Path, self).copy(cls)
+        return self._clone(cls=cls)
+
     def transformed(self, T):
-        path = self.copy()
-        path.transform(T)
-        return path
\ No newline at end of file
+        return self._clone(T)
+
+    def _clone(self, T=None, cls=None):
+        path = (cls or type(self))()
+        path.attributes.update(self.attributes)
+        path.attributes["_key_counters"] = dict(self.attributes.get("_key_counters") or {})
+        path.default_node_attributes.update(self.default_node_attributes)
+        path.default_edge_attributes.update(self.default_edge_attributes)
+        path._max_node = self._max_node
+        if self._metrics_valid():
+            scale = _similarity_scale(T) if T is not None else 1.0
+            if scale is not None:
+                path._metrics = (None, tuple(value*scale for value in self._metrics[1]))
+        if self.frame is not None:
+            path.frame = _clone_frames([self.frame], T)[0]
+
+        if self._store is not None:
+            store = self._store.copy()
+            if T is not None:
+                store.transform(T)
+            path._set_store(store)
+            return path._with_metrics(path._metrics)
+
+        keys = list(self.node)
+        nodes = [self.node[key]["node"] for key in keys]
+        frames = _clone_frames([node.frame for node in nodes], T)
+        for key, node, frame in zip(keys, nodes, frames):
+            clone = Node(frame=frame if node.frame is not self.frame else path.frame)
+            clone.attributes = dict(node.attributes)
+            clone.key = node.key
+            attr = dict(self.node[key])
+            attr["node"] = clone
+            path.node[key] = attr
+
+        edges = [(u, v, attr) for u, nbrs in self.edge.items() for v, attr in nbrs.items()]
+        vectors = [list(attr["edge"].vector) for u, v, attr in edges if attr.get("edge") is not None]
+        if T is not None and vectors:
+            vectors = _aslist(_transform_vector_array(vectors, T))
+        vectors = iter(vectors)
+        for u in keys:
+            path.edge[u] = {}
+            path.adjacency[u] = dict(self.adjacency[u])
+        for u, v, attr in edges:
+            attr = dict(attr)
+            edge = attr.get("edge")
+            if edge is not None:
+                clone = Edge(vector=Vector(*next(vectors)))
+                clone.attributes = dict(edge.attributes)
+                clone.key = edge.key
+                attr["edge"] = clone
+            path.edge[u][v] = attr
+        return path._with_metrics(path._metrics)
+
+    def _with_metrics(self, metrics):
+        # takes over totals computed for another path with the same edges
+        if metrics is not None:
+            self._metrics = (self.version, metrics[1])
+        return self
+
+
+def _transform_paths(paths, T, tag=None):
+    # all node frames and edge vectors of the paths in one matrix product,
+    # edge vectors are transformed along so they stay consistent
+    frames, vectors, edges = [], [], []
+    versions = [path.version for path in paths]
+    scale = _similarity_scale(T)
+    valid = [path._metrics_valid() for path in paths]
+    for path in paths:
+        if path.store is not None:
+            path.store.transform(T)
+            if path.frame is not None:
+                frames.append(path.frame)
+            continue
+        shared = False
+        for attr in path.node.values():
+            frame = attr["node"].frame
+            frames.append(frame)
+            shared = shared or frame is path.frame
+        if path.frame is not None and not shared:
+            frames.append(path.frame)
+        for nbrs in path.edge.values():
+            for attr in nbrs.values():
+                edge = attr.get("edge")
+                if edge is not None and edge.vector is not None:
+                    edges.append(edge)
+                    vectors.append(list(edge.vector))
+    if frames:
+        points = _aslist(_transform_point_array([list(f.point) for f in frames], T))
+        xaxes = _aslist(_transform_vector_array([list(f.xaxis) for f in frames], T))
+        yaxes = _aslist(_transform_vector_array([list(f.yaxis) for f in frames], T))
+        for frame, point, xaxis, yaxis in zip(frames, points, xaxes, yaxes):
+            frame.point = point
+            frame.xaxis = xaxis
+            frame.yaxis = yaxis
+    if edges:
+        vectors = _aslist(_transform_vector_array(vectors, T))
+        for edge, vector in zip(edges, vectors):
+            edge.vector = Vector(*vector)
+    for path, valid in zip(paths, valid):
+        path.invalidate()
+        if valid and scale is not None:
+            # lengths of a similarity transformed path only scale
+            path._metrics = (path.version, tuple(value*scale for value in path._metrics[1]))
+    matrix = [list(row) for row in T.matrix]
+    for path, version in zip(paths, versions):
+        path._transforms.append((version, path.version, matrix, tag))
+        del path._transforms[:-TRANSFORM_LOG]
+
+
+def _changes_since(path, version):
+    """Tags of the transforms and keys and attribute names of the nodes changed since a version.
+
+    None if the path changed in another way, or its logs do not reach back
+    to that version. Names are None if any attribute or the frame may have
+    changed, a changed frame is named ``"frame"``.
+    """
+    steps = [(before, after, tag, None, None) for before, after, matrix, tag in path._transforms]
+    steps += [(before, after, None, keys, names) for before, after, keys, names in path._changes]
+    steps.sort(key=lambda step: step[0])
+    tags, keys, names = [], set(), set()
+    current = version
+    for before, after, tag, changed, changed_names in steps:
+        if after <= current:
+            continue
+        if before > current or (before < current and changed is None):
+            # a gap, or a transform that started before the version
+            return None
+        if changed is None:
+            tags.append(tag)
+        else:
+            # node changes may be merged over the version, they are sent again
+            keys.update(changed)
+            names = names.union(changed_names) if names is not None and changed_names is not None else None
+        current = after
+    if current != path.version:
+        return None
+    return tags, keys, names
+
+
+def _clone_frames(frames, T=None):
+    points = [list(f.point) for f in frames]
+    xaxes = [list(f.xaxis) for f in frames]
+    yaxes = [list(f.yaxis) for f in frames]
+    if T is not None:
+        points = _aslist(_transform_point_array(points, T))
+        xaxes = _aslist(_transform_vector_array(xaxes, T))
+        yaxes = _aslist(_transform_vector_array(yaxes, T))
+    return [Frame(p, x, y) for p, x, y in zip(points, xaxes, yaxes)]
+
+
+def _aslist(values):
+    # numpy arrays iterate much faster once converted to nested lists
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return values
+
+
+def _column_points(frames):
+    # N x 3 points of a flat frame buffer
+    if np is not None:
+        return np.asarray(frames).reshape(-1, 9)[:, :3]
+    return [frames[i:i + 3] for i in range(0, len(frames), 9)]
+
+
+def _flatten(values):
+    if values is None:
+        return None
+    if hasattr(values, "ravel"):
+        return values.ravel().tolist()
+    return [x for value in values for x in value]
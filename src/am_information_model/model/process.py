@@ -0,0 +1,233 @@
+from array import array
+
+from .utilities import np
+
+__all__ = [
+    'NOZZLE_SIZE',
+    'WIDTH_BOUNDS',
+    'HEIGHT_BOUNDS',
+    'flow_constant',
+    'solve_profile',
+    'solve_profile_arrays',
+    'solve_process',
+    'solve_process_arrays',
+    'solve_path_process'
+]
+
+
+NOZZLE_SIZE = 0.007
+WIDTH_BOUNDS = (0.007, 0.014)
+HEIGHT_BOUNDS = (0.002, 0.006)
+
+PARAMETERS = ("path_width", "path_height", "extrusion_rate", "robot_velocity")
+
+# relative slack on the bounds for round-off in area/h
+_EPS = 1e-12
+
+
+def flow_constant(nozzle_size=NOZZLE_SIZE):
+    """Constant K of ``robot_velocity * extrusion_rate = path_width * path_height * K``.
+
+    The extruded volume per nozzle length, ``w * h * nozzle_size`` in m3, is
+    turned into the robot velocity in mm/s for an extrusion rate.
+    """
+    return nozzle_size*1e6/60.0
+
+
+def solve_profile(area, width_bounds=WIDTH_BOUNDS, height_bounds=HEIGHT_BOUNDS):
+    """Path width and height of a cross section area within the bounds.
+
+    Of all feasible profiles the flattest one is returned, the smallest
+    height ``max(hmin, area / wmax)`` with the width ``area / height``.
+
+    Parameters
+    ----------
+    area : float
+        Cross section area ``w * h`` in m2.
+    width_bounds, height_bounds : tuple[float, float], optional
+
+    Returns
+    -------
+    tuple[float, float] or None
+        Width and height, None if no profile within the bounds has the area.
+    """
+    (wmin, wmax), (hmin, hmax) = width_bounds, height_bounds
+    if not wmin*hmin*(1 - _EPS) <= area <= wmax*hmax*(1 + _EPS) or area <= 0:
+        return None
+    height = min(max(hmin, area/wmax), hmax)
+    return min(max(wmin, area/height), wmax), height
+
+
+def solve_profile_arrays(area, width_bounds=WIDTH_BOUNDS, height_bounds=HEIGHT_BOUNDS):
+    """Vectorized :func:`solve_profile`, NaN for infeasible areas.
+
+    Returns
+    -------
+    tuple
+        Arrays of widths and heights.
+    """
+    if np is None:
+        nan = float("nan")
+        profiles = [solve_profile(value, width_bounds, height_bounds) for value in area]
+        return [nan if p is None else p[0] for p in profiles], [nan if p is None else p[1] for p in profiles]
+    (wmin, wmax), (hmin, hmax) = width_bounds, height_bounds
+    area = np.asarray(area, dtype=float)
+    with np.errstate(invalid="ignore"):
+        feasible = (area >= wmin*hmin*(1 - _EPS)) & (area <= wmax*hmax*(1 + _EPS)) & (area > 0)
+        height = np.clip(np.maximum(hmin, area/wmax), hmin, hmax)
+        width = np.clip(area/height, wmin, wmax)
+    width[~feasible] = np.nan
+    height[~feasible] = np.nan
+    return width, height
+
+
+def solve_process(width, height, rate, velocity, nozzle_size=NOZZLE_SIZE,
+                  width_bounds=WIDTH_BOUNDS, height_bounds=HEIGHT_BOUNDS):
+    """Solve the missing process parameter of a single node.
+
+    Parameters
+    ----------
+    width, height, rate, velocity : float or None
+        Path width and height (m), extrusion rate and robot velocity (mm/s),
+        None where unknown.
+    nozzle_size : float, optional
+    width_bounds, height_bounds : tuple[float, float], optional
+        Limits of the path profile.
+
+    Returns
+    -------
+    tuple
+        The four parameters, None where they could not be solved.
+    """
+    K = flow_constant(nozzle_size)
+    if velocity is None and None not in (width, height, rate) and rate:
+        velocity = width*height*K/rate
+    elif rate is None and None not in (width, height, velocity) and velocity:
+        rate = width*height*K/velocity
+    elif None not in (velocity, rate):
+        area = velocity*rate/K
+        if width is None and height is not None and height:
+            width = area/height
+        elif height is None and width is not None and width:
+            height = area/width
+        elif width is None and height is None:
+            width, height = solve_profile(area, width_bounds, height_bounds) or (None, None)
+    return width, height, rate, velocity
+
+
+def solve_process_arrays(width, height, rate, velocity, nozzle_size=NOZZLE_SIZE,
+                         width_bounds=WIDTH_BOUNDS, height_bounds=HEIGHT_BOUNDS):
+    """Solve the missing process parameter of many nodes at once.
+
+    Same as :func:`solve_process` over arrays with NaN for unknown values,
+    with NumPy or, when it is not available, node by node over lists.
+
+    Returns
+    -------
+    tuple
+        Arrays of width, height, rate and velocity, and a boolean array
+        that is True for nodes with a path profile outside of the bounds.
+    """
+    if np is None:
+        nan = float("nan")
+        columns = [[], [], [], []]
+        limits = []
+        for values in zip(width, height, rate, velocity):
+            values = [None if value != value else value for value in values]
+            values = solve_process(*values, nozzle_size=nozzle_size, width_bounds=width_bounds, height_bounds=height_bounds)
+            for column, value in zip(columns, values):
+                column.append(nan if value is None else value)
+            limits.append(_out_of_limits(values[0], values[1], width_bounds, height_bounds))
+        return columns[0], columns[1], columns[2], columns[3], limits
+
+    K = flow_constant(nozzle_size)
+    w, h, e, v = [np.array(values, dtype=float) for values in (width, height, rate, velocity)]
+    known = [~np.isnan(values) for values in (w, h, e, v)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mask = ~known[3] & known[0] & known[1] & known[2] & (e != 0)
+        v[mask] = w[mask]*h[mask]*K/e[mask]
+        mask = ~known[2] & known[0] & known[1] & known[3] & (v != 0)
+        e[mask] = w[mask]*h[mask]*K/v[mask]
+
+        profile = known[2] & known[3]
+        area = v*e/K
+        mask = profile & ~known[0] & known[1] & (h != 0)
+        w[mask] = area[mask]/h[mask]
+        mask = profile & known[0] & ~known[1] & (w != 0)
+        h[mask] = area[mask]/w[mask]
+
+        mask = profile & ~known[0] & ~known[1]
+        w[mask], h[mask] = solve_profile_arrays(area[mask], width_bounds, height_bounds)
+
+    with np.errstate(invalid="ignore"):
+        limits = ~np.isnan(w) & ~np.isnan(h) & ((w < width_bounds[0]) | (w > width_bounds[1]) | (h < height_bounds[0]) | (h > height_bounds[1]))
+    return w, h, e, v, limits
+
+
+def solve_path_process(path, **kwargs):
+    """Solve the missing process parameters of all nodes of a path and write them back.
+
+    Parameters
+    ----------
+    path : :class:`Path`
+    **kwargs
+        ``nozzle_size``, ``width_bounds`` and ``height_bounds``, see
+        :func:`solve_process`.
+
+    Returns
+    -------
+    dict
+        ``"solved"``: keys of the nodes that got a parameter,
+        ``"unsolved"``: keys of the nodes that still miss one,
+        ``"infeasible"``: keys of the nodes whose velocity and extrusion
+        rate give a cross section no path profile within the bounds has,
+        ``"out_of_limits"``: keys of the nodes with a path profile outside
+        of the bounds.
+    """
+    store = path.store
+    if store is not None:
+        keys = list(store.keys())
+        columns = [store.columns[name] for name in PARAMETERS]
+        before = [[value != value for value in column] for column in columns]
+        solved = solve_process_arrays(*columns, **kwargs)
+        for column, values in zip(columns, solved[:4]):
+            if isinstance(column, array):
+                column[:] = array('d', _tolist(values))
+            else:
+                column[:] = values
+        store.version += 1
+    else:
+        keys = list(path.node)
+        nodes = [path.node[key]["node"] for key in keys]
+        nan = float("nan")
+        columns = [[nan if node.attributes.get(name) is None else node.attributes[name] for node in nodes] for name in PARAMETERS]
+        before = [[value != value for value in column] for column in columns]
+        solved = solve_process_arrays(*columns, **kwargs)
+        for name, values in zip(PARAMETERS, solved[:4]):
+            for node, value in zip(nodes, _tolist(values)):
+                node.attributes[name] = None if value != value else value
+        path.invalidate()
+
+    after = [_tolist(values) for values in solved[:4]]
+    report = {"solved": [], "unsolved": [], "infeasible": [], "out_of_limits": []}
+    for i, key in enumerate(keys):
+        missing = [value != value for value in (column[i] for column in after)]
+        if missing == [True, True, False, False]:
+            report["infeasible"].append(key)
+        elif any(missing):
+            report["unsolved"].append(key)
+        elif any(column[i] for column in before):
+            report["solved"].append(key)
+    report["out_of_limits"] = [key for key, flag in zip(keys, _tolist(solved[4])) if flag]
+    return report
+
+
+def _out_of_limits(width, height, width_bounds, height_bounds):
+    if width is None or height is None:
+        return False
+    return not (width_bounds[0] <= width <= width_bounds[1] and height_bounds[0] <= height <= height_bounds[1])
+
+
+def _tolist(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
@@ -0,0 +1,216 @@
+from array import array
+
+from .targets import _peek
+from .targets import _steps
+from .targets import _stored
+
+__all__ = [
+    'ProgressTracker'
+]
+
+
+class ProgressTracker(object):
+    """Fabrication progress of a model or an element.
+
+    The nodes are laid out once in build order. Marking a node done updates
+    the counts and printed lengths of its path, its element and the total,
+    and writes its ``state``, so progress and the next node to print are
+    answered without scanning the model. The printed length of a node is
+    the length of the move that ends at it. The paths are only read to lay
+    out their nodes and looked up again to write a state, so the tracker
+    keeps no copies of the paths of instances or lazily loaded elements.
+
+    Parameters
+    ----------
+    graph : :class:`InformationModel`, :class:`Element` or :class:`Path`
+    order : list, optional
+        Build order as ``(element_key, path_key)`` pairs or as the steps of
+        :func:`schedule`. By default elements and paths in insertion order.
+    state : str, optional
+        Node ``state`` written for nodes marked done. Nodes that already
+        have a state count as done.
+    """
+
+    def __init__(self, graph, order=None, state="printed"):
+        self.graph = graph
+        self.state = state
+        self.keys = []
+        self.lengths = array('d')
+        self.done = bytearray()
+        self._position = {}
+        self._paths = []
+        self._path_index = {}
+        self._elements = {}
+        self._cursor = 0
+        self.nodes_done = 0
+        self.length_done = 0.0
+        self.length = 0.0
+
+        if hasattr(graph, "print_order"):
+            # a single path, its keys are (None, None, node)
+            self._add_path(None, None, graph)
+        else:
+            for element_key, element, path_key in _steps(graph, order):
+                self._add_path(element_key, path_key, _peek(element, path_key, "path"))
+        self._advance()
+
+    def _add_path(self, element_key, path_key, path):
+        start = len(self.keys)
+        previous = None
+        states = []
+        for key, point, state in _print_nodes(path):
+            states.append(state)
+            length = _distance(previous, point) if previous is not None else 0.0
+            previous = point
+            self._position[(element_key, path_key, key)] = len(self.keys)
+            self.keys.append((element_key, path_key, key))
+            self.lengths.append(length)
+            self.done.append(0)
+            self.length += length
+        counts = {"element": element_key, "path": path_key, "start": start, "end": len(self.keys),
+                  "done": 0, "length_done": 0.0, "length": sum(self.lengths[start:])}
+        self._path_index[(element_key, path_key)] = len(self._paths)
+        self._paths.append(counts)
+        totals = self._elements.setdefault(element_key, {
+            "paths": [], "done": 0, "total": 0, "length_done": 0.0, "length": 0.0})
+        totals["paths"].append(len(self._paths) - 1)
+        totals["total"] += len(states)
+        totals["length"] += counts["length"]
+        for i, state in enumerate(states):
+            if state is not None:
+                self._set(start + i, True, write=False)
+
+    # --------------------------------------------------------------------------
+    # marking
+    # --------------------------------------------------------------------------
+
+    def mark(self, element, path, node, done=True):
+        """Mark a single node done, or not done."""
+        self._set(self._position[(element, path, node)], done)
+        self._advance()
+
+    def mark_path(self, element, path, done=True):
+        """Mark all nodes of a path."""
+        counts = self._paths[self._path_index[(element, path)]]
+        for i in range(counts["start"], counts["end"]):
+            self._set(i, done)
+        self._advance()
+
+    def mark_element(self, element, done=True):
+        """Mark all nodes of an element."""
+        for index in self._elements[element]["paths"]:
+            counts = self._paths[index]
+            for i in range(counts["start"], counts["end"]):
+                self._set(i, done)
+        self._advance()
+
+    def mark_through(self, element, path, node):
+        """Mark every node up to and including this one in build order done.
+
+        Meant for robot feedback that reports the last reached target, the
+        cost is the number of newly marked nodes.
+        """
+        end = self._position[(element, path, node)]
+        for i in range(self._cursor, end + 1):
+            self._set(i, True)
+        self._advance()
+
+    def _set(self, i, done, write=True):
+        if bool(self.done[i]) == bool(done):
+            return
+        self.done[i] = 1 if done else 0
+        sign = 1 if done else -1
+        length = sign*self.lengths[i]
+        element_key, path_key, key = self.keys[i]
+        counts = self._paths[self._path_index[(element_key, path_key)]]
+        totals = self._elements[element_key]
+        counts["done"] += sign
+        counts["length_done"] += length
+        totals["done"] += sign
+        totals["length_done"] += length
+        self.nodes_done += sign
+        self.length_done += length
+        if done and i == self._cursor:
+            self._cursor += 1
+        elif not done and i < self._cursor:
+            self._cursor = i
+        if write:
+            element, path = _stored(self.graph, element_key, path_key)
+            state = self.state if done else None
+            store = path.store
+            if store is not None:
+                store.states[store.row(store.id(key))] = state
+            else:
+                path.node[key]["node"].attributes["state"] = state
+            # a new version for snapshots and patches, states do not change the metrics
+            metrics = path._metrics if path._metrics_valid() else None
+            path.invalidate([key], ["state"])
+            path._with_metrics(metrics)
+            if element is not None:
+                element.state = totals["done"] == totals["total"]
+
+    def _advance(self):
+        n = len(self.done)
+        while self._cursor < n and self.done[self._cursor]:
+            self._cursor += 1
+
+    # --------------------------------------------------------------------------
+    # queries
+    # --------------------------------------------------------------------------
+
+    def next_node(self):
+        """``(element, path, node)`` keys of the first node in build order that is not done."""
+        if self._cursor < len(self.keys):
+            return self.keys[self._cursor]
+        return None
+
+    @property
+    def percent(self):
+        """Printed length as a percentage of the total length."""
+        if self.length:
+            return 100.0*self.length_done/self.length
+        return 100.0*self.nodes_done/len(self.keys) if self.keys else 100.0
+
+    @property
+    def progress(self):
+        return {
+            "done": self.nodes_done,
+            "total": len(self.keys),
+            "length_done": self.length_done,
+            "length": self.length,
+            "percent": self.percent
+        }
+
+    def path_progress(self, element, path):
+        counts = self._paths[self._path_index[(element, path)]]
+        return {
+            "done": counts["done"],
+            "total": counts["end"] - counts["start"],
+            "length_done": counts["length_done"],
+            "length": counts["length"]
+        }
+
+    def element_progress(self, element):
+        totals = self._elements[element]
+        return dict((name, totals[name]) for name in ("done", "total", "length_done", "length"))
+
+
+def _print_nodes(path):
+    # key, point and state of the nodes in print order
+    store = path.store
+    if store is None:
+        for key in path.print_order():
+            node = path.node[key]["node"]
+            yield key, node.frame.point, node.attributes.get("state")
+        return
+    rows = range(len(store))
+    if path.attributes.get("reversed"):
+        rows = reversed(rows)
+    frames = store.frames
+    for row in rows:
+        i = 9*row
+        yield store.key(store.ids[row]), (frames[i], frames[i + 1], frames[i + 2]), store.states[row]
+
+
+def _distance(a, b):
+    return ((b[0] - a[0])**2 + (b[1] - a[1])**2 + (b[2] - a[2])**2)**0.5
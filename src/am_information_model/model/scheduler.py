@@ -0,0 +1,190 @@
+from heapq import heappush
+from heapq import heappop
+
+from .spatialindex import SpatialIndex
+
+__all__ = [
+    'schedule'
+]
+
+
+def schedule(graph, robots=None, travel_velocity=100.0, home=(0.0, 0.0, 0.0), cell_size=None):
+    """Plan the build order of the paths of a model or an element.
+
+    Paths are scheduled one at a time in dependency order: the ``parent``
+    edges between the paths of an element, and between elements, where all
+    paths of a parent element come before the paths of its children. A
+    path is built by the robot it was added with (``parent_robot`` of
+    :meth:`Element.add_path`), otherwise by the robot of its element, or
+    by any robot. Robots work in parallel: the robot that is free first
+    takes the ready path whose start is closest to where it stopped.
+
+    Parameters
+    ----------
+    graph : :class:`InformationModel` or :class:`Element`
+    robots : list, optional
+        Robot keys, by default the robots of the model, or a single robot
+        ``None`` if it has none.
+    travel_velocity : float, optional
+        Velocity of the moves between paths, in mm/s.
+    home : [float, float, float], optional
+        Start position of the robots.
+    cell_size : float, optional
+        Grid cell size of the spatial lookup of the ready paths, by default
+        sized for a few path starts per cell.
+
+    Returns
+    -------
+    dict
+        ``"sequence"``: the steps in start order, ``"queues"``: the steps of
+        each robot, ``"travel"``: total travel length (m) and ``"makespan"``:
+        end time of the last step (s). A step is a dict with the ``element``,
+        ``path`` and ``robot`` keys, ``start`` and ``end`` times and the
+        ``travel`` length before it.
+
+    Raises
+    ------
+    ValueError
+        If the dependencies have a cycle.
+    """
+    tasks, successors, predecessors = _tasks(graph)
+    if robots is None:
+        robots = list(graph.robots()) if hasattr(graph, "robots") else []
+    robots = list(robots) or [None]
+    for task in tasks.values():
+        if task["robot"] not in robots and task["robot"] != "any":
+            robots.append(task["robot"])
+
+    if cell_size is None:
+        cell_size = _cell_size([task["start"] for task in tasks.values()])
+    pools = dict((robot, SpatialIndex(cell_size)) for robot in robots + ["any"])
+    for id, count in predecessors.items():
+        if not count:
+            _release(pools, tasks, id)
+
+    queues = dict((robot, []) for robot in robots)
+    sequence = []
+    position = dict((robot, tuple(home)) for robot in robots)
+    free = [(0.0, i) for i in range(len(robots))]
+    running = []
+    idle = []
+    done = 0
+    travel = 0.0
+    while free:
+        time, i = heappop(free)
+        robot = robots[i]
+        while running and running[0][0] <= time:
+            for id in successors.get(heappop(running)[1], ()):
+                predecessors[id] -= 1
+                if not predecessors[id]:
+                    _release(pools, tasks, id)
+        id, distance = _closest(pools, robot, position[robot])
+        if id is None:
+            if running:
+                heappush(free, (max(time, running[0][0]), i))
+            else:
+                # wait until another robot starts a path
+                idle.append(i)
+            continue
+        pools[tasks[id]["robot"]].remove(id)
+        task = tasks[id]
+        start = time + distance*1000.0/travel_velocity
+        step = {
+            "element": id[0],
+            "path": id[1],
+            "robot": robot,
+            "start": start,
+            "end": start + task["duration"],
+            "travel": distance
+        }
+        sequence.append(step)
+        queues[robot].append(step)
+        travel += distance
+        done += 1
+        position[robot] = task["end"]
+        heappush(running, (step["end"], id))
+        heappush(free, (step["end"], i))
+        while idle:
+            heappush(free, (time, idle.pop()))
+
+    if done < len(tasks):
+        raise ValueError("The build dependencies have a cycle, {} paths could not be scheduled.".format(len(tasks) - done))
+    sequence.sort(key=lambda step: step["start"])
+    makespan = max([step["end"] for step in sequence] or [0.0])
+    return {"sequence": sequence, "queues": queues, "travel": travel, "makespan": makespan}
+
+
+def _tasks(graph):
+    # paths keyed by (element key, path key) and their dependencies
+    if hasattr(graph, "elements"):
+        elements = list(graph.elements(data=True))
+        robots = dict((key, graph.node[key].get("robot", "any")) for key, element in elements)
+    else:
+        elements = [(None, graph)]
+        robots = {None: "any"}
+
+    tasks = {}
+    successors = {}
+    predecessors = {}
+    roots = {}
+    sinks = {}
+    for key, element in elements:
+        ids = []
+        for path_key, path in element.paths(data=True):
+            id = (key, path_key)
+            ids.append(id)
+            ends = path.endpoints() or ([0.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+            robot = element.node[path_key].get("robot", "any")
+            tasks[id] = {
+                "start": ends[0],
+                "end": ends[1],
+                "duration": path.duration,
+                "robot": robots[key] if robot == "any" else robot
+            }
+            predecessors[id] = 0
+        edges = [(u, v) for u, v in element.edges() if (key, u) in tasks and (key, v) in tasks]
+        for u, v in edges:
+            _depend(successors, predecessors, (key, u), (key, v))
+        has_parent = set(v for u, v in edges)
+        has_child = set(u for u, v in edges)
+        roots[key] = [id for id in ids if id[1] not in has_parent]
+        sinks[key] = [id for id in ids if id[1] not in has_child]
+
+    if hasattr(graph, "elements"):
+        for u, v in graph.edges():
+            if u in roots and v in roots:
+                for a in sinks[u]:
+                    for b in roots[v]:
+                        _depend(successors, predecessors, a, b)
+    return tasks, successors, predecessors
+
+
+def _cell_size(points, per_cell=2.0):
+    if not points:
+        return 1.0
+    extents = [max(p[i] for p in points) - min(p[i] for p in points) for i in range(3)]
+    extents = [extent for extent in extents if extent > 1e-9]
+    if not extents:
+        return 1.0
+    volume = 1.0
+    for extent in extents:
+        volume *= extent
+    return (volume*per_cell/len(points))**(1.0/len(extents))
+
+
+def _depend(successors, predecessors, a, b):
+    successors.setdefault(a, []).append(b)
+    predecessors[b] += 1
+
+
+def _release(pools, tasks, id):
+    pools[tasks[id]["robot"]].insert(id, tasks[id]["start"])
+
+
+def _closest(pools, robot, point):
+    best = None, None
+    for pool in (pools[robot], pools["any"]):
+        found = pool.nearest(point)
+        if found and (best[0] is None or found[0][1] < best[1]):
+            best = found[0]
+    return best
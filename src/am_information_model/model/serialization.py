@@ -0,0 +1,155 @@
+import json
+
+from compas.data import DataDecoder
+from compas.data import DataEncoder
+from compas.data.encoders import cls_from_dtype
+
+from .graph import _is_nested
+from .path import Path
+
+__all__ = [
+    'stream_dump',
+    'stream_load',
+    'stream_records'
+]
+
+
+def stream_records(graph):
+    """Yield the serialization records of a graph one at a time.
+
+    A graph is written as a ``{"graph": dtype, "data": header}`` record,
+    one ``{"node": key, "attr": attr}`` record per node and one
+    ``{"edge": [u, v], "attr": attr}`` record per edge, closed by an
+    ``{"end": true}`` record. Node attributes that are graphs themselves
+    (the paths of an element, the elements of a model) are left empty in
+    the node record and listed in its ``children``, their records follow
+    it in the same way.
+
+    Parameters
+    ----------
+    graph : :class:`ExtendedGraph`
+        Model, element or path.
+
+    Yields
+    ------
+    dict
+    """
+    yield {"graph": graph.dtype, "data": _header(graph)}
+    for key, attr in _node_items(graph):
+        children = [name for name, value in attr.items() if _is_nested(value)]
+        yield {
+            "node": repr(key),
+            "attr": dict((name, None if name in children else value) for name, value in attr.items()),
+            "children": children
+        }
+        for name in children:
+            for record in stream_records(attr[name]):
+                yield record
+    for u, v, attr in _edge_items(graph):
+        yield {"edge": [repr(u), repr(v)], "attr": attr}
+    yield {"end": True}
+
+
+def stream_dump(graph, fp):
+    """Write a graph to a file-like object as JSON lines, record by record.
+
+    Only one node of one path is encoded at a time, so the full nested
+    data dict of the model is never built in memory.
+
+    Parameters
+    ----------
+    graph : :class:`ExtendedGraph`
+        Model, element or path.
+    fp : file-like object
+        Text stream to write to.
+    """
+    for record in stream_records(graph):
+        fp.write(json.dumps(record, cls=DataEncoder))
+        fp.write("\n")
+
+
+def stream_load(fp):
+    """Read a graph written by :func:`stream_dump`.
+
+    Records are decoded one line at a time. Each graph is created through
+    its regular ``data`` setter as soon as its closing record is read.
+
+    Parameters
+    ----------
+    fp : file-like object
+        Text stream to read from.
+
+    Returns
+    -------
+    :class:`ExtendedGraph`
+    """
+    stack = []
+    for line in fp:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line, cls=DataDecoder)
+        if "graph" in record:
+            stack.append(_GraphReader(record["graph"], record["data"]))
+        elif "node" in record:
+            stack[-1].add_node(record["node"], record["attr"], record.get("children"))
+        elif "edge" in record:
+            stack[-1].add_edge(record["edge"][0], record["edge"][1], record["attr"])
+        elif "end" in record:
+            graph = stack.pop().build()
+            if not stack:
+                return graph
+            stack[-1].add_child(graph)
+    raise ValueError("Stream ended before the graph was complete.")
+
+
+def _header(graph):
+    if isinstance(graph, Path):
+        # avoid Path.data, which would copy out every node of a columnar path
+        return {
+            "attributes": graph.attributes,
+            "dna": graph.default_node_attributes,
+            "dea": graph.default_edge_attributes,
+            "max_node": graph._max_node
+        }
+    return dict((name, value) for name, value in graph.data.items() if name not in ("node", "edge", "adjacency"))
+
+
+def _node_items(graph):
+    if isinstance(graph, Path) and graph.store is not None:
+        return graph.store.node_items()
+    return ((key, dict(graph.node[key])) for key in graph.node)
+
+
+def _edge_items(graph):
+    if isinstance(graph, Path) and graph.store is not None:
+        return graph.store.edge_items()
+    return ((u, v, dict(attr)) for u, nbrs in graph.edge.items() for v, attr in nbrs.items())
+
+
+class _GraphReader(object):
+
+    def __init__(self, dtype, header):
+        self.cls = cls_from_dtype(dtype)
+        self.data = dict(header)
+        self.data.update({"node": {}, "edge": {}, "adjacency": {}})
+        self.pending = []
+
+    def add_node(self, key, attr, children=None):
+        self.data["node"][key] = attr
+        self.data["edge"][key] = {}
+        self.data["adjacency"][key] = {}
+        for name in children or []:
+            self.pending.append((key, name))
+
+    def add_child(self, graph):
+        key, name = self.pending.pop(0)
+        self.data["node"][key][name] = graph
+
+    def add_edge(self, u, v, attr):
+        self.data["edge"][u][v] = attr
+        self.data["adjacency"][u][v] = None
+        self.data["adjacency"][v][u] = None
+
+    def build(self):
+        return self.cls.from_data(self.data)
@@ -0,0 +1,109 @@
+from .utilities import np
+
+__all__ = [
+    'simplify_indices'
+]
+
+
+def simplify_indices(points, tolerance, keep=None):
+    """Indices of the points that a Ramer-Douglas-Peucker simplification keeps.
+
+    The polyline is split at the first and last point and at the indices in
+    ``keep``, each run is simplified on its own. A point is dropped if it is
+    within ``tolerance`` of the segment between the points kept around it.
+    A run is split at its farthest point if that lies in the middle half of
+    the run, otherwise at the farthest point of the middle half if that is
+    beyond the tolerance, and else at the point beyond the tolerance closest
+    to the middle. The result meets the same tolerance. That keeps the
+    splits balanced on typical paths, with a run time near O(n log n), the
+    worst case is O(n^2) as for plain Ramer-Douglas-Peucker, when the points
+    beyond the tolerance of every run lie only close to its ends.
+
+    Parameters
+    ----------
+    points : list[[float, float, float]] or ndarray
+        Polyline points.
+    tolerance : float
+        Largest distance of a dropped point to the simplified polyline.
+    keep : iterable[int], optional
+        Indices that are always kept.
+
+    Returns
+    -------
+    list[int]
+        Sorted indices of the kept points.
+    """
+    n = len(points)
+    if n < 3:
+        return list(range(n))
+    if np is not None:
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        split = _split_numpy
+    else:
+        points = [tuple(point) for point in points]
+        split = _split
+    breaks = sorted(set([0, n - 1]) | set(i for i in (keep or ()) if 0 <= i < n))
+    kept = [False]*n
+    for i in breaks:
+        kept[i] = True
+    stack = [(a, b) for a, b in zip(breaks[:-1], breaks[1:]) if b - a > 1]
+    while stack:
+        a, b = stack.pop()
+        i = split(points, a, b, tolerance)
+        if i is not None:
+            kept[i] = True
+            if i - a > 1:
+                stack.append((a, i))
+            if b - i > 1:
+                stack.append((i, b))
+    return [i for i in range(n) if kept[i]]
+
+
+def _split_numpy(points, a, b, tolerance):
+    # point between a and b beyond the tolerance of segment a-b closest to the middle
+    p = points[a + 1:b]
+    u = points[b] - points[a]
+    w = p - points[a]
+    uu = float(u.dot(u))
+    if uu > 0:
+        t = np.clip(w.dot(u)/uu, 0.0, 1.0)
+        w = w - t[:, None]*u
+    d = np.einsum("ij,ij->i", w, w)
+    i = int(d.argmax())
+    if d[i] <= tolerance*tolerance:
+        return None
+    n = b - a - 1
+    if not n//4 <= i < n - n//4:
+        j = n//4 + int(d[n//4:n - n//4].argmax())
+        if d[j] > tolerance*tolerance:
+            i = j
+        else:
+            beyond = np.flatnonzero(d > tolerance*tolerance)
+            i = int(beyond[np.abs(beyond - (n - 1)/2.0).argmin()])
+    return a + 1 + i
+
+
+def _split(points, a, b, tolerance):
+    pa, pb = points[a], points[b]
+    u = [pb[0] - pa[0], pb[1] - pa[1], pb[2] - pa[2]]
+    uu = u[0]*u[0] + u[1]*u[1] + u[2]*u[2]
+    d = []
+    for i in range(a + 1, b):
+        p = points[i]
+        w = [p[0] - pa[0], p[1] - pa[1], p[2] - pa[2]]
+        if uu > 0:
+            t = min(1.0, max(0.0, (w[0]*u[0] + w[1]*u[1] + w[2]*u[2])/uu))
+            w = [w[0] - t*u[0], w[1] - t*u[1], w[2] - t*u[2]]
+        d.append(w[0]*w[0] + w[1]*w[1] + w[2]*w[2])
+    n = len(d)
+    i = max(range(n), key=d.__getitem__)
+    if d[i] <= tolerance*tolerance:
+        return None
+    if not n//4 <= i < n - n//4:
+        j = max(range(n//4, n - n//4), key=d.__getitem__)
+        if d[j] > tolerance*tolerance:
+            i = j
+        else:
+            beyond = [k for k in range(n) if d[k] > tolerance*tolerance]
+            i = min(beyond, key=lambda k: abs(k - (n - 1)/2.0))
+    return a + 1 + i
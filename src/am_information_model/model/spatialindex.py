@@ -0,0 +1,253 @@
+from bisect import bisect
+from math import floor
+
+__all__ = [
+    'SpatialIndex'
+]
+
+
+class SpatialIndex(object):
+    """Uniform grid over the elements and path nodes of a model.
+
+    Elements are indexed by the bounding box of their mesh, or by their
+    frame point if they have no mesh, path nodes by their frame point.
+    Items are ``(element_key, None, None)`` for elements and
+    ``(element_key, path_key, node_key)`` for nodes.
+
+    Parameters
+    ----------
+    cell_size : float, optional
+        Edge length of the grid cells, in model units (m). About the
+        distance of typical queries, e.g. a few layer heights.
+    """
+
+    def __init__(self, cell_size=0.05):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._items = {}
+        self._element_items = {}
+        self._lo = None
+        self._hi = None
+
+    def __len__(self):
+        return len(self._items)
+
+    # --------------------------------------------------------------------------
+    # items
+    # --------------------------------------------------------------------------
+
+    def insert(self, item, point, point_max=None):
+        """Insert an item at a point, or with a box from ``point`` to ``point_max``."""
+        if item in self._items:
+            self.remove(item)
+        bmin = tuple(point)
+        bmax = tuple(point_max) if point_max is not None else bmin
+        self._items[item] = (bmin, bmax)
+        lo, hi = self._cell(bmin), self._cell(bmax)
+        for cell in _cells_between(lo, hi):
+            self._cells.setdefault(cell, set()).add(item)
+        if self._lo is not None:
+            self._lo = tuple(min(a, b) for a, b in zip(self._lo, lo))
+            self._hi = tuple(max(a, b) for a, b in zip(self._hi, hi))
+
+    def remove(self, item):
+        bmin, bmax = self._items.pop(item)
+        for cell in _cells_between(self._cell(bmin), self._cell(bmax)):
+            items = self._cells[cell]
+            items.discard(item)
+            if not items:
+                del self._cells[cell]
+                if self._lo is not None and any(c in bounds for c, bounds in zip(cell, zip(self._lo, self._hi))):
+                    # an outer cell was emptied, the bounds are found again on the next query
+                    self._lo = self._hi = None
+
+    def add_element(self, key, element):
+        """Index an element and the nodes of its paths, replacing earlier entries.
+
+        The element keeps a reference to the index, so paths added to it and
+        its transformations update the index. Call this again after editing
+        the paths of an element directly.
+        """
+        self.remove_element(key)
+        self._element_items[key] = set()
+        box = _element_box(element)
+        if box is not None:
+            self._add(key, (key, None, None), *box)
+        for path_key, path in element.paths(data=True):
+            self.add_path(key, path_key, path)
+        element._spatial = (self, key)
+
+    def add_path(self, element_key, path_key, path):
+        """Index the nodes of a path of an element."""
+        for node_key, point in _path_points(path):
+            self._add(element_key, (element_key, path_key, node_key), point)
+
+    def remove_element(self, key):
+        """Remove an element and the nodes of its paths."""
+        for item in self._element_items.pop(key, ()):
+            self.remove(item)
+
+    def _add(self, element_key, item, point, point_max=None):
+        self.insert(item, point, point_max)
+        self._element_items.setdefault(element_key, set()).add(item)
+
+    def _bounds(self):
+        # lowest and highest occupied cell, grown by insert and reset by remove
+        if self._lo is None and self._cells:
+            cells = list(self._cells)
+            self._lo = tuple(min(cell[i] for cell in cells) for i in range(3))
+            self._hi = tuple(max(cell[i] for cell in cells) for i in range(3))
+        return self._lo, self._hi
+
+    def _cell(self, point):
+        s = self.cell_size
+        return (int(floor(point[0]/s)), int(floor(point[1]/s)), int(floor(point[2]/s)))
+
+    # --------------------------------------------------------------------------
+    # queries
+    # --------------------------------------------------------------------------
+
+    def nearest(self, point, k=1, kind=None):
+        """The ``k`` items closest to a point.
+
+        Parameters
+        ----------
+        point : [float, float, float]
+        k : int, optional
+        kind : {None, "element", "node"}, optional
+            Only return items of this kind.
+
+        Returns
+        -------
+        list[tuple]
+            ``(item, distance)`` pairs, closest first.
+        """
+        if not self._items:
+            return []
+        center = self._cell(point)
+        reach = max(max(abs(c - lo), abs(c - hi)) for c, lo, hi in zip(center, *self._bounds()))
+        best = _Nearest(k)
+        seen = set()
+        for r in range(reach + 1):
+            if (2*r + 1)**3 >= len(self._cells):
+                # the shell is larger than the occupied cells, visit those by distance
+                s = self.cell_size
+                cells = sorted((_box_distance(point, [c*s for c in cell], [(c + 1)*s for c in cell]), cell)
+                               for cell in self._cells)
+                for distance, cell in cells:
+                    if best.full() and distance > best.distances[-1]:
+                        break
+                    self._offer(best, seen, cell, point, kind)
+                break
+            for cell in _shell(center, r):
+                self._offer(best, seen, cell, point, kind)
+            if best.full() and best.distances[-1] <= r*self.cell_size:
+                break
+        return list(zip(best.items, best.distances))
+
+    def _offer(self, best, seen, cell, point, kind):
+        for item in self._cells.get(cell, ()):
+            if item in seen or not _is_kind(item, kind):
+                continue
+            seen.add(item)
+            best.offer(_box_distance(point, *self._items[item]), item)
+
+    def radius(self, point, radius, kind=None):
+        """Items within a distance of a point."""
+        lo = [c - radius for c in point]
+        hi = [c + radius for c in point]
+        return [item for item in self.box(lo, hi, kind)
+                if _box_distance(point, *self._items[item]) <= radius]
+
+    def box(self, point_min, point_max, kind=None):
+        """Items that overlap the axis aligned box from ``point_min`` to ``point_max``."""
+        found = set()
+        lo, hi = self._cell(point_min), self._cell(point_max)
+        bounds = self._bounds()
+        if bounds[0] is not None:
+            lo = tuple(max(a, b) for a, b in zip(lo, bounds[0]))
+            hi = tuple(min(a, b) for a, b in zip(hi, bounds[1]))
+        for cell in _cells_between(lo, hi):
+            for item in self._cells.get(cell, ()):
+                if item in found or not _is_kind(item, kind):
+                    continue
+                bmin, bmax = self._items[item]
+                if all(bmin[i] <= point_max[i] and bmax[i] >= point_min[i] for i in range(3)):
+                    found.add(item)
+        return list(found)
+
+
+class _Nearest(object):
+    # the k closest items so far, sorted by distance
+
+    def __init__(self, k):
+        self.k = k
+        self.distances = []
+        self.items = []
+
+    def full(self):
+        return len(self.distances) == self.k
+
+    def offer(self, distance, item):
+        if self.full() and distance >= self.distances[-1]:
+            return
+        i = bisect(self.distances, distance)
+        self.distances.insert(i, distance)
+        self.items.insert(i, item)
+        del self.distances[self.k:]
+        del self.items[self.k:]
+
+
+def _is_kind(item, kind):
+    return kind is None or (item[1] is None) == (kind == "element")
+
+
+def _cells_between(lo, hi):
+    for i in range(lo[0], hi[0] + 1):
+        for j in range(lo[1], hi[1] + 1):
+            for k in range(lo[2], hi[2] + 1):
+                yield (i, j, k)
+
+
+def _shell(center, r):
+    # cells at Chebyshev distance r from center
+    x, y, z = center
+    for i in range(-r, r + 1):
+        for j in range(-r, r + 1):
+            if r in (abs(i), abs(j)):
+                ks = range(-r, r + 1)
+            else:
+                ks = (-r, r) if r else (0,)
+            for k in ks:
+                yield (x + i, y + j, z + k)
+
+
+def _box_distance(point, bmin, bmax):
+    d = 0.0
+    for c, lo, hi in zip(point, bmin, bmax):
+        if c < lo:
+            d += (lo - c)**2
+        elif c > hi:
+            d += (c - hi)**2
+    return d**0.5
+
+
+def _element_box(element):
+    box = element.bounding_box
+    if box is not None:
+        return box
+    if element.frame is not None:
+        return tuple(element.frame.point), None
+    return None
+
+
+def _path_points(path):
+    store = path.store
+    if store is not None:
+        frames = store.frames
+        for row, key in enumerate(store.keys()):
+            i = 9*row
+            yield key, (frames[i], frames[i + 1], frames[i + 2])
+    else:
+        for key, attr in path.nodes(data=True):
+            yield key, tuple(attr["node"].frame.point)
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from collections import deque
+
+from .progress import ProgressTracker
+from .targets import iter_targets
+from .targets import _stored
+
+__all__ = [
+    'TargetStream'
+]
+
+
+class TargetStream(object):
+    """Stream robot targets to a controller over an asyncio connection.
+
+    Targets are written as JSON lines, see :meth:`encode`, in build order.
+    At most ``lookahead`` targets are sent ahead of the last acknowledged
+    one, so the controller buffer stays full without flooding it, and
+    writing waits for the transport to drain. The controller acknowledges
+    reached targets with ``{"ack": id}`` lines, an acknowledgement covers
+    all targets up to that id. Each one writes the ``state`` of the reached
+    nodes with :meth:`Path.update_node`, or marks them in :attr:`tracker`
+    once that was built.
+
+    Parameters
+    ----------
+    graph : :class:`InformationModel`, :class:`Element` or :class:`Path`
+    order : list, optional
+        Build order, see :func:`iter_targets`.
+    lookahead : int, optional
+        Most targets sent but not acknowledged, at least 1.
+    state : str, optional
+        Node ``state`` of reached nodes, ``None`` to leave the states.
+
+    Attributes
+    ----------
+    sent : int
+    acknowledged : int
+
+    Raises
+    ------
+    ValueError
+        If ``lookahead`` is smaller than 1.
+    """
+
+    def __init__(self, graph, order=None, lookahead=64, state="printed"):
+        if lookahead < 1:
+            raise ValueError("The look-ahead must be at least 1, got {}.".format(lookahead))
+        self.graph = graph
+        self.order = order
+        self.lookahead = lookahead
+        self.state = state
+        self.sent = 0
+        self.acknowledged = 0
+        self._tracker = None
+        self._pending = deque()
+        self._changed = None
+
+    @property
+    def tracker(self):
+        """:class:`ProgressTracker` of the graph, None without a ``state``.
+
+        Built on first access from the node states written so far, which
+        lays out every node of the graph once.
+        """
+        if self._tracker is None and self.state is not None:
+            self._tracker = ProgressTracker(self.graph, self.order, self.state)
+        return self._tracker
+
+    def encode(self, id, target):
+        """Message of a target, override for another controller protocol."""
+        frame = target["frame"]
+        message = {
+            "id": id,
+            "element": target["element"],
+            "path": target["path"],
+            "node": target["node"],
+            "frame": [list(frame.point), list(frame.xaxis), list(frame.yaxis)],
+            "robot_velocity": target["robot_velocity"],
+            "extrusion_rate": target["extrusion_rate"]
+        }
+        return (json.dumps(message) + "\n").encode("utf-8")
+
+    def decode(self, line):
+        """Id of the last reached target in an acknowledgement, or None."""
+        message = json.loads(line.decode("utf-8"))
+        return message.get("ack")
+
+    async def run(self, reader, writer):
+        """Send all targets and wait until they are acknowledged.
+
+        Parameters
+        ----------
+        reader : :class:`asyncio.StreamReader`
+        writer : :class:`asyncio.StreamWriter`
+            Connection to the controller, e.g. of
+            :func:`asyncio.open_connection`.
+
+        Returns
+        -------
+        dict
+            Number of targets ``"sent"`` and ``"acknowledged"``.
+
+        Raises
+        ------
+        ConnectionError
+            If the controller closes the connection before it acknowledged
+            all targets.
+        """
+        self._changed = asyncio.Event()
+        receiving = asyncio.ensure_future(self._receive(reader))
+        try:
+            targets = iter_targets(self.graph, self.order)
+            exhausted = False
+            while not exhausted:
+                while len(self._pending) >= self.lookahead:
+                    await self._wait(receiving)
+                # fill the free part of the look-ahead at once, then drain
+                for i in range(self.lookahead - len(self._pending)):
+                    target = next(targets, None)
+                    if target is None:
+                        exhausted = True
+                        break
+                    writer.write(self.encode(self.sent, target))
+                    self._pending.append((self.sent, target))
+                    self.sent += 1
+                await writer.drain()
+            while self._pending:
+                await self._wait(receiving)
+        finally:
+            receiving.cancel()
+        return {"sent": self.sent, "acknowledged": self.acknowledged}
+
+    async def _wait(self, receiving):
+        self._changed.clear()
+        if receiving.done():
+            receiving.result()
+            raise ConnectionError("The controller closed the connection with {} targets not acknowledged.".format(len(self._pending)))
+        await self._changed.wait()
+
+    async def _receive(self, reader):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                id = self.decode(line)
+                if id is not None:
+                    self._acknowledge(id)
+        finally:
+            self._changed.set()
+
+    def _acknowledge(self, id):
+        target = None
+        while self._pending and self._pending[0][0] <= id:
+            target = self._pending.popleft()[1]
+            self.acknowledged += 1
+            if self.state is not None and self._tracker is None:
+                path = _stored(self.graph, target["element"], target["path"])[1]
+                path.update_node(target["node"], state=self.state)
+        if target is not None:
+            if self._tracker is not None:
+                self._tracker.mark_through(target["element"], target["path"], target["node"])
+            self._changed.set()
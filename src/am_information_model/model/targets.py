@@ -0,0 +1,119 @@
+from .graph import _decode
+from .graph import _is_encoded
+
+__all__ = [
+    'iter_targets'
+]
+
+
+def iter_targets(graph, order=None, batch_size=None):
+    """Yield the robot targets of a model or an element in build order.
+
+    Elements and paths are visited one at a time. Those that a lazy
+    :meth:`ExtendedGraph.from_data` kept serialized are decoded for the
+    visit only and not stored back, so memory stays bounded by the largest
+    path. Nodes follow the print order of their path, see
+    :meth:`Path.print_order`.
+
+    Parameters
+    ----------
+    graph : :class:`InformationModel`, :class:`Element` or :class:`Path`
+    order : list, optional
+        Build order as ``(element_key, path_key)`` pairs or as the steps of
+        :func:`schedule`. By default elements and paths in insertion order.
+        The ``element`` and ``path`` keys of the targets of a single path
+        are ``None``.
+    batch_size : int, optional
+        Yield lists of up to this many targets instead of single targets.
+
+    Yields
+    ------
+    dict
+        ``element``, ``path`` and ``node`` keys, the node ``frame``, its
+        ``robot_velocity`` and ``extrusion_rate``.
+    """
+    targets = _targets(graph, order)
+    if not batch_size:
+        for target in targets:
+            yield target
+        return
+    batch = []
+    for target in targets:
+        batch.append(target)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _targets(graph, order):
+    if hasattr(graph, "print_order"):
+        # a single path
+        for target in _path_targets(graph, None, None):
+            yield target
+        return
+    for element_key, element, path_key in _steps(graph, order):
+        for target in _path_targets(_peek(element, path_key, "path"), element_key, path_key):
+            yield target
+
+
+def _steps(graph, order):
+    # (element key, element, path key) in build order, the elements read with _peek
+    is_model = hasattr(graph, "elements")
+    if order is None:
+        if is_model:
+            elements = ((key, _peek(graph, key, "element")) for key in graph.elements())
+        else:
+            elements = [(None, graph)]
+        for element_key, element in elements:
+            for path_key in element.paths():
+                yield element_key, element, path_key
+        return
+    element_key, element = object(), None
+    for step in order:
+        if isinstance(step, dict):
+            step = step["element"], step["path"]
+        if step[0] != element_key:
+            element_key = step[0]
+            element = _peek(graph, element_key, "element") if is_model else graph
+        yield element_key, element, step[1]
+
+
+def _path_targets(path, element_key, path_key):
+    store = path.store
+    for key in path.print_order():
+        if store is not None:
+            row = store.row(store.id(key))
+            frame = store.frame(row)
+            velocity = store.get_attribute(row, "robot_velocity")
+            rate = store.get_attribute(row, "extrusion_rate")
+        else:
+            node = path.node[key]["node"]
+            frame = node.frame
+            velocity = node.attributes.get("robot_velocity")
+            rate = node.attributes.get("extrusion_rate")
+        yield {
+            "element": element_key,
+            "path": path_key,
+            "node": key,
+            "frame": frame,
+            "robot_velocity": velocity,
+            "extrusion_rate": rate
+        }
+
+
+def _peek(graph, key, attr):
+    # like get_node, but a serialized value is not stored back
+    value = graph.node[key][attr]
+    if _is_encoded(value):
+        value = _decode(value, graph._lazy)
+    return graph._resolve(key, attr, value, store=False)
+
+
+def _stored(graph, element_key, path_key):
+    # the element and path of a target, decoded and stored to be changed
+    if hasattr(graph, "print_order"):
+        return None, graph
+    element = graph.get_element(element_key) if hasattr(graph, "elements") else graph
+    return element, element.get_path(path_key)
@@ -0,0 +1,211 @@
+from .spatialindex import SpatialIndex
+from .scheduler import _cell_size
+
+__all__ = [
+    'optimize_travel'
+]
+
+
+def optimize_travel(element, flip=True, constraints="edges", window=50, passes=3, start=None):
+    """Reorder the paths of an element, and flip them, to shorten the travel between them.
+
+    A nearest neighbour tour is built in dependency order and improved by
+    2-opt moves: a run of consecutive paths is printed backwards, each of
+    them flipped, where that shortens the travel. Moves span at most
+    ``window`` paths, so a pass is linear in the number of paths.
+
+    Parameters
+    ----------
+    element : :class:`Element`
+    flip : bool, optional
+        Allow flipping paths, see :meth:`Path.flip`. 2-opt moves need it,
+        without it only the nearest neighbour order is used.
+    constraints : {"edges", "layers", None}, optional
+        Keep the order of the ``parent`` edges between the paths, keep the
+        layers of :attr:`Element.layer_index` in order and reorder the paths
+        within a layer, or reorder freely. The edges that
+        :meth:`Element.add_path` adds to the previous path by default only
+        keep the order the paths were added in and do not constrain it.
+    window : int, optional
+        Longest run of paths reversed by a 2-opt move.
+    passes : int, optional
+        Maximum number of 2-opt passes.
+    start : [float, float, float], optional
+        Position before the first path, included in the travel.
+
+    Returns
+    -------
+    dict
+        ``"before"`` and ``"after"`` travel length (m), the path keys in the
+        new ``"order"`` and the keys of the paths that were ``"flipped"``.
+        The ``parent`` edges between the paths are rewritten to a chain in
+        the new order, the constraining edges are kept with ``"edges"``.
+
+    Raises
+    ------
+    ValueError
+        If the ``parent`` edges between the paths have a cycle.
+    """
+    keys = list(element.paths())
+    index = dict((key, i) for i, key in enumerate(keys))
+    paths = [element.get_path(key) for key in keys]
+    heads, tails, reversed_ = [], [], []
+    for path in paths:
+        ends = path.endpoints() or ([0.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+        flag = bool(path.attributes.get("reversed"))
+        # node order ends, endpoints already follow the print direction
+        heads.append(tuple(ends[1] if flag else ends[0]))
+        tails.append(tuple(ends[0] if flag else ends[1]))
+        reversed_.append(flag)
+    tour = _Tour(heads, tails, start)
+    before = tour.length(list(range(len(keys))), reversed_)
+
+    if constraints == "edges":
+        preds = [[] for key in keys]
+        for (u, v), attr in element.edges(data=True):
+            if u in index and v in index and not attr.get("sequence"):
+                preds[index[v]].append(index[u])
+        blocks = None
+    elif constraints == "layers":
+        preds = None
+        blocks = [0]*len(keys)
+        layers = element.layer_index
+        for n in range(len(layers.levels)):
+            for key in layers.layer(n):
+                blocks[index[key]] = n
+    else:
+        preds = blocks = None
+
+    order, rev = _nearest_neighbour(tour, preds, blocks, flip, reversed_)
+    if flip:
+        _two_opt(tour, order, rev, preds, blocks, window, passes)
+    after = tour.length(order, rev)
+
+    flipped = []
+    for i in order:
+        if rev[i] != reversed_[i]:
+            paths[i].flip()
+            flipped.append(keys[i])
+    element._reorder_paths([keys[i] for i in order], keep_edges=constraints == "edges")
+    return {"before": before, "after": after, "order": [keys[i] for i in order], "flipped": flipped}
+
+
+class _Tour(object):
+    # path ends, entry and exit of a path depend on its direction
+
+    def __init__(self, heads, tails, start):
+        self.heads = heads
+        self.tails = tails
+        self.start = tuple(start) if start is not None else None
+
+    def entry(self, i, rev):
+        return self.tails[i] if rev[i] else self.heads[i]
+
+    def exit(self, i, rev):
+        return self.heads[i] if rev[i] else self.tails[i]
+
+    def length(self, order, rev):
+        total = 0.0
+        point = self.start
+        for i in order:
+            if point is not None:
+                total += _distance(point, self.entry(i, rev))
+            point = self.exit(i, rev)
+        return total
+
+
+def _nearest_neighbour(tour, preds, blocks, flip, reversed_):
+    n = len(tour.heads)
+    rev = list(reversed_)
+    order = []
+    pool = SpatialIndex(_cell_size(tour.heads + tour.tails))
+
+    def release(i):
+        if flip:
+            pool.insert((i, False), tour.heads[i])
+            pool.insert((i, True), tour.tails[i])
+        else:
+            pool.insert((i, rev[i]), tour.entry(i, rev))
+
+    if blocks is not None:
+        groups = {}
+        for i in range(n):
+            groups.setdefault(blocks[i], []).append(i)
+        waves = [groups[block] for block in sorted(groups)]
+    else:
+        waves = [list(range(n))]
+    succs = None
+    if preds is not None:
+        count = [len(p) for p in preds]
+        succs = [[] for i in range(n)]
+        for i, p in enumerate(preds):
+            for j in p:
+                succs[j].append(i)
+        waves = [[i for i in range(n) if not count[i]]]
+
+    point = tour.start or (tour.heads[0] if n else None)
+    for wave in waves:
+        for i in wave:
+            release(i)
+        while len(pool):
+            (i, flag), distance = pool.nearest(point)[0]
+            pool.remove((i, flag))
+            if flip:
+                pool.remove((i, not flag))
+            rev[i] = flag
+            order.append(i)
+            point = tour.exit(i, rev)
+            if succs is not None:
+                for j in succs[i]:
+                    count[j] -= 1
+                    if not count[j]:
+                        release(j)
+    if len(order) < n:
+        raise ValueError("The parent edges between the paths have a cycle.")
+    return order, rev
+
+
+def _two_opt(tour, order, rev, preds, blocks, window, passes):
+    n = len(order)
+    pos = [0]*n
+    for p, i in enumerate(order):
+        pos[i] = p
+    # positions next to a change, only those are tried again in the next pass
+    active = set(range(n))
+    for _ in range(passes):
+        if not active:
+            break
+        changed = set()
+        for i in sorted(active):
+            a = tour.exit(order[i - 1], rev) if i else tour.start
+            first = tour.entry(order[i], rev)
+            base = _distance(a, first) if a is not None else 0.0
+            bound = -1
+            for j in range(i, min(n, i + window)):
+                k = order[j]
+                if j > i:
+                    if blocks is not None and blocks[k] != blocks[order[i]]:
+                        break
+                    if preds is not None:
+                        bound = max([bound] + [pos[q] for q in preds[k]])
+                        if bound >= i:
+                            break
+                last = tour.exit(k, rev)
+                old = base
+                new = _distance(a, last) if a is not None else 0.0
+                if j + 1 < n:
+                    b = tour.entry(order[j + 1], rev)
+                    old += _distance(last, b)
+                    new += _distance(first, b)
+                if new < old - 1e-12:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    for p in range(i, j + 1):
+                        rev[order[p]] = not rev[order[p]]
+                        pos[order[p]] = p
+                    changed.update(range(max(0, i - window), min(n, j + 2)))
+                    break
+        active = changed
+
+
+def _distance(a, b):
+    return ((b[0] - a[0])**2 + (b[1] - a[1])**2 + (b[2] - a[2])**2)**0.5
@@ -1,7 +1,18 @@
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from compas.geometry import transform_points
+from compas.geometry import transform_vectors
+
 __all__ = [
     "_serialize_to_data",
-    "_deserialize_from_data"
+    "_deserialize_from_data",
+    "_transform_point_array",
+    "_transform_vector_array",
+    "_similarity_scale"
 ]
 
 def _serialize_to_data(obj):
@@ -22,4 +33,43 @@ def _deserialize_from_data(data):
             cls = getattr(__import__(module, fromlist=[attr]), attr)
         return cls.from_data(data.get('data'))
     else:
-        return None
\ No newline at end of file
+        return None
+
+
+def _matrix(T):
+    return np.asarray(T.matrix if hasattr(T, "matrix") else T, dtype=float)
+
+
+def _transform_point_array(points, T):
+    # N x 3 points in one go, NumPy when available (not on IronPython)
+    if np is None:
+        return transform_points(points, T)
+    M = _matrix(T)
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    result = np.dot(points, M[:3, :3].T) + M[:3, 3]
+    w = np.dot(points, M[3, :3]) + M[3, 3]
+    if np.any(w != 1.0):
+        result /= w[:, None]
+    return result
+
+
+def _transform_vector_array(vectors, T):
+    if np is None:
+        return transform_vectors(vectors, T)
+    M = _matrix(T)
+    return np.dot(np.asarray(vectors, dtype=float).reshape(-1, 3), M[:3, :3].T)
+
+
+def _similarity_scale(T, tol=1e-9):
+    # uniform scale factor of a similarity transformation, None for any other
+    M = T.matrix if hasattr(T, "matrix") else T
+    if any(abs(M[3][i]) > tol for i in range(3)) or abs(M[3][3] - 1.0) > tol:
+        return None
+    cols = [[M[r][c] for r in range(3)] for c in range(3)]
+    s2 = sum(x*x for x in cols[0])
+    for i in range(3):
+        for j in range(i, 3):
+            dot = sum(a*b for a, b in zip(cols[i], cols[j]))
+            if abs(dot - (s2 if i == j else 0.0)) > tol*max(1.0, s2):
+                return None
+    return s2**0.5
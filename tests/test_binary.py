@@ -0,0 +1,85 @@
+import pytest
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Node
+from am_information_model.model import Path
+from am_information_model.model import binary_dump
+from am_information_model.model import binary_dumps
+from am_information_model.model import binary_load
+from am_information_model.model import binary_loads
+from am_information_model.model import build_elements
+
+
+def build_wall(i):
+    element = Element(frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]))
+    for layer in range(3):
+        frames = [Frame([i + 0.01*k, 0.0, 0.003*layer], [1, 0, 0], [0, 1, 0]) for k in range(10)]
+        element.add_path(Path.from_frames(frames, path_width=0.01, path_height=0.003, robot_velocity=100.0))
+    return element
+
+
+def _rows(path):
+    nodes = [(key, path.get_node(key)) for key in path.nodes()]
+    return [(key, list(node.frame.point), dict(node.attributes)) for key, node in nodes]
+
+
+def _model():
+    model = InformationModel()
+    for i in range(2):
+        model.add_element(build_wall(i))
+    return model
+
+
+def test_round_trip():
+    model = _model()
+    loaded = binary_loads(binary_dumps(model))
+    assert list(loaded.elements()) == list(model.elements())
+    for key, element in model.elements(data=True):
+        other = loaded.get_element(key)
+        assert list(other.paths()) == list(element.paths())
+        assert other.frame == element.frame
+        for path_key, path in element.paths(data=True):
+            copy = other.get_path(path_key)
+            assert copy.store is not None
+            assert _rows(copy) == _rows(path)
+            assert sorted(copy.edges()) == sorted(path.edges())
+
+
+def test_file_round_trip(tmp_path):
+    path = build_wall(0).get_path("path_1")
+    filepath = str(tmp_path / "path.bin")
+    binary_dump(path, filepath)
+    assert _rows(binary_load(filepath)) == _rows(path)
+    assert _rows(binary_load(filepath, mmap=False)) == _rows(path)
+
+
+def test_build_elements_is_columnar():
+    for processes in (1, 2):
+        model = InformationModel()
+        keys = build_elements(model, build_wall, range(3), processes=processes)
+        assert keys == ["element_0", "element_1", "element_2"]
+        assert model.has_edge("element_0", "element_1")
+        for key, element in model.elements(data=True):
+            assert all(path.store is not None for path_key, path in element.paths(data=True))
+
+
+def test_memory_mapped_path_copies_on_write(tmp_path):
+    path = build_wall(0).get_path("path_1")
+    path.get_node("node_3").attributes["state"] = "printed"
+    filepath = str(tmp_path / "path.bin")
+    binary_dump(path, filepath)
+    with open(filepath, "rb") as fp:
+        written = fp.read()
+    loaded = binary_load(filepath)
+    assert _rows(loaded) == _rows(path)
+    assert loaded.metrics == pytest.approx(path.metrics)
+    # changes stay in memory, resizing moves the columns into arrays
+    loaded.update_node("node_0", extrusion_rate=2.0)
+    loaded.add_node(Node(frame=Frame([0.1, 0.0, 0.0], [1, 0, 0], [0, 1, 0])))
+    assert loaded.get_node("node_0").attributes["extrusion_rate"] == 2.0
+    assert loaded.has_edge("node_9", "node_10")
+    with open(filepath, "rb") as fp:
+        assert fp.read() == written
+    assert _rows(binary_load(filepath)) == _rows(path)
@@ -0,0 +1,115 @@
+import threading
+
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import ConcurrentModel
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import ProgressTracker
+
+PATHS, NODES = 3, 20
+
+
+def _element(i, columnar=False):
+    element = Element()
+    for j in range(PATHS):
+        frames = [Frame([i + 0.01*k, 0.1*j, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(NODES)]
+        path = Path.from_frames(frames, robot_velocity=100.0)
+        if columnar:
+            path.to_columnar()
+        element.add_path(path)
+    return element
+
+
+def _check(model):
+    keys = list(model.elements())
+    assert len(keys) == len(model.node), "half added element"
+    assert model.attributes["_last_element"] == (keys[-1] if keys else None)
+    for key in keys:
+        element = model.get_element(key)
+        assert element.number_of_nodes() == PATHS, "half built element"
+        for path_key in element.paths():
+            path = element.get_path(path_key)
+            nodes = [path.get_node(n) for n in path.nodes()]
+            assert len(nodes) == NODES and path.number_of_edges() == NODES - 1, "half built path"
+            assert len(set(round(node.frame.point[2], 9) for node in nodes)) == 1, "half transformed path"
+            assert len(set(node.attributes.get("state") for node in nodes)) == 1, "half marked path"
+
+
+def test_readers_see_consistent_snapshots():
+    concurrent = ConcurrentModel(InformationModel())
+    stop = threading.Event()
+    errors = []
+    reads = []
+
+    def read():
+        count = 0
+        while not stop.is_set():
+            try:
+                _check(concurrent.snapshot())
+            except Exception as error:
+                errors.append(repr(error))
+            count += 1
+        reads.append(count)
+
+    readers = [threading.Thread(target=read) for i in range(3)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(8):
+            element = _element(i, columnar=i % 2 == 1)
+            with concurrent.writing() as model:
+                model.add_element(element)
+            with concurrent.writing():
+                element.transform(Translation.from_vector([0.0, 0.0, 0.003]))
+                tracker = ProgressTracker(element)
+                tracker.mark_path(None, "path_0")
+            with concurrent.writing():
+                # copied from the previous snapshot of the path
+                tracker.mark_path(None, "path_1")
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+    assert errors == []
+    assert sum(reads) > 0
+    _check(concurrent.snapshot())
+    assert len(list(concurrent.snapshot().elements())) == 8
+
+
+def test_marked_states_copy_only_the_marked_nodes():
+    element = _element(0)
+    concurrent = ConcurrentModel(element)
+    unchanged = concurrent.snapshot().get_path("path_0")
+    before = concurrent.snapshot().get_path("path_1")
+    with concurrent.writing():
+        ProgressTracker(element).mark(None, "path_1", "node_3")
+    after = concurrent.snapshot().get_path("path_1")
+    assert after is not before
+    assert after.node["node_3"]["node"].attributes["state"] == "printed"
+    assert before.node["node_3"]["node"].attributes["state"] is None
+    assert after.node["node_4"]["node"] is before.node["node_4"]["node"]
+    assert concurrent.snapshot().get_path("path_0") is unchanged
+
+
+def test_marked_states_copy_only_the_state_column():
+    element = _element(0, columnar=True)
+    concurrent = ConcurrentModel(element)
+    before = concurrent.snapshot().get_path("path_1")
+    with concurrent.writing():
+        ProgressTracker(element).mark(None, "path_1", "node_3")
+    after = concurrent.snapshot().get_path("path_1")
+    assert after.store.states is not before.store.states
+    assert after.store.frames is before.store.frames
+    assert after.get_node("node_3").attributes["state"] == "printed"
+    assert before.get_node("node_3").attributes["state"] is None
+    element.get_path("path_1").update_node("node_5", extrusion_rate=2.0)
+    with concurrent.writing():
+        pass
+    latest = concurrent.snapshot().get_path("path_1")
+    assert latest.store.columns["extrusion_rate"] is not after.store.columns["extrusion_rate"]
+    assert latest.store.columns["path_width"] is after.store.columns["path_width"]
+    assert latest.get_node("node_5").attributes["extrusion_rate"] == 2.0
+    assert after.get_node("node_5").attributes["extrusion_rate"] is None
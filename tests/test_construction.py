@@ -0,0 +1,63 @@
+from compas.geometry import Frame
+
+from am_information_model.model import Node
+from am_information_model.model import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _frames(n=6):
+    return [Frame([0.01*k, 0.002*k*k, 0.003], [1, 0, 0], [0, 1, 0]) for k in range(n)]
+
+
+def _describe(path):
+    nodes = []
+    for key in path.nodes():
+        node = path.get_node(key)
+        frame = node.frame
+        nodes.append((key, [round(c, 12) for c in list(frame.point) + list(frame.xaxis) + list(frame.yaxis)],
+                      dict((name, value) for name, value in node.attributes.items() if name not in ("name", "node_type"))))
+    edges = sorted((u, v, [round(c, 12) for c in path.edge_attribute((u, v), "edge").vector]) for u, v in path.edges())
+    return nodes, edges, path.get_last_key("node")
+
+
+def _added(frames, **process):
+    path = Path(frame=frames[0])
+    for i, frame in enumerate(frames):
+        node = Node(frame=frame)
+        for name, values in process.items():
+            node.attributes[name] = values[i] if isinstance(values, list) else values
+        path.add_node(node)
+    return path
+
+
+def test_from_frames_equals_added_nodes():
+    frames = _frames()
+    widths = [0.01 + 0.001*k for k in range(len(frames))]
+    expected = _describe(_added(frames, path_width=widths, robot_velocity=100.0))
+    path = Path.from_frames(frames, path_width=widths, robot_velocity=100.0)
+    assert _describe(path) == expected
+    assert path.metrics == _added(frames, path_width=widths, robot_velocity=100.0).metrics
+
+
+def test_from_arrays_equals_from_frames():
+    frames = _frames()
+    expected = _describe(Path.from_frames(frames, extrusion_rate=2.0))
+    points = [list(frame.point) for frame in frames]
+    for values in [points] + ([np.array(points)] if np is not None else []):
+        assert _describe(Path.from_arrays(values, extrusion_rate=2.0)) == expected
+        columnar = Path.from_arrays(values, columnar=True, extrusion_rate=2.0)
+        assert columnar.store is not None
+        assert _describe(columnar) == expected
+
+
+def test_from_frames_extends_after_existing_nodes():
+    frames = _frames()
+    path = Path.from_frames(frames[:3])
+    path._extend_chain(frames[3:], {})
+    assert _describe(path) == _describe(Path.from_frames(frames))
+    path.add_node(Node(frame=Frame([1.0, 0.0, 0.0], [1, 0, 0], [0, 1, 0])))
+    assert path.has_edge("node_5", "node_6")
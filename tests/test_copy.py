@@ -0,0 +1,77 @@
+import pytest
+from compas.data import json_dumps
+from compas.data import json_loads
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import Node
+from am_information_model.model import Path
+
+T = Translation.from_vector([0.0, 0.0, 0.005])
+
+
+def _path(columnar=False):
+    frames = [Frame([0.01*k, 0.0, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(5)]
+    path = Path.from_frames(frames, path_width=0.01, path_height=0.003, robot_velocity=100.0)
+    path.get_node("node_1").attributes["tag"] = "seam"
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+def _round_trip(path):
+    # data holds the node objects themselves, only a serialized copy is independent
+    return json_loads(json_dumps(path))
+
+
+def _describe(path):
+    nodes = [(key, [round(c, 12) for c in path.get_node(key).frame.point], dict(path.get_node(key).attributes))
+             for key in path.nodes()]
+    edges = sorted((u, v, [round(c, 12) for c in path.edge_attribute((u, v), "edge").vector]) for u, v in path.edges())
+    return nodes, edges, path.get_last_key("node")
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_copy_equals_data_round_trip(columnar):
+    path = _path(columnar)
+    copy = path.copy()
+    assert _describe(copy) == _describe(_round_trip(path))
+    assert copy.metrics == path.metrics
+    assert (copy.store is None) == (path.store is None)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_transformed_equals_transformed_copy(columnar):
+    path = _path(columnar)
+    expected = _round_trip(path)
+    expected.transform(T)
+    moved = path.transformed(T)
+    assert _describe(moved) == _describe(expected)
+    assert moved.metrics == pytest.approx(path.metrics)
+    assert _describe(path) == _describe(_path(columnar))
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_copy_is_independent(columnar):
+    path = _path(columnar)
+    before = _describe(path)
+    copy = path.copy()
+    copy.get_node("node_2").attributes["extrusion_rate"] = 2.0
+    copy.get_node("node_3").frame = Frame([1.0, 1.0, 1.0], [1, 0, 0], [0, 1, 0])
+    copy.add_node(Node(frame=Frame([0.05, 0.0, 0.0], [1, 0, 0], [0, 1, 0])))
+    copy.transform(T)
+    assert _describe(path) == before
+    assert path.add_node(Node(frame=Frame.worldXY())) is None
+    assert list(path.nodes())[-1] == "node_5"
+
+
+def test_element_transformed_copies_paths():
+    element = Element.from_paths([_path(), _path(columnar=True)])
+    moved = element.transformed(T)
+    for key, path in element.paths(data=True):
+        other = moved.get_path(key)
+        assert other is not path
+        expected = path.transformed(T)
+        assert _describe(other) == _describe(expected)
+    assert element.get_path("path_0").get_node("node_0").frame.point.z == 0.0
@@ -0,0 +1,89 @@
+import json
+
+from compas.data import DataEncoder
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import ProgressTracker
+from am_information_model.model import apply_patch
+from am_information_model.model import make_patch
+from am_information_model.model import take_snapshot
+
+
+def _model(columnar=False):
+    model = InformationModel()
+    for x in range(2):
+        element = Element()
+        for layer in range(3):
+            frames = [Frame([x + 0.01*k, 0.0, 0.003*layer], [1, 0, 0], [0, 1, 0]) for k in range(20)]
+            path = Path.from_frames(frames, path_width=0.01, path_height=0.003, robot_velocity=100.0)
+            if columnar:
+                path.to_columnar()
+            element.add_path(path)
+        model.add_element(element)
+    return model
+
+
+def _copy(model):
+    return InformationModel.from_data(json.loads(json.dumps(model.data, cls=DataEncoder)))
+
+
+def _dumps(model):
+    # node guids are not kept by from_data
+    def strip(value):
+        if isinstance(value, dict):
+            return dict((name, strip(item)) for name, item in value.items() if name != "guid")
+        if isinstance(value, list):
+            return [strip(item) for item in value]
+        return value
+    return json.dumps(strip(json.loads(json.dumps(model.data, cls=DataEncoder))), sort_keys=True)
+
+
+def test_unchanged_model_has_empty_patch():
+    model = _model()
+    assert make_patch(model, take_snapshot(model)) == {}
+
+
+def test_progress_sends_only_marked_rows():
+    for columnar in (False, True):
+        model = _model(columnar)
+        copy = _copy(model)
+        snapshot = take_snapshot(model)
+        tracker = ProgressTracker(model)
+        tracker.mark("element_0", "path_1", "node_3")
+        tracker.mark("element_0", "path_1", "node_4")
+        patch = make_patch(model, snapshot)
+        assert list(patch["children"]) == ["'element_0'"]
+        path = patch["children"]["'element_0'"]["children"]["'path_1'"]
+        assert list(path) == ["nodes"]
+        assert sorted(path["nodes"]) == ["'node_3'", "'node_4'"]
+        apply_patch(copy, patch)
+        assert _dumps(copy) == _dumps(model)
+
+
+def test_update_node_sends_the_row():
+    model = _model()
+    copy = _copy(model)
+    snapshot = take_snapshot(model)
+    path = model.get_element("element_1").get_path("path_0")
+    path.update_node("node_7", extrusion_rate=2.0)
+    patch = make_patch(model, snapshot)
+    rows = patch["children"]["'element_1'"]["children"]["'path_0'"]["nodes"]
+    assert list(rows) == ["'node_7'"]
+    assert rows["'node_7'"]["attributes"]["extrusion_rate"] == 2.0
+    apply_patch(copy, patch)
+    assert _dumps(copy) == _dumps(model)
+
+
+def test_other_changes_send_the_path():
+    model = _model()
+    copy = _copy(model)
+    snapshot = take_snapshot(model)
+    model.get_element("element_0").get_path("path_2").transform(Translation.from_vector([0.0, 0.0, 1.0]))
+    patch = make_patch(model, snapshot)
+    assert "data" in patch["children"]["'element_0'"]["children"]["'path_2'"]
+    apply_patch(copy, patch)
+    assert _dumps(copy) == _dumps(model)
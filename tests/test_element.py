@@ -0,0 +1,99 @@
+import json
+
+from compas.data import json_dumps
+from compas.data import json_loads
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Circle
+from compas.geometry import Cylinder
+from compas.geometry import Frame
+from compas.geometry import Plane
+from compas.geometry import Rotation
+from compas.geometry import Sphere
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import binary_dumps
+from am_information_model.model import binary_loads
+
+
+def _points(mesh):
+    return sorted(tuple(round(c, 9) for c in mesh.vertex_coordinates(key)) for key in mesh.vertices())
+
+
+def _close(a, b):
+    return all(abs(x - y) < 1e-9 for x, y in zip(a, b))
+
+
+def _sphere():
+    frame = Frame([1.0, 2.0, 0.5], [1, 0, 0], [0, 1, 0])
+    return Element.from_shape(Sphere([1.0, 2.0, 0.5], 0.25), frame, resolution=8)
+
+
+def test_from_shape_round_trip():
+    element = _sphere()
+    data = json.loads(json_dumps(element))["value"]
+    # the shape is stored, not its mesh
+    assert data["_mesh"] is None
+    assert data["_resolution"] == 8
+    loaded = json_loads(json_dumps(element))
+    assert isinstance(loaded._source, Sphere)
+    assert loaded._resolution == 8
+    assert loaded.frame == element.frame
+    assert loaded.mesh.number_of_faces() == element.mesh.number_of_faces()
+    assert _points(loaded.mesh) == _points(element.mesh)
+    assert _close(loaded.centroid, element.centroid)
+
+
+def test_transformed_box_round_trip():
+    element = Element.from_box(Box(Frame([1.0, 2.0, 3.0], [1, 1, 0], [-1, 1, 0]), 0.2, 0.1, 0.05))
+    element.transform(Rotation.from_axis_and_angle([0, 0, 1], 0.7, point=[1, 1, 1]))
+    loaded = Element.from_data(json.loads(json_dumps(element))["value"])
+    assert isinstance(loaded._source, Box)
+    assert _points(loaded.mesh) == _points(element.mesh)
+    for a, b in zip(loaded.bounding_box, element.bounding_box):
+        assert _close(a, b)
+
+
+def test_lazy_and_binary_round_trip():
+    model = InformationModel()
+    model.add_element(_sphere())
+    model.add_element(Element.from_box(Box(Frame.worldXY(), 0.24, 0.115, 0.071)))
+    data = json.loads(json_dumps(model))["value"]
+    for loaded in (InformationModel.from_data(data, lazy=True), binary_loads(binary_dumps(model))):
+        for key, element in model.elements(data=True):
+            other = loaded.get_element(key)
+            assert type(other._source) is type(element._source)
+            assert _points(other.mesh) == _points(element.mesh)
+
+
+def _legacy_data(source, mesh):
+    # the data of an element as written before shapes were encoded with their dtype
+    frame = Frame([1.0, 2.0, 3.0], [1, 0, 0], [0, 1, 0])
+    data = json.loads(json_dumps(Element(frame=frame)))["value"]
+    del data["_resolution"]
+    data["_source"] = source.data
+    data["_mesh"] = mesh.data
+    return {"dtype": "am_information_model.model/Element", "value": data}
+
+
+def test_legacy_data_round_trip():
+    box = Box(Frame([1.0, 2.0, 3.0], [1, 0, 0], [0, 1, 0]), 0.2, 0.1, 0.05)
+    mesh = Mesh.from_shape(box)
+    for source in (box, mesh):
+        legacy = _legacy_data(source, mesh)
+        for loaded in (Element.from_data(json.loads(json.dumps(legacy["value"]))),
+                       json_loads(json.dumps(legacy))):
+            assert isinstance(loaded._source, type(source))
+            assert _points(loaded.mesh) == _points(mesh)
+            assert loaded.frame == Frame([1.0, 2.0, 3.0], [1, 0, 0], [0, 1, 0])
+            again = json_loads(json_dumps(loaded))
+            assert isinstance(again._source, type(source))
+            assert _points(again.mesh) == _points(mesh)
+
+
+def test_tessellation_of_curved_shapes():
+    for shape, faces in ((Sphere([0, 0, 0], 0.25), 8*8), (Cylinder(Circle(Plane.worldXY(), 0.1), 0.2), 8*3)):
+        element = Element.from_shape(shape, Frame.worldXY(), resolution=8)
+        assert element.mesh.number_of_faces() == faces
+    assert Element.from_shape(Box(Frame.worldXY(), 1, 1, 1), Frame.worldXY(), resolution=8).mesh.number_of_faces() == 6
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+from compas.data import DataEncoder
+from compas.data import json_dumps
+from compas.data import json_loads
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import ProgressTracker
+from am_information_model.model import apply_patch
+from am_information_model.model import make_patch
+from am_information_model.model import take_snapshot
+from am_information_model.model.instance import PATH_CACHE
+
+
+def _model(instances=4):
+    block = Element.from_shape(Box(Frame.worldXY(), 0.2, 0.1, 0.05), Frame.worldXY())
+    for layer in range(3):
+        frames = [Frame([0.01*k, 0.0, 0.01*layer], [1, 0, 0], [0, 1, 0]) for k in range(10)]
+        block.add_path(Path.from_frames(frames, robot_velocity=100.0))
+    model = InformationModel()
+    prototype = model.add_prototype(block)
+    for i in range(instances):
+        model.add_instance(prototype, Translation.from_vector([0.3*i, 0.0, 0.0]))
+    return model
+
+
+def _states(model):
+    states = {}
+    for key, element in model.elements(data=True):
+        for path_key, path in element.paths(data=True):
+            for node_key in path.nodes():
+                states[(key, path_key, node_key)] = path.get_node(node_key).attributes.get("state")
+    return states
+
+
+def test_states_round_trip():
+    model = _model()
+    ProgressTracker(model).mark_path("element_1", "path_0")
+    loaded = json_loads(json_dumps(model))
+    assert _states(loaded) == _states(model)
+    instance = loaded.get_element("element_2")
+    assert instance.prototype is loaded.get_prototype("prototype_0")
+    point = instance.get_path("path_1").get_node("node_3").frame.point
+    assert list(point) == pytest.approx([0.63, 0.0, 0.01])
+
+
+def test_patch_sends_marked_instance_states_only():
+    model = _model()
+    copy = json_loads(json_dumps(model))
+    snapshot = take_snapshot(model)
+    ProgressTracker(model).mark_path("element_2", "path_1")
+    patch = make_patch(model, snapshot)
+    assert list(patch) == ["children"]
+    assert list(patch["children"]) == ["'element_2'"]
+    assert list(patch["children"]["'element_2'"]) == ["states"]
+    assert list(patch["children"]["'element_2'"]["states"]) == ["path_1"]
+    apply_patch(copy, patch)
+    assert _states(copy) == _states(model)
+
+
+def test_patch_sends_moved_instance():
+    model = _model()
+    copy = json_loads(json_dumps(model))
+    ProgressTracker(model).mark_path("element_0", "path_0")
+    ProgressTracker(copy).mark_path("element_0", "path_0")
+    snapshot = take_snapshot(model)
+    model.get_element("element_0").transform(Translation.from_vector([0.0, 1.0, 0.0]))
+    patch = json.loads(json.dumps(make_patch(model, snapshot), cls=DataEncoder))
+    assert "data" in patch["children"]["'element_0'"]
+    apply_patch(copy, patch)
+    assert _states(copy) == _states(model)
+    point = copy.get_element("element_0").get_path("path_0").get_node("node_0").frame.point
+    assert list(point) == pytest.approx([0.0, 1.0, 0.0])
+
+
+def test_paths_can_not_be_changed_through_an_instance():
+    model = _model()
+    instance = model.get_element("element_0")
+    prototype = model.get_prototype("prototype_0")
+    for method, args in ((instance.add_node, ("path_9",)),
+                         (instance.add_edge, ("path_0", "path_2")),
+                         (instance.delete_edge, ("path_0", "path_1")),
+                         (instance.node_attribute, ("path_0", "robot", "other")),
+                         (instance.add_path, (Path(),))):
+        with pytest.raises(TypeError):
+            method(*args)
+    assert list(prototype.paths()) == ["path_0", "path_1", "path_2"]
+    assert not prototype.has_edge("path_0", "path_2")
+    assert prototype.node["path_0"]["robot"] == "any"
+    assert instance.node_attribute("path_0", "robot") == "any"
+
+
+def test_tracker_keeps_no_instance_paths():
+    model = _model()
+    tracker = ProgressTracker(model)
+    instances = [attr["element"] for key, attr in model.node.items() if key.startswith("element_")]
+    assert len(instances) == 4 and all(len(instance._paths) == 0 for instance in instances)
+    tracker.mark_path("element_1", "path_2")
+    instance = model.get_element("element_1")
+    assert list(instance._paths) == ["path_2"]
+    assert tracker.path_progress("element_1", "path_2")["done"] == 10
+    assert ProgressTracker(model).nodes_done == 10
+
+
+def test_instance_keeps_the_last_paths_and_their_states():
+    block = Element()
+    for layer in range(PATH_CACHE + 3):
+        frames = [Frame([0.01*k, 0.0, 0.01*layer], [1, 0, 0], [0, 1, 0]) for k in range(5)]
+        block.add_path(Path.from_frames(frames, robot_velocity=100.0), parent_path=None)
+    model = InformationModel()
+    key = model.add_instance(model.add_prototype(block), Translation.from_vector([1.0, 0.0, 0.0]))
+    instance = model.get_element(key)
+    instance.get_path("path_0").update_node("node_2", state="printed")
+    for path_key in instance.paths():
+        instance.get_path(path_key)
+    assert len(instance._paths) == PATH_CACHE
+    assert "path_0" not in instance._paths
+    assert instance._states == {"path_0": [("node_2", "printed")]}
+    assert instance.get_path("path_0").get_node("node_2").attributes["state"] == "printed"
+    assert list(instance._paths)[-1] == "path_0"
+    loaded = json_loads(json_dumps(model)).get_element(key)
+    assert loaded.get_path("path_0").get_node("node_2").attributes["state"] == "printed"
+    assert _states(json_loads(json_dumps(model))) == _states(model)
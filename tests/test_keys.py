@@ -0,0 +1,47 @@
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Node
+from am_information_model.model import Path
+
+
+def _path(n=3):
+    return Path.from_frames([Frame([0.01*k, 0.0, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(n)])
+
+
+def test_keys_are_not_reused_after_delete():
+    path = _path()
+    path.delete_node("node_2")
+    path.add_node(Node(frame=Frame.worldXY()), parent_node="node_1")
+    assert list(path.nodes()) == ["node_0", "node_1", "node_3"]
+
+
+def test_explicit_keys_advance_the_counter():
+    model = InformationModel()
+    model.add_element(Element())
+    model.add_element(Element(), key="element_7")
+    assert model.add_element(Element()) == "element_8"
+
+
+def test_counters_survive_data_round_trip():
+    path = _path()
+    path.delete_node("node_2")
+    copy = Path.from_data(path.data)
+    copy.add_node(Node(frame=Frame.worldXY()), parent_node="node_1")
+    assert list(copy.nodes())[-1] == "node_3"
+
+
+def test_copies_hand_out_independent_keys():
+    path = _path()
+    copy = Path.from_data(path.data)
+    copy.add_node(Node(frame=Frame.worldXY()))
+    copy.add_node(Node(frame=Frame.worldXY()))
+    path.add_node(Node(frame=Frame.worldXY()))
+    assert list(path.nodes())[-1] == "node_3"
+    assert list(copy.nodes())[-2:] == ["node_3", "node_4"]
+
+    element = Element.from_paths([_path()])
+    copy = Element.from_data(element.data)
+    assert copy.add_path(_path()) == "path_1"
+    assert element.add_path(_path()) == "path_1"
@@ -0,0 +1,55 @@
+import json
+
+from compas.data import json_dumps
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import LayerIndex
+from am_information_model.model import Path
+from am_information_model.model.graph import _is_encoded
+
+
+def _element(layers=4, height=0.003):
+    element = Element()
+    for layer in range(layers):
+        frames = [Frame([0.01*k, 0.0, height*layer], [1, 0, 0], [0, 1, 0]) for k in range(5)]
+        element.add_path(Path.from_frames(frames))
+    return element
+
+
+def test_layers():
+    element = _element()
+    assert element.number_of_layers() == 4
+    assert list(element.layer(-1)) == ["path_3"]
+    assert list(element.paths_between(0.002, 0.007)) == ["path_1", "path_2"]
+    element.transform(Translation.from_vector([0.0, 0.0, 0.1]))
+    assert list(element.paths_above(0.105)) == ["path_2", "path_3"]
+
+
+def test_lazy_element_keeps_paths_serialized():
+    data = json.loads(json_dumps(_element()))["value"]
+    element = Element.from_data(data, lazy=True)
+    assert element.number_of_layers() == 4
+    assert list(element.layer(1)) == ["path_1"]
+    assert all(_is_encoded(attr["path"]) for attr in element.node.values())
+
+
+def test_rebuild_measures_moved_paths():
+    element = _element()
+    element.number_of_layers()
+    element.get_path("path_0").transform(Translation.from_vector([0.0, 0.0, 1.0]))
+    element.rebuild_layer_index()
+    assert list(element.layer(-1)) == ["path_0"]
+
+
+def test_every_path_is_in_one_layer():
+    # chained heights closer than the tolerance and float noise of one layer
+    heights = [0.0, 0.0009, 0.0018, 0.0027, 0.003, 0.003 + 1e-12, 0.0031 - 0.0001]
+    index = LayerIndex.from_heights([("path_{}".format(i), z) for i, z in enumerate(heights)], tolerance=0.001)
+    layers = [list(index.layer(n)) for n in range(len(index.levels))]
+    assert sorted(key for keys in layers for key in keys) == sorted(index.keys)
+    assert layers[-1] == ["path_3", "path_4", "path_6", "path_5"]
+    for key in ["path_0", "path_4", "path_5", "path_6", "path_3"]:
+        index.remove(key)
+    assert [list(index.layer(n)) for n in range(len(index.levels))] == [["path_1"], ["path_2"]]
@@ -0,0 +1,73 @@
+import json
+
+from compas.data import json_dumps
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+
+
+def _element(i):
+    element = Element.from_mesh(Mesh.from_shape(Box(Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]), 0.2, 0.1, 0.05)),
+                                Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]))
+    for j in range(2):
+        frames = [Frame([i + 0.01*k, 0.1*j, 0.003], [1, 0, 0], [0, 1, 0]) for k in range(5)]
+        element.add_path(Path.from_frames(frames, path_width=0.01, robot_velocity=100.0))
+    return element
+
+
+def _data():
+    model = InformationModel()
+    for i in range(2):
+        model.add_element(_element(i))
+    return json.loads(json_dumps(model))["value"]
+
+
+def _describe(element):
+    paths = []
+    for key, path in element.paths(data=True):
+        nodes = [(node, list(path.get_node(node).frame.point)) for node in path.nodes()]
+        paths.append((key, nodes, sorted(path.edges())))
+    return paths, element.mesh.number_of_vertices(), list(element.frame.point)
+
+
+def test_lazy_model_decodes_on_access():
+    model = InformationModel.from_data(_data(), lazy=True)
+    assert all(isinstance(attr["element"], dict) for attr in model.node.values())
+    element = model.get_element("element_1")
+    assert isinstance(element, Element)
+    assert isinstance(model.node["element_1"]["element"], Element)
+    assert isinstance(model.node["element_0"]["element"], dict)
+    # the paths and mesh of the element are still serialized
+    assert all(isinstance(attr["path"], dict) for attr in element.node.values())
+    assert element._mesh_data is not None
+    assert isinstance(element.get_path("path_0"), Path)
+    assert isinstance(element.node["path_1"]["path"], dict)
+
+
+def test_lazy_equals_eager():
+    eager = InformationModel.from_data(_data())
+    lazy = InformationModel.from_data(_data(), lazy=True)
+    for key in eager.elements():
+        assert _describe(lazy.get_element(key)) == _describe(eager.get_element(key))
+
+
+def test_materialize_decodes_everything():
+    model = InformationModel.from_data(_data(), lazy=True)
+    model.materialize()
+    for key, element in model.node.items():
+        element = element["element"]
+        assert isinstance(element, Element)
+        assert element._mesh_data is None and element._mesh is not None
+        assert all(isinstance(attr["path"], Path) for attr in element.node.values())
+    assert _describe(model.get_element("element_0")) == _describe(InformationModel.from_data(_data()).get_element("element_0"))
+
+
+def test_unaccessed_parts_are_written_back_unchanged():
+    data = _data()
+    model = InformationModel.from_data(json.loads(json.dumps(data)), lazy=True)
+    model.get_element("element_0").get_path("path_1")
+    assert json.loads(json_dumps(model))["value"]["node"] == data["node"]
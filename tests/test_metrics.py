@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from compas.data import json_dumps
+from compas.geometry import Frame
+from compas.geometry import Scale
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import ElementInstance
+from am_information_model.model import Path
+
+
+def _path(i, columnar=False):
+    frames = [Frame([0.01*k, 0.1*i, 0.003], [1, 0, 0], [0, 1, 0]) for k in range(6)]
+    path = Path.from_frames(frames, path_width=0.01, path_height=0.003, robot_velocity=100.0)
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+def _element():
+    return Element.from_paths([_path(0), _path(1, columnar=True)])
+
+
+def _summed(element):
+    totals = [0.0, 0.0, 0.0]
+    for key, path in element.paths(data=True):
+        path.invalidate()
+        for i, value in enumerate(path._get_metrics()):
+            totals[i] += value
+    return {"length": totals[0], "duration": totals[1], "volume": totals[2]}
+
+
+def test_element_metrics_are_cached():
+    element = _element()
+    metrics = element.metrics
+    assert metrics["length"] == pytest.approx(2*0.05)
+    cached = element._metrics
+    assert element.metrics == metrics
+    assert element._metrics is cached
+    assert metrics == pytest.approx(_summed(_element()))
+
+
+def test_element_metrics_follow_path_changes():
+    element = _element()
+    element.metrics
+    element.add_path(_path(2))
+    assert element.metrics["length"] == pytest.approx(3*0.05)
+    element.delete_node("path_0")
+    assert element.metrics["length"] == pytest.approx(2*0.05)
+    path = element.get_path("path_1")
+    path.update_node("node_5", frame=Frame([0.1, 0.1, 0.003], [1, 0, 0], [0, 1, 0]))
+    assert element.metrics["length"] == pytest.approx(0.05 + 0.1)
+    element.get_path("path_2").update_node("node_0", robot_velocity=50.0)
+    assert element.metrics == pytest.approx(_summed(element))
+    element.transform(Scale.from_factors([2.0, 2.0, 2.0]))
+    assert element.metrics["length"] == pytest.approx(2*(0.05 + 0.1))
+
+
+def test_in_place_node_edits_need_invalidate():
+    element = _element()
+    before = element.metrics
+    path = element.get_path("path_0")
+    path.get_node("node_5").frame = Frame([0.1, 0.0, 0.003], [1, 0, 0], [0, 1, 0])
+    # not seen through the path version
+    assert element.metrics == before
+    path.invalidate()
+    assert element.metrics["length"] == pytest.approx(0.1 + 0.05)
+    assert element.metrics == pytest.approx(_summed(element))
+
+
+def test_lazy_paths_stay_serialized():
+    element = _element()
+    data = json.loads(json_dumps(element))["value"]
+    lazy = Element.from_data(data, lazy=True)
+    assert lazy.metrics == pytest.approx(element.metrics)
+    assert all(isinstance(attr["path"], dict) for attr in lazy.node.values())
+    lazy.get_path("path_0").update_node("node_0", robot_velocity=50.0)
+    element.get_path("path_0").update_node("node_0", robot_velocity=50.0)
+    assert lazy.metrics == pytest.approx(element.metrics)
+    assert isinstance(lazy.node["path_1"]["path"], dict)
+
+
+def test_instance_metrics():
+    prototype = _element()
+    instance = ElementInstance(prototype, Translation.from_vector([1.0, 0.0, 0.0]))
+    assert instance.metrics == pytest.approx(prototype.metrics)
+    assert instance._paths == {}
+    instance.transform(Scale.from_factors([2.0, 2.0, 2.0]))
+    assert instance.metrics == pytest.approx(dict((name, 2*value) for name, value in prototype.metrics.items()))
+    instance.transform(Scale.from_factors([1.0, 2.0, 1.0]))
+    assert instance.metrics["length"] == pytest.approx(2*prototype.metrics["length"])
+    prototype.get_path("path_0").update_node("node_5", frame=Frame([0.1, 0.0, 0.003], [1, 0, 0], [0, 1, 0]))
+    assert instance.metrics["length"] == pytest.approx(2*prototype.metrics["length"])
@@ -0,0 +1,63 @@
+import json
+
+from compas.data import json_dumps
+from compas.geometry import Frame
+
+from am_information_model.model import Node
+from am_information_model.model import Path
+
+
+def _path(columnar=False):
+    frames = [Frame([0.01*k, 0.0, 0.003], [1, 0, 0], [0, 1, 0]) for k in range(5)]
+    path = Path.from_frames(frames, path_width=0.01, robot_velocity=100.0)
+    path.get_node("node_2").attributes["tag"] = "seam"
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+def _describe(path):
+    nodes = [(key, list(path.get_node(key).frame.point), dict(path.get_node(key).attributes)) for key in path.nodes()]
+    edges = sorted((u, v, list(path.edge_attribute((u, v), "edge").vector)) for u, v in path.edges())
+    return nodes, edges
+
+
+def test_columnar_path_reads_like_objects():
+    expected = _describe(_path())
+    path = _path(columnar=True)
+    assert path.store is not None and len(path.store) == 5
+    assert _describe(path) == expected
+    assert path.metrics == _path().metrics
+    path.to_objects()
+    assert path.store is None
+    assert _describe(path) == expected
+
+
+def test_views_write_to_the_store():
+    path = _path(columnar=True)
+    version = path.version
+    node = path.get_node("node_1")
+    node.attributes["extrusion_rate"] = 2.0
+    node.attributes["state"] = "printed"
+    node.frame = Frame([0.01, 0.005, 0.003], [1, 0, 0], [0, 1, 0])
+    assert path.version != version
+    again = path.get_node("node_1")
+    assert again.attributes["extrusion_rate"] == 2.0
+    assert again.attributes["state"] == "printed"
+    assert list(again.frame.point) == [0.01, 0.005, 0.003]
+    # edge vectors follow the node points
+    assert list(path.edge_attribute(("node_0", "node_1"), "edge").vector) == [0.01, 0.005, 0.0]
+    copy = again.copy()
+    copy.attributes["extrusion_rate"] = 3.0
+    assert path.get_node("node_1").attributes["extrusion_rate"] == 2.0
+
+
+def test_columnar_add_delete_and_data():
+    path = _path(columnar=True)
+    path.add_node(Node(frame=Frame([0.05, 0.0, 0.003], [1, 0, 0], [0, 1, 0])))
+    path.delete_node("node_0")
+    assert list(path.nodes()) == ["node_1", "node_2", "node_3", "node_4", "node_5"]
+    assert path.has_edge("node_4", "node_5")
+    loaded = Path.from_data(json.loads(json_dumps(path))["value"])
+    assert loaded.store is not None
+    assert _describe(loaded) == _describe(path)
@@ -0,0 +1,118 @@
+import math
+
+import pytest
+from compas.geometry import Frame
+
+from am_information_model.model import HEIGHT_BOUNDS
+from am_information_model.model import Path
+from am_information_model.model import WIDTH_BOUNDS
+from am_information_model.model import flow_constant
+from am_information_model.model import nodestore
+from am_information_model.model import process
+from am_information_model.model import solve_process
+from am_information_model.model import solve_path_process
+from am_information_model.model import solve_process_arrays
+from am_information_model.model import solve_profile
+from am_information_model.model import solve_profile_arrays
+
+
+def test_solve_profile_is_flattest_profile():
+    area = 0.01*0.003
+    width, height = solve_profile(area)
+    assert math.isclose(width*height, area)
+    assert math.isclose(height, max(HEIGHT_BOUNDS[0], area/WIDTH_BOUNDS[1]))
+    assert WIDTH_BOUNDS[0] <= width <= WIDTH_BOUNDS[1]
+
+
+def test_solve_profile_bounds():
+    assert solve_profile(WIDTH_BOUNDS[0]*HEIGHT_BOUNDS[0]) == (WIDTH_BOUNDS[0], HEIGHT_BOUNDS[0])
+    assert solve_profile(WIDTH_BOUNDS[1]*HEIGHT_BOUNDS[1]) == (WIDTH_BOUNDS[1], HEIGHT_BOUNDS[1])
+    assert solve_profile(0.5*WIDTH_BOUNDS[0]*HEIGHT_BOUNDS[0]) is None
+    assert solve_profile(2.0*WIDTH_BOUNDS[1]*HEIGHT_BOUNDS[1]) is None
+    assert solve_profile(0.0) is None
+
+
+def test_solve_profile_arrays_matches_solve_profile():
+    areas = [0.000005, 0.00002, 0.00005, 0.0001]
+    widths, heights = solve_profile_arrays(areas)
+    for area, width, height in zip(areas, widths, heights):
+        profile = solve_profile(area)
+        if profile is None:
+            assert math.isnan(width) and math.isnan(height)
+        else:
+            assert math.isclose(width, profile[0]) and math.isclose(height, profile[1])
+
+
+def test_solve_process_missing_parameter():
+    K = flow_constant()
+    width, height, rate, velocity = solve_process(0.01, 0.003, 2.0, None)
+    assert math.isclose(velocity, 0.01*0.003*K/2.0)
+    width, height, rate, velocity = solve_process(None, None, 0.1, 0.035)
+    assert math.isclose(width*height, 0.1*0.035/K)
+    assert solve_process(None, None, 2.0, 100.0)[:2] == (None, None)
+
+
+def test_solve_process_arrays_flags_out_of_limits():
+    nan = float("nan")
+    w, h, e, v, limits = solve_process_arrays([0.01, 0.05], [0.003, 0.003], [nan, nan], [100.0, 100.0])
+    assert list(limits) == [False, True]
+    assert not math.isnan(e[0])
+
+
+# width, height, rate, velocity per node: solved, infeasible, unsolved, solved out of limits, complete
+NODES = [
+    (0.01, 0.003, 2.0, None),
+    (None, None, 2.0, 100.0),
+    (0.01, None, None, 100.0),
+    (0.05, 0.003, None, 100.0),
+    (0.01, 0.003, 2.0, 40.0),
+    (None, 0.004, 0.1, 0.035),
+]
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def arrays(request, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.setattr(process, "np", None)
+        monkeypatch.setattr(nodestore, "np", None)
+    elif process.np is None:
+        pytest.skip("NumPy is not available")
+    return request.param
+
+
+def _path(columnar):
+    path = Path.from_frames([Frame([0.01*k, 0.0, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(len(NODES))])
+    for key, values in zip(path.nodes(), NODES):
+        path.update_node(key, **dict(zip(("path_width", "path_height", "extrusion_rate", "robot_velocity"), values)))
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_solve_path_process_equals_solve_process(arrays, columnar):
+    path = _path(columnar)
+    version = path.version
+    metrics = path.metrics
+    report = solve_path_process(path)
+    assert path.version != version
+    for key, values in zip(path.nodes(), NODES):
+        attributes = path.get_node(key).attributes
+        solved = [attributes[name] for name in ("path_width", "path_height", "extrusion_rate", "robot_velocity")]
+        assert solved == pytest.approx(list(solve_process(*values)), rel=1e-12)
+    assert report == {
+        "solved": ["node_0", "node_3", "node_5"],
+        "unsolved": ["node_2"],
+        "infeasible": ["node_1"],
+        "out_of_limits": ["node_3"]
+    }
+    # the solved velocities change the durations
+    assert path.metrics["duration"] != metrics["duration"]
+
+
+def test_solve_path_process_is_idempotent(arrays):
+    path = _path(columnar=False)
+    solve_path_process(path)
+    report = solve_path_process(path)
+    assert report["solved"] == []
+    assert report["unsolved"] == ["node_2"]
@@ -0,0 +1,72 @@
+import pytest
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import schedule
+
+
+def _line(x, y, n=4):
+    frames = [Frame([x + 0.01*k, y, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(n)]
+    return Path.from_frames(frames, robot_velocity=100.0)
+
+
+def _model():
+    model = InformationModel()
+    model.add_robot("a", key="robot_0")
+    model.add_robot("b", key="robot_1")
+    for i in range(3):
+        element = Element()
+        for j in range(4):
+            element.add_path(_line(i, 0.1*j), parent_path=None if j % 2 else "last",
+                             parent_robot="robot_1" if j == 3 else "any")
+        model.add_element(element)
+    return model
+
+
+def _steps(report):
+    return dict(((step["element"], step["path"]), step) for step in report["sequence"])
+
+
+def test_schedule_respects_dependencies_and_robots():
+    model = _model()
+    report = schedule(model)
+    steps = _steps(report)
+    expected = [(key, path_key) for key, element in model.elements(data=True) for path_key in element.paths()]
+    assert sorted(steps) == sorted(expected)
+    for key, element in model.elements(data=True):
+        for u, v in element.edges():
+            assert steps[(key, v)]["start"] >= steps[(key, u)]["end"] - 1e-9
+        assert steps[(key, "path_3")]["robot"] == "robot_1"
+    for u, v in model.edges():
+        if model.has_object(u, "element") and model.has_object(v, "element"):
+            before = max(step["end"] for id, step in steps.items() if id[0] == u)
+            assert min(step["start"] for id, step in steps.items() if id[0] == v) >= before - 1e-9
+    for robot, queue in report["queues"].items():
+        for a, b in zip(queue, queue[1:]):
+            assert b["start"] >= a["end"] - 1e-9
+    assert sum(len(queue) for queue in report["queues"].values()) == len(steps)
+    assert report["makespan"] == max(step["end"] for step in steps.values())
+
+
+def test_single_robot_times_add_up():
+    element = Element()
+    for x in (0.0, 0.5, 0.1):
+        element.add_path(_line(x, 0.0), parent_path=None)
+    report = schedule(element, travel_velocity=50.0, home=(0.0, 0.0, 0.0))
+    sequence = report["sequence"]
+    assert [step["path"] for step in sequence] == ["path_0", "path_2", "path_1"]
+    durations = sum(element.get_path(step["path"]).duration for step in sequence)
+    assert report["makespan"] == pytest.approx(durations + report["travel"]*1000.0/50.0)
+    assert report["travel"] == pytest.approx(sum(step["travel"] for step in sequence))
+    assert sequence[1]["travel"] == pytest.approx(0.1 - 0.03)
+
+
+def test_cycle_raises():
+    element = Element()
+    keys = [element.add_path(_line(x, 0.0), parent_path=None) for x in (0.0, 0.1)]
+    element.add_edge(keys[0], keys[1])
+    element.add_edge(keys[1], keys[0])
+    with pytest.raises(ValueError):
+        schedule(element)
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+from compas.data import json_dumps
+from compas.data import json_loads
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import stream_dump
+from am_information_model.model import stream_load
+from am_information_model.model import stream_records
+
+
+def _path(i, columnar=False):
+    frames = [Frame([i + 0.01*k, 0.0, 0.003], [1, 0, 0], [0, 1, 0]) for k in range(6)]
+    path = Path.from_frames(frames, path_width=0.01, path_height=0.003, robot_velocity=100.0)
+    path.get_node("node_2").attributes["state"] = "printed"
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+def _model():
+    model = InformationModel()
+    model.add_robot("robot", key="robot_0")
+    for i in range(2):
+        element = Element(frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]))
+        element.add_path(_path(i))
+        element.add_path(_path(i, columnar=True))
+        model.add_element(element)
+    return model
+
+
+def _describe(graph):
+    # node and edge attributes with nested graphs described in place
+    nodes = []
+    for key in graph.nodes():
+        attr = {}
+        for name, value in graph.node[key].items():
+            if isinstance(value, Path) or isinstance(value, Element):
+                value = _describe(value)
+            elif name == "node":
+                value = (list(value.frame.point), dict(value.attributes))
+            elif hasattr(value, "data"):
+                value = value.data
+            attr[name] = value
+        nodes.append((key, attr))
+    edges = sorted((u, v) for u, v in graph.edges())
+    return type(graph).__name__, nodes, edges
+
+
+def _round_trip(graph):
+    fp = io.StringIO()
+    stream_dump(graph, fp)
+    fp.seek(0)
+    return stream_load(fp)
+
+
+def test_stream_equals_json_round_trip():
+    model = _model()
+    loaded = _round_trip(model)
+    assert _describe(loaded) == _describe(json_loads(json_dumps(model)))
+    assert list(loaded.elements()) == list(model.elements())
+    for key, element in model.elements(data=True):
+        other = loaded.get_element(key)
+        assert other.frame == element.frame
+        assert [path.store is not None for path_key, path in other.paths(data=True)] == [False, True]
+
+
+def test_stream_round_trip_of_paths():
+    for columnar in (False, True):
+        path = _path(0, columnar)
+        loaded = _round_trip(path)
+        assert (loaded.store is None) == (path.store is None)
+        assert _describe(loaded) == _describe(path)
+        assert loaded.metrics == path.metrics
+        assert loaded.get_last_key("node") == path.get_last_key("node")
+
+
+def test_records_nest_children_after_their_node():
+    element = Element()
+    element.add_path(_path(0))
+    records = list(stream_records(element))
+    assert "graph" in records[0] and records[-1] == {"end": True}
+    node = records[1]
+    assert node["children"] == ["path"] and node["attr"]["path"] is None
+    assert records[2]["graph"] == Path().dtype
+    # the path records are closed before the element's
+    assert records[-2] == {"end": True}
+    assert sum(1 for record in records if "node" in record) == 1 + 6
+
+
+def test_truncated_stream_raises():
+    fp = io.StringIO()
+    stream_dump(_model(), fp)
+    lines = fp.getvalue().splitlines(True)
+    with pytest.raises(ValueError):
+        stream_load(io.StringIO("".join(lines[:-1])))
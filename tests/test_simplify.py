@@ -0,0 +1,91 @@
+import math
+import random
+
+import pytest
+from compas.geometry import Frame
+
+from am_information_model.model import Path
+from am_information_model.model import simplify
+from am_information_model.model import simplify_indices
+
+TOLERANCE = 0.0005
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def arrays(request, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.setattr(simplify, "np", None)
+    elif simplify.np is None:
+        pytest.skip("NumPy is not available")
+    return request.param
+
+
+def _points(n=400, seed=1):
+    # a wavy line with noise below and steps above the tolerance
+    rng = random.Random(seed)
+    points = []
+    for i in range(n):
+        x = 0.001*i
+        y = 0.01*math.sin(8*x) + rng.uniform(-0.2, 0.2)*TOLERANCE + (0.002 if i % 97 == 50 else 0.0)
+        points.append([x, y, 0.003])
+    return points
+
+
+def _distance(p, a, b):
+    u = [b[i] - a[i] for i in range(3)]
+    w = [p[i] - a[i] for i in range(3)]
+    uu = sum(c*c for c in u)
+    t = min(1.0, max(0.0, sum(x*y for x, y in zip(w, u))/uu)) if uu > 0 else 0.0
+    return math.sqrt(sum((w[i] - t*u[i])**2 for i in range(3)))
+
+
+def _assert_within(points, rows, tolerance):
+    for a, b in zip(rows[:-1], rows[1:]):
+        for i in range(a + 1, b):
+            assert _distance(points[i], points[a], points[b]) <= tolerance*(1 + 1e-9)
+
+
+def test_dropped_points_are_within_tolerance(arrays):
+    points = _points()
+    rows = simplify_indices(points, TOLERANCE, keep=[123])
+    assert rows[0] == 0 and rows[-1] == len(points) - 1 and 123 in rows
+    assert rows == sorted(set(rows))
+    assert len(rows) < len(points)//4
+    _assert_within(points, rows, TOLERANCE)
+    # the steps above the tolerance are kept
+    assert all(i in rows for i in range(50, len(points), 97))
+
+
+def test_numpy_and_fallback_agree(monkeypatch):
+    if simplify.np is None:
+        pytest.skip("NumPy is not available")
+    points = _points(seed=2)
+    rows = simplify_indices(points, TOLERANCE)
+    monkeypatch.setattr(simplify, "np", None)
+    assert simplify_indices(points, TOLERANCE) == rows
+
+
+def test_straight_and_short_lines():
+    assert simplify_indices([[0.01*i, 0.0, 0.0] for i in range(50)], TOLERANCE) == [0, 49]
+    assert simplify_indices([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], TOLERANCE) == [0, 1]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_path_simplify_keeps_process_changes_and_states(columnar):
+    points = _points(200)
+    path = Path.from_frames([Frame(point, [1, 0, 0], [0, 1, 0]) for point in points], path_width=0.01, robot_velocity=100.0)
+    path.update_node("node_120", robot_velocity=50.0)
+    path.update_node("node_30", state="printed")
+    if columnar:
+        path.to_columnar()
+    version = path.version
+    dropped = path.simplify(TOLERANCE)
+    keys = list(path.nodes())
+    assert dropped == len(points) - len(keys) > 0
+    assert path.version != version
+    assert "node_30" in keys and "node_120" in keys and "node_121" in keys
+    assert [(u, v) for u, v in zip(keys, keys[1:])] == sorted(path.edges(), key=lambda uv: keys.index(uv[0]))
+    rows = [int(key.split("_")[-1]) for key in keys]
+    _assert_within(points, rows, TOLERANCE)
+    assert path.metrics["length"] == pytest.approx(sum(
+        math.sqrt(sum((points[b][i] - points[a][i])**2 for i in range(3))) for a, b in zip(rows, rows[1:])))
@@ -0,0 +1,45 @@
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import SpatialIndex
+
+
+def _element(x):
+    frames = [Frame([x + 0.01*k, 0.0, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(5)]
+    return Element.from_paths([Path.from_frames(frames)])
+
+
+def test_queries():
+    index = SpatialIndex(cell_size=0.1)
+    index.insert("a", [0.0, 0.0, 0.0])
+    index.insert("b", [1.0, 0.0, 0.0])
+    index.insert("c", [0.5, 0.5, 0.5], [0.6, 0.6, 0.6])
+    assert index.nearest([0.9, 0.0, 0.0])[0][0] == "b"
+    assert sorted(index.radius([0.0, 0.0, 0.0], 0.1)) == ["a"]
+    assert sorted(index.box([0.4, 0.4, 0.4], [0.55, 0.55, 0.55])) == ["c"]
+
+
+def test_remove_shrinks_bounds():
+    index = SpatialIndex(cell_size=0.1)
+    index.insert("a", [0.0, 0.0, 0.0])
+    index.insert("b", [5.0, 0.0, 0.0])
+    index.remove("b")
+    assert index._bounds() == ((0, 0, 0), (0, 0, 0))
+    assert index.nearest([5.0, 0.0, 0.0]) == [("a", 5.0)]
+    index.remove("a")
+    assert index.nearest([0.0, 0.0, 0.0]) == []
+
+
+def test_deleted_element_leaves_index():
+    model = InformationModel()
+    first = model.add_element(_element(0.0))
+    second = model.add_element(_element(1.0))
+    index = model.build_spatial_index(cell_size=0.1)
+    assert any(item[0] == second for item in index.box([0.9, -0.1, -0.1], [1.2, 0.1, 0.1]))
+    element = model.get_element(second)
+    model.delete_node(second)
+    assert element._spatial is None
+    assert not any(item[0] == second for item in index.box([-1.0, -1.0, -1.0], [2.0, 1.0, 1.0]))
+    assert index.nearest([1.0, 0.0, 0.0], kind="node")[0][0][0] == first
@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import pytest
+from compas.geometry import Frame
+
+from am_information_model.model import Element
+from am_information_model.model import Path
+from am_information_model.model import TargetStream
+
+
+def _element(paths=3, nodes=20):
+    element = Element()
+    for layer in range(paths):
+        frames = [Frame([0.001*k, 0.0, 0.003*layer], [1, 0, 0], [0, 1, 0]) for k in range(nodes)]
+        element.add_path(Path.from_frames(frames, robot_velocity=100.0, extrusion_rate=1.0))
+    return element
+
+
+class FakeController(object):
+    # acknowledges every few received targets, or closes after a number of them
+
+    def __init__(self, every=5, close_after=None):
+        self.every = every
+        self.close_after = close_after
+        self.received = []
+        self.finished = None
+
+    async def handle(self, reader, writer):
+        try:
+            await self._handle(reader, writer)
+        finally:
+            writer.close()
+            self.finished.set()
+
+    async def _handle(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            self.received.append(json.loads(line.decode("utf-8")))
+            id = self.received[-1]["id"]
+            if self.close_after is not None and len(self.received) == self.close_after:
+                writer.write((json.dumps({"ack": id}) + "\n").encode("utf-8"))
+                await writer.drain()
+                break
+            if len(self.received) % self.every == 0:
+                # the robot takes a moment to reach the targets
+                await asyncio.sleep(0.001)
+                writer.write((json.dumps({"ack": id}) + "\n").encode("utf-8"))
+
+
+class CheckedStream(TargetStream):
+    # the most targets sent but not acknowledged
+
+    outstanding = 0
+
+    def encode(self, id, target):
+        self.outstanding = max(self.outstanding, len(self._pending) + 1)
+        return super(CheckedStream, self).encode(id, target)
+
+
+class CountingWriter(object):
+    # targets written between two drains
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.batches = [0]
+
+    def write(self, data):
+        self.batches[-1] += 1
+        self.writer.write(data)
+
+    async def drain(self):
+        await self.writer.drain()
+        self.batches.append(0)
+
+    def close(self):
+        self.writer.close()
+
+
+async def _stream(stream, controller):
+    controller.finished = asyncio.Event()
+    server = await asyncio.start_server(controller.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer = CountingWriter(writer)
+    try:
+        return await stream.run(reader, writer), writer
+    finally:
+        writer.close()
+        await controller.finished.wait()
+        server.close()
+        await server.wait_closed()
+
+
+def test_stream_keeps_lookahead_and_marks_progress():
+    element = _element()
+    stream = CheckedStream(element, lookahead=8)
+    controller = FakeController(every=5)
+    report, writer = asyncio.run(_stream(stream, controller))
+    assert report == {"sent": 60, "acknowledged": 60}
+    assert [message["id"] for message in controller.received] == list(range(60))
+    assert stream.outstanding == 8
+    assert max(writer.batches) <= 8
+    assert sum(writer.batches) == 60
+    assert stream.tracker.percent == 100.0
+    path = element.get_path("path_2")
+    assert all(path.get_node(key).attributes["state"] == "printed" for key in path.nodes())
+
+
+def test_closed_connection_marks_acknowledged_only():
+    element = _element()
+    stream = TargetStream(element, lookahead=16)
+    controller = FakeController(close_after=10)
+    with pytest.raises(ConnectionError):
+        asyncio.run(_stream(stream, controller))
+    assert stream.acknowledged == 10
+    assert stream.tracker.nodes_done == 10
+    path = element.get_path("path_0")
+    assert path.get_node("node_9").attributes["state"] == "printed"
+    assert path.get_node("node_10").attributes["state"] is None
+
+
+def test_lookahead_must_be_positive():
+    for lookahead in (0, -1):
+        with pytest.raises(ValueError):
+            TargetStream(_element(), lookahead=lookahead)
+
+
+def test_tracker_is_built_on_access_only():
+    element = _element()
+    stream = TargetStream(element, lookahead=4)
+    assert stream._tracker is None
+    report, writer = asyncio.run(_stream(stream, FakeController(every=3)))
+    assert report == {"sent": 60, "acknowledged": 60}
+    assert stream._tracker is None
+    assert stream.tracker.nodes_done == 60
+    assert TargetStream(element, state=None).tracker is None
+
+
+def test_tracker_built_before_the_stream_marks_progress():
+    element = _element(paths=2, nodes=10)
+    stream = TargetStream(element, lookahead=4)
+    tracker = stream.tracker
+    asyncio.run(_stream(stream, FakeController(every=2)))
+    assert stream.tracker is tracker
+    assert tracker.progress["done"] == tracker.progress["total"] == 20
+    assert element.state
@@ -0,0 +1,91 @@
+import json
+
+from compas.data import json_dumps
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from am_information_model.model import Element
+from am_information_model.model import ElementInstance
+from am_information_model.model import InformationModel
+from am_information_model.model import Path
+from am_information_model.model import iter_targets
+from am_information_model.model import schedule
+from am_information_model.model.graph import _is_encoded
+
+
+def _path(x, y, columnar=False):
+    frames = [Frame([x + 0.01*k, y, 0.003], [1, 0, 0], [0, 1, 0]) for k in range(4)]
+    path = Path.from_frames(frames, robot_velocity=[100.0 + k for k in range(4)], extrusion_rate=2.0)
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+def _model():
+    model = InformationModel()
+    for i in range(2):
+        element = Element()
+        for j in range(3):
+            element.add_path(_path(i, 0.1*j, columnar=j == 1))
+        model.add_element(element)
+    return model
+
+
+def _expected(model, order):
+    # the targets read node by node through the regular accessors
+    targets = []
+    for element_key, path_key in order:
+        path = model.get_element(element_key).get_path(path_key)
+        for key in path.print_order():
+            node = path.get_node(key)
+            targets.append((element_key, path_key, key, list(node.frame.point),
+                            node.attributes.get("robot_velocity"), node.attributes.get("extrusion_rate")))
+    return targets
+
+
+def _describe(targets):
+    return [(t["element"], t["path"], t["node"], list(t["frame"].point), t["robot_velocity"], t["extrusion_rate"])
+            for t in targets]
+
+
+def test_targets_follow_insertion_order():
+    model = _model()
+    order = [(key, path_key) for key, element in model.elements(data=True) for path_key in element.paths()]
+    assert _describe(iter_targets(model)) == _expected(model, order)
+
+
+def test_targets_follow_schedule_and_batches():
+    model = _model()
+    steps = schedule(model)["sequence"]
+    order = [(step["element"], step["path"]) for step in steps]
+    expected = _expected(model, order)
+    assert _describe(iter_targets(model, steps)) == expected
+    assert _describe(iter_targets(model, order)) == expected
+    batches = list(iter_targets(model, order, batch_size=5))
+    assert [len(batch) for batch in batches] == [5]*(len(expected)//5) + ([len(expected) % 5] if len(expected) % 5 else [])
+    assert _describe(target for batch in batches for target in batch) == expected
+
+
+def test_targets_of_a_path_follow_its_print_order():
+    path = _path(0.0, 0.0)
+    path.flip()
+    targets = list(iter_targets(path))
+    assert [target["node"] for target in targets] == ["node_3", "node_2", "node_1", "node_0"]
+    assert all(target["element"] is None and target["path"] is None for target in targets)
+
+
+def test_lazy_graphs_stay_serialized():
+    model = _model()
+    expected = _describe(iter_targets(model))
+    lazy = InformationModel.from_data(json.loads(json_dumps(model))["value"], lazy=True)
+    assert _describe(iter_targets(lazy)) == expected
+    assert all(_is_encoded(attr["element"]) for attr in lazy.node.values())
+
+
+def test_instance_targets_are_transformed():
+    prototype = Element.from_paths([_path(0.0, 0.0), _path(0.0, 0.1, columnar=True)])
+    instance = ElementInstance(prototype, Translation.from_vector([1.0, 0.0, 0.0]))
+    moved = [target["frame"].point for target in iter_targets(instance)]
+    assert [[round(c, 12) for c in point] for point in moved] == \
+        [[round(c, 12) for c in (target["frame"].point + [1.0, 0.0, 0.0])] for target in iter_targets(prototype)]
+    assert instance._paths == {}
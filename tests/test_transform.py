@@ -0,0 +1,85 @@
+import pytest
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Rotation
+from compas.geometry import Scale
+from compas.geometry import Translation
+from compas.geometry import transform_points
+
+from am_information_model.model import Element
+from am_information_model.model import Path
+from am_information_model.model import nodestore
+from am_information_model.model import path as path_module
+from am_information_model.model import utilities
+
+T = Translation.from_vector([0.1, 0.2, 0.3])*Rotation.from_axis_and_angle([0, 0, 1], 0.4)
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def arrays(request, monkeypatch):
+    # the NumPy matrix products and their pure Python fallback
+    if request.param == "fallback":
+        for module in (utilities, path_module, nodestore):
+            monkeypatch.setattr(module, "np", None)
+    elif utilities.np is None:
+        pytest.skip("NumPy is not available")
+    return request.param
+
+
+def _path(columnar=False):
+    frames = [Frame([0.01*k, 0.002*k, 0.003], [1, 0.1*k, 0], [0, 1, 0]) for k in range(6)]
+    path = Path.from_frames(frames, path_width=0.01, path_height=0.003, robot_velocity=100.0)
+    if columnar:
+        path.to_columnar()
+    return path
+
+
+def _frames(path):
+    return [path.get_node(key).frame for key in path.nodes()]
+
+
+def _assert_frames(frames, expected):
+    assert len(frames) == len(expected)
+    for frame, other in zip(frames, expected):
+        for a, b in zip((frame.point, frame.xaxis, frame.yaxis), (other.point, other.xaxis, other.yaxis)):
+            assert list(a) == pytest.approx(list(b), abs=1e-12)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_path_transform_equals_frame_transform(arrays, columnar):
+    path = _path(columnar)
+    expected = [frame.transformed(T) for frame in _frames(path)]
+    metrics = path.metrics
+    path.transform(T)
+    _assert_frames(_frames(path), expected)
+    for u, v in path.edges():
+        vector = path.edge_attribute((u, v), "edge").vector
+        start, end = path.get_node(u).frame.point, path.get_node(v).frame.point
+        assert list(vector) == pytest.approx([b - a for a, b in zip(start, end)], abs=1e-12)
+    # a rigid transform keeps the cached metrics
+    assert path.metrics == pytest.approx(metrics)
+
+
+def test_element_transform_moves_paths_mesh_and_frame(arrays):
+    element = Element.from_box(Box(Frame.worldXY(), 0.2, 0.1, 0.05))
+    element.add_path(_path())
+    element.add_path(_path(columnar=True))
+    expected = [[frame.transformed(T) for frame in _frames(path)] for key, path in element.paths(data=True)]
+    points = [element.mesh.vertex_coordinates(key) for key in element.mesh.vertices()]
+    element.transform(T)
+    for (key, path), frames in zip(element.paths(data=True), expected):
+        _assert_frames(_frames(path), frames)
+    _assert_frames([element.frame], [Frame.worldXY().transformed(T)])
+    moved = [element.mesh.vertex_coordinates(key) for key in element.mesh.vertices()]
+    for point, other in zip(transform_points(points, T), moved):
+        assert list(point) == pytest.approx(list(other), abs=1e-12)
+
+
+def test_scale_updates_metrics(arrays):
+    path = _path()
+    metrics = path.metrics
+    path.transform(Scale.from_factors([2.0, 2.0, 2.0]))
+    scaled = path.metrics
+    assert scaled["length"] == pytest.approx(2.0*metrics["length"])
+    path.invalidate()
+    assert path.metrics == pytest.approx(scaled)
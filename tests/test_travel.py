@@ -0,0 +1,57 @@
+from compas.geometry import Frame
+
+from am_information_model.model import ConcurrentModel
+from am_information_model.model import Element
+from am_information_model.model import Path
+from am_information_model.model import schedule
+
+
+def _line(x, y):
+    frames = [Frame([x + 0.01*k, y, 0.0], [1, 0, 0], [0, 1, 0]) for k in range(3)]
+    return Path.from_frames(frames, robot_velocity=100.0)
+
+
+def _zigzag():
+    # added far apart in x, nearest neighbours interleave them
+    element = Element()
+    for x in (0.0, 1.0, 0.1, 1.1, 0.2, 1.2):
+        element.add_path(_line(x, 0.0))
+    return element
+
+
+def test_added_order_does_not_constrain():
+    element = _zigzag()
+    report = element.optimize_travel(start=[0.0, 0.0, 0.0])
+    assert report["after"] < report["before"]
+    assert report["order"] != ["path_{}".format(i) for i in range(6)]
+
+
+def test_schedule_follows_optimized_order():
+    element = _zigzag()
+    report = element.optimize_travel(start=[0.0, 0.0, 0.0])
+    assert list(element.paths()) == report["order"]
+    sequence = [step["path"] for step in schedule(element)["sequence"]]
+    assert sequence == report["order"]
+    assert [target["path"] for target in element.targets()][::3] == report["order"]
+
+
+def test_explicit_edges_are_kept():
+    element = Element()
+    keys = [element.add_path(_line(x, 0.0), parent_path=None) for x in (0.0, 1.0, 0.1)]
+    element.add_edge(keys[1], keys[2])
+    report = element.optimize_travel(start=[0.0, 0.0, 0.0])
+    assert report["order"].index(keys[1]) < report["order"].index(keys[2])
+    assert element.has_edge(keys[1], keys[2])
+    assert not element.edge[keys[1]][keys[2]].get("sequence")
+
+
+def test_flip_publishes_new_snapshot():
+    element = Element()
+    element.add_path(_line(0.0, 0.0))
+    concurrent = ConcurrentModel(element)
+    path = element.get_path("path_0")
+    version = path.version
+    with concurrent.writing():
+        path.flip()
+    assert path.version != version
+    assert concurrent.snapshot().get_path("path_0").attributes["reversed"]
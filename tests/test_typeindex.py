@@ -0,0 +1,52 @@
+from compas.data import json_dumps
+from compas.data import json_loads
+
+from am_information_model.model import Element
+from am_information_model.model import InformationModel
+
+
+def _model():
+    model = InformationModel()
+    model.add_robot("robot", key="robot_0")
+    for i in range(3):
+        model.add_element(Element())
+    return model
+
+
+def _scan(model, node_type):
+    return [key for key, attr in model.node.items() if attr.get("node_type") == node_type]
+
+
+def test_index_follows_add_and_delete():
+    model = _model()
+    assert list(model.elements()) == ["element_0", "element_1", "element_2"]
+    assert list(model.robots()) == ["robot_0"]
+    assert model.number_of_objects("element") == 3
+    model.delete_node("element_1")
+    assert list(model.elements()) == ["element_0", "element_2"]
+    assert not model.has_object("element_1", "element")
+    model.add_element(Element())
+    assert list(model.elements()) == _scan(model, "element")
+
+
+def test_index_follows_node_type_changes():
+    model = _model()
+    model.node_attribute("element_0", "node_type", "robot")
+    assert list(model.elements()) == ["element_1", "element_2"]
+    assert list(model.robots()) == ["robot_0", "element_0"]
+    model.node_attribute("element_0", "node_type", "element")
+    assert list(model.elements()) == ["element_1", "element_2", "element_0"]
+    assert list(model.robots()) == ["robot_0"]
+    # setting the same type keeps the build order
+    model.node_attribute("element_1", "node_type", "element")
+    assert list(model.elements()) == ["element_1", "element_2", "element_0"]
+
+
+def test_index_is_rebuilt_from_data():
+    model = _model()
+    model.delete_node("element_0")
+    loaded = json_loads(json_dumps(model))
+    for node_type in ("element", "robot"):
+        assert list(loaded.get_nodes_where({"node_type": node_type})) == _scan(model, node_type)
+    loaded.clear()
+    assert list(loaded.elements()) == []